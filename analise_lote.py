@@ -0,0 +1,181 @@
+# analise_lote.py
+"""
+Analisa em lote todos os arquivos de grafo de um diretório, em paralelo.
+Cada arquivo vira uma linha JSON no arquivo de saída (JSON Lines), gravada assim que fica pronta;
+com --retomar, os arquivos que já estão na saída são pulados.
+
+Exemplos:
+    python analise_lote.py grafos/ --saida resultados.jsonl
+    python analise_lote.py grafos/ --analises info pontes corte_minimo --processos 8 --retomar --saida resultados.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from grafo import Grafo
+
+# Acima deste número de vértices a classe de isomorfismo fica só pelo hash (sem confirmação exata)
+LIMITE_ISOMORFISMO_EXATO = 256
+
+
+def _analise_info(grafo):
+    indptr, _ = grafo._csr()
+    graus = [indptr[v + 1] - indptr[v] for v in range(grafo.vertices)]
+    return {
+        'vertices': grafo.vertices,
+        'arestas': len(grafo.arestas),
+        'ponderado': grafo.is_ponderado(),
+        'maior_grau': max(graus, default=0),
+        'menor_grau': min(graus, default=0),
+        'componentes': len(grafo.componentes_conexas()),
+        'diametro': grafo.calcular_diametro(),
+    }
+
+
+def _analise_euleriano(grafo):
+    euleriano, mensagem = grafo.is_euleriano()
+    return {'euleriano': euleriano, 'mensagem': mensagem}
+
+
+def _analise_pontes(grafo):
+    return {'pontes': [grafo.rotulos(aresta) for aresta in grafo.encontrar_pontes()]}
+
+
+def _analise_corte_minimo(grafo):
+    conectividade, corte = grafo.conectividade_arestas()
+    return {
+        'conectividade_arestas': conectividade,
+        'corte_minimo': None if corte is None else [grafo.rotulos(aresta) for aresta in corte],
+    }
+
+
+def _analise_cintura(grafo):
+    menor = grafo.encontrar_menor_ciclo()
+    if menor is None:
+        return {'cintura': None, 'menor_ciclo': None}
+    return {'cintura': menor[0], 'menor_ciclo': grafo.rotulos(menor[1])}
+
+
+def _analise_isomorfismo(grafo):
+    # Só o invariante; as classes são montadas no fim, com todos os arquivos
+    return {'hash_wl': grafo.hash_weisfeiler_lehman()}
+
+
+ANALISES = {
+    'info': _analise_info,
+    'euleriano': _analise_euleriano,
+    'pontes': _analise_pontes,
+    'corte_minimo': _analise_corte_minimo,
+    'cintura': _analise_cintura,
+    'isomorfismo': _analise_isomorfismo,
+}
+
+
+def analisar_arquivo(caminho, analises):
+    """Executa as análises pedidas em um arquivo. Roda nos processos do pool."""
+    resultado = {'arquivo': caminho}
+    try:
+        grafo = Grafo.carregar_arquivo(caminho)
+    except Exception as e:
+        resultado['erro'] = f"{type(e).__name__}: {e}"
+        return resultado
+    for nome in analises:
+        try:
+            resultado[nome] = ANALISES[nome](grafo)
+        except Exception as e:
+            resultado[nome] = {'erro': f"{type(e).__name__}: {e}"}
+    return resultado
+
+
+def listar_arquivos(diretorio, extensoes):
+    arquivos = []
+    for raiz, _, nomes in os.walk(diretorio):
+        for nome in nomes:
+            if nome.lower().endswith(extensoes):
+                arquivos.append(os.path.join(raiz, nome))
+    return sorted(arquivos)
+
+
+def ler_checkpoint(caminho_saida):
+    """Arquivos já analisados em uma execução anterior (linhas completas da saída)."""
+    feitos = set()
+    if not os.path.exists(caminho_saida):
+        return feitos
+    with open(caminho_saida, encoding='utf-8') as f:
+        for linha in f:
+            try:
+                feitos.add(json.loads(linha)['arquivo'])
+            except (json.JSONDecodeError, KeyError):
+                continue  # linha truncada por uma interrupção no meio da escrita
+    return feitos
+
+
+def agrupar_isomorfos(caminho_saida):
+    """
+    Monta as classes de isomorfismo a partir dos hashes WL gravados na saída.
+    Em grafos pequenos, cada classe é confirmada por sao_isomorfos e separada se preciso.
+    """
+    por_hash = {}
+    with open(caminho_saida, encoding='utf-8') as f:
+        for linha in f:
+            try:
+                registro = json.loads(linha)
+                por_hash.setdefault(registro['isomorfismo']['hash_wl'], []).append(registro['arquivo'])
+            except (json.JSONDecodeError, KeyError, TypeError):
+                continue
+
+    classes = []
+    for hash_wl, arquivos in sorted(por_hash.items()):
+        grafos = [Grafo.carregar_arquivo(a) for a in arquivos] if len(arquivos) > 1 else []
+        if grafos and grafos[0].vertices <= LIMITE_ISOMORFISMO_EXATO:
+            grupos = []  # lista de (representante, arquivos)
+            for arquivo, grafo in zip(arquivos, grafos):
+                for representante, membros in grupos:
+                    if grafo.sao_isomorfos(representante):
+                        membros.append(arquivo)
+                        break
+                else:
+                    grupos.append((grafo, [arquivo]))
+            classes.extend({'hash_wl': hash_wl, 'arquivos': membros, 'confirmado': True} for _, membros in grupos)
+        else:
+            classes.append({'hash_wl': hash_wl, 'arquivos': arquivos, 'confirmado': len(arquivos) == 1})
+    return classes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Análise em lote de arquivos de grafo")
+    parser.add_argument('diretorio')
+    parser.add_argument('--saida', required=True, help="arquivo JSON Lines de resultados (também serve de checkpoint)")
+    parser.add_argument('--analises', nargs='+', choices=sorted(ANALISES), default=sorted(ANALISES))
+    parser.add_argument('--processos', type=int, default=os.cpu_count())
+    parser.add_argument('--extensoes', nargs='+', default=['.txt', '.csv'])
+    parser.add_argument('--retomar', action='store_true', help="pula os arquivos que já estão na saída")
+    args = parser.parse_args(argv)
+
+    arquivos = listar_arquivos(args.diretorio, tuple(args.extensoes))
+    feitos = ler_checkpoint(args.saida) if args.retomar else set()
+    pendentes = [a for a in arquivos if a not in feitos]
+    print(f"{len(arquivos)} arquivos, {len(feitos)} já analisados, {len(pendentes)} pendentes", file=sys.stderr)
+
+    with open(args.saida, 'a' if args.retomar else 'w', encoding='utf-8') as saida:
+        with ProcessPoolExecutor(max_workers=args.processos) as pool:
+            futuros = [pool.submit(analisar_arquivo, arquivo, args.analises) for arquivo in pendentes]
+            for concluidos, futuro in enumerate(as_completed(futuros), 1):
+                # Uma linha por arquivo, gravada e descarregada na hora: é o que permite retomar
+                saida.write(json.dumps(futuro.result(), ensure_ascii=False) + '\n')
+                saida.flush()
+                if concluidos % 100 == 0:
+                    print(f"{concluidos}/{len(pendentes)} concluídos", file=sys.stderr)
+
+    if 'isomorfismo' in args.analises:
+        caminho_classes = os.path.splitext(args.saida)[0] + '.classes.json'
+        with open(caminho_classes, 'w', encoding='utf-8') as f:
+            json.dump(agrupar_isomorfos(args.saida), f, indent=2, ensure_ascii=False)
+        print(f"Classes de isomorfismo salvas em {caminho_classes}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,15 @@
 # app.py
-from flask import Flask, request, render_template, redirect, url_for, flash, session
-from grafo import Grafo
-from pyvis.network import Network
+from flask import Flask, request, render_template, redirect, url_for, flash, session, abort, Response
+from grafo import Grafo, decodificar_linhas
+from instrumentacao import configurar_logging, instrumentar_app, medir, registrar_grafo
+from exportacao import FORMATOS as FORMATOS_EXPORTACAO, exportar as exportar_grafo
+from persistencia import CatalogoGrafos
+from visualizacao import Visualizacao, OPCOES_CARGA, OPCOES_DESTAQUE
+import gzip
+import itertools
+import logging
+import math
 import os
-import networkx as nx
 import random
 from tempfile import gettempdir
 import uuid
@@ -11,42 +17,115 @@ import json
 
 app = Flask(__name__)
 app.secret_key = "chave-secreta-qualquer"
+# A página da visualização é estática (os dados vêm por JSON), então pode ficar em cache
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 3600
 
-grafo_atual = None  # variável global que armazena a instância atual do Grafo
-mapa_vertices = {}  # mapeia nomes para IDs
-mapa_reverso = {}  # mapeia IDs para nomes
+configurar_logging()
+logger = logging.getLogger(__name__)
+instrumentar_app(app, os.path.join(gettempdir(), 'grafo_perfis'))
+
+grafo_atual = None  # variável global que armazena a instância atual do Grafo (com sua tabela de nomes)
+grafo_anterior = None  # versão carregada antes da atual, para comparar as duas
 
 # Configurações globais
+LIMITE_SUGESTOES_NOMES = 5000
+# Cores usadas para as classes de cor; além delas, as cores são geradas pelo ângulo áureo
+PALETA_CORES = ["#e6194b", "#3cb44b", "#ffe119", "#4363d8", "#f58231", "#911eb4",
+                "#46f0f0", "#f032e6", "#bcf60c", "#fabebe", "#008080", "#e6beff"]
+METODOS_COLORACAO = ('dsatur', 'exato', 'maior_grau', 'menor_ultimo', 'natural', 'aleatoria')
+METRICAS_CENTRALIDADE = {
+    'grau': 'grau',
+    'intermediacao': 'intermediação',
+    'proximidade': 'proximidade',
+    'pagerank': 'PageRank',
+    'nucleo': 'k-núcleo',
+}
+METODOS_COMUNIDADES = {
+    'leiden': 'Leiden',
+    'louvain': 'Louvain',
+    'propagacao': 'propagação de rótulos',
+}
+# Maior tempo limite (segundos) que o formulário pode pedir para a coloração exata
+TEMPO_LIMITE_MAXIMO_COLORACAO = 30.0
+# Acima deste número de vértices a intermediação e a proximidade são estimadas por amostragem
+LIMITE_CENTRALIDADE_EXATA = 2000
+PROCESSOS_CENTRALIDADE = int(os.environ.get('PROCESSOS_CENTRALIDADE', 1))
+# Tempo máximo da busca por um ciclo hamiltoniano (segundos)
+TEMPO_LIMITE_HAMILTONIANO = 10.0
+# Acima destes números de vértices a decomposição omite as componentes triconexas e a decomposição em árvore
+LIMITE_TRICONEXAS = 500
+LIMITE_DECOMPOSICAO_ARVORE = 5000
+HEURISTICAS_DECOMPOSICAO = {
+    'grau_minimo': 'grau mínimo',
+    'preenchimento_minimo': 'preenchimento mínimo',
+}
+# Tempo do preenchimento mínimo na decomposição em árvore (segundos); depois o resto segue o grau mínimo
+TEMPO_LIMITE_DECOMPOSICAO = 5.0
+# Tempo máximo das buscas exatas de clique e conjunto independente (segundos)
+TEMPO_LIMITE_CLIQUES = 10.0
+# Quantas cliques maximais a rota conta antes de desistir
+LIMITE_CLIQUES_MAXIMAIS = 100000
+# Tempo máximo da busca pela rota de visita (caixeiro-viajante), em segundos
+TEMPO_LIMITE_ROTA = 5.0
+# O que a rota /exportar pode exportar
+CONTEUDOS_EXPORTACAO = {
+    'grafo': 'grafo',
+    'arvore_geradora': 'árvore geradora mínima',
+    'menor_corte': 'menor corte',
+    'comunidades': 'comunidades',
+}
+# Cenários de falha simulados por consulta de confiabilidade
+AMOSTRAS_CONFIABILIDADE = 20000
+# Grava os dados das visualizações com gzip (servidos com Content-Encoding: gzip)
+COMPRIMIR_VISUALIZACAO = os.environ.get('COMPRIMIR_VISUALIZACAO', '1') != '0'
 TEMP_DIR = os.path.join(app.static_folder, 'temp_graphs')
 if not os.path.exists(TEMP_DIR):
     os.makedirs(TEMP_DIR)
+# Catálogo dos grafos enviados (snapshots binários versionados, com as métricas já calculadas)
+DIRETORIO_SNAPSHOTS = os.environ.get('DIRETORIO_SNAPSHOTS', os.path.join(gettempdir(), 'grafo_snapshots'))
+COTA_SNAPSHOTS_MB = int(os.environ.get('COTA_SNAPSHOTS_MB', 200))
+try:
+    catalogo = CatalogoGrafos(DIRETORIO_SNAPSHOTS, COTA_SNAPSHOTS_MB * 1024 * 1024)
+except Exception as e:
+    logger.warning("Catálogo de grafos indisponível (%s): os grafos não serão salvos", e)
+    catalogo = None
+
+def cor_da_classe(indice):
+    if indice < len(PALETA_CORES):
+        return PALETA_CORES[indice]
+    return f"hsl({(indice * 137.508) % 360:.0f}, 65%, 55%)"
 
-def gerar_label_aresta(indice):
-    return str(indice + 1) 
+def cor_da_escala(fracao):
+    # Gradiente de azul (baixo) para vermelho (alto)
+    return f"hsl({(1 - fracao) * 220:.0f}, 75%, 50%)"
 
-def salvar_visualizacao(net, is_tree_view=False):
+def salvar_visualizacao(vis, is_tree_view=False):
     """
-    Função auxiliar para salvar a visualização em arquivo temporário e limpar arquivos antigos
+    Função auxiliar para salvar os dados da visualização em arquivo temporário e limpar arquivos antigos.
+    A página static/visualizacao.html busca esses dados e desenha o grafo.
     """
     try:
         # Limpar todos os arquivos temporários antigos
         for arquivo in os.listdir(TEMP_DIR):
-            if arquivo.startswith('graph_') and arquivo.endswith('.html'):
+            if arquivo.startswith('graph_'):
                 caminho_arquivo = os.path.join(TEMP_DIR, arquivo)
                 try:
                     os.remove(caminho_arquivo)
-                    print(f"Arquivo temporário removido: {caminho_arquivo}")
+                    logger.debug("Arquivo temporário removido: %s", caminho_arquivo)
                 except Exception as e:
-                    print(f"Erro ao remover arquivo {caminho_arquivo}: {e}")
+                    logger.warning("Erro ao remover arquivo %s: %s", caminho_arquivo, e)
         
-        # Gerar novo arquivo
+        # Serializar tudo de uma vez
+        with medir('serializar_visualizacao'):
+            dados, comprimido = vis.serializar(COMPRIMIR_VISUALIZACAO)
         session_id = str(uuid.uuid4())
-        filename = f'graph_{session_id}.html'
+        filename = f'graph_{session_id}.json' + ('.gz' if comprimido else '')
         temp_file_path = os.path.join(TEMP_DIR, filename)
         
         # Salvar novo arquivo
-        net.save_graph(temp_file_path)
-        print(f"Novo arquivo salvo: {temp_file_path}")
+        with open(temp_file_path, 'wb') as f:
+            f.write(dados)
+        logger.debug("Novo arquivo salvo: %s", temp_file_path)
         
         # Atualizar sessão
         session['graph_filename'] = filename
@@ -54,23 +133,75 @@ def salvar_visualizacao(net, is_tree_view=False):
         
         return True
     except Exception as e:
-        print(f"Erro ao salvar visualização: {e}")
+        logger.exception("Erro ao salvar visualização: %s", e)
         return False
 
+def salvar_no_catalogo(nome, grafo):
+    # Falhas do catálogo não impedem o uso do grafo, que já está carregado
+    if catalogo is None:
+        return
+    try:
+        with medir('salvar_snapshot'):
+            grafo_id, numero = catalogo.salvar(nome, grafo)
+        session['grafo_salvo'] = [grafo_id, numero]
+    except Exception as e:
+        logger.warning("Erro ao salvar o grafo no catálogo: %s", e)
+
 @app.route("/")
 def index():
     global grafo_atual
+    salvo = session.get('grafo_salvo')
+    if grafo_atual is None and salvo and catalogo is not None:
+        # Outro worker (ou um reinício) perdeu o grafo da memória: volta do catálogo sem reprocessar o texto
+        try:
+            with medir('carregar_snapshot'):
+                grafo_atual = catalogo.carregar(*salvo)
+            registrar_grafo(grafo_atual)
+        except Exception as e:
+            logger.warning("Erro ao restaurar o grafo salvo %s: %s", salvo, e)
+            session.pop('grafo_salvo', None)
     info_grafo = calcular_info_grafo(grafo_atual) if grafo_atual else None
+    if grafo_atual and salvo and catalogo is not None:
+        # Guarda as métricas calculadas agora para a próxima vez que esta versão for carregada
+        try:
+            catalogo.atualizar_metricas(*salvo, grafo_atual)
+        except Exception as e:
+            logger.warning("Erro ao atualizar as métricas salvas: %s", e)
+    # Sugestões de nomes para os campos de origem/destino (omitidas em grafos muito grandes)
+    nomes_vertices = grafo_atual.rotulos() if grafo_atual and grafo_atual.vertices <= LIMITE_SUGESTOES_NOMES else []
     return render_template(
         "index.html",
         graph_filename=session.get('graph_filename'),
         grafo_atual=grafo_atual,
-        info_grafo=info_grafo
+        tem_versao_anterior=grafo_anterior is not None,
+        grafos_salvos=catalogo.listar() if catalogo is not None else [],
+        info_grafo=info_grafo,
+        nomes_vertices=nomes_vertices,
+        tempo_limite_maximo_coloracao=TEMPO_LIMITE_MAXIMO_COLORACAO
     )
 
+@app.route("/visualizacao/<nome>")
+def dados_visualizacao(nome):
+    # Dados de uma visualização salva por salvar_visualizacao (nome único, pode ficar em cache)
+    caminho = os.path.join(TEMP_DIR, os.path.basename(nome))
+    if not nome.startswith('graph_') or not os.path.isfile(caminho):
+        abort(404)
+    with open(caminho, 'rb') as f:
+        dados = f.read()
+    comprimido = nome.endswith('.gz')
+    if comprimido and 'gzip' not in request.accept_encodings:
+        dados, comprimido = gzip.decompress(dados), False
+    resposta = app.response_class(dados, mimetype='application/json')
+    if comprimido:
+        resposta.headers['Content-Encoding'] = 'gzip'
+    resposta.headers['Cache-Control'] = 'private, max-age=3600'
+    # O corpo depende do Accept-Encoding: caches não podem servir a versão gzip a quem não a aceita
+    resposta.headers['Vary'] = 'Accept-Encoding'
+    return resposta
+
 @app.route("/upload", methods=["POST"])
 def upload():
-    global grafo_atual, mapa_vertices, mapa_reverso
+    global grafo_atual, grafo_anterior
     
     if "arquivo_grafo" not in request.files:
         flash("Nenhum arquivo de grafo enviado", "danger")
@@ -83,209 +214,71 @@ def upload():
     
     try:
         # Tenta diferentes codificações
-        codificacoes = ['utf-8', 'utf-16', 'latin1', 'cp1252']
-        conteudo = None
-        
-        for encoding in codificacoes:
-            try:
-                arquivo.seek(0)
-                conteudo = arquivo.read().decode(encoding).splitlines()
-                break
-            except UnicodeDecodeError:
-                continue
+        conteudo = decodificar_linhas(arquivo.read())
         
         if conteudo is None:
             flash("Não foi possível decodificar o arquivo. Tente salvá-lo como UTF-8.", "danger")
             return redirect(url_for("index"))
             
-        num_vertices = int(conteudo[0])
-        print(f"Número de vértices: {num_vertices}")  # Log
-        
-        # Reset dos mapeamentos
-        mapa_vertices = {}
-        mapa_reverso = {}
-        vertices_unicos = set()
-        
-        # Primeira passagem: coletar todos os nomes únicos de vértices
-        for linha in conteudo[1:]:
-            try:
-                v1, v2 = [nome.strip().strip('"') for nome in linha.split('"') if nome.strip()]
-                vertices_unicos.add(v1)
-                vertices_unicos.add(v2)
-            except Exception as e:
-                print(f"Erro ao processar linha: {linha}")  # Log
-                print(f"Erro: {str(e)}")  # Log
-                raise
-        
-        print(f"Vértices únicos encontrados: {len(vertices_unicos)}")  # Log
-        
-        # Verifica se o número de vértices corresponde
-        if len(vertices_unicos) != num_vertices:
-            flash(f"Número de vértices declarado ({num_vertices}) não corresponde ao número de vértices únicos encontrados ({len(vertices_unicos)})", "danger")
+        try:
+            grafo = Grafo.gerar_grafo_de_texto(conteudo)
+        except ValueError as e:
+            flash(str(e), "danger")
             return redirect(url_for("index"))
+        num_vertices = grafo.vertices
         
-        # Cria mapeamento de nomes para IDs
-        for idx, nome in enumerate(sorted(vertices_unicos)):
-            mapa_vertices[nome] = idx
-            mapa_reverso[idx] = nome
-        
-        # Cria o grafo
-        grafo = Grafo(num_vertices)
-        
-        # Segunda passagem: adicionar arestas usando os IDs mapeados
-        for linha in conteudo[1:]:
-            v1, v2 = [nome.strip().strip('"') for nome in linha.split('"') if nome.strip()]
-            u = mapa_vertices[v1]
-            v = mapa_vertices[v2]
-            grafo.adicionar_aresta(u, v)
-        
+        grafo_anterior = grafo_atual
         grafo_atual = grafo
-        print(f"Número de arestas: {len(grafo.arestas)}")  # Log
-        
-        # Criar visualização com configurações otimizadas
-        net = Network(
-            height="800px",  # Aumentado
-            width="100%",
-            directed=False,
-            bgcolor="#ffffff",
-            font_color="#000000"
-        )
-        
-        # Configurações de física para melhor distribuição
-        net.set_options("""
-        var options = {
-          "nodes": {
-            "font": {
-              "size": 12,
-              "color": "rgba(0,0,0,1)"
-            },
-            "size": 20
-          },
-          "edges": {
-            "font": {
-              "size": 10
-            },
-            "width": 1,
-            "smooth": {
-              "type": "continuous",
-              "forceDirection": "none"
-            }
-          },
-          "physics": {
-            "forceAtlas2Based": {
-              "gravitationalConstant": -50,
-              "centralGravity": 0.01,
-              "springLength": 200,
-              "springConstant": 0.08
-            },
-            "maxVelocity": 50,
-            "solver": "forceAtlas2Based",
-            "timestep": 0.35,
-            "stabilization": {
-              "enabled": true,
-              "iterations": 1000
-            }
-          }
-        }
-        """)
-        
-        # Adicionar nós
-        for node_id in range(num_vertices):
-            nome = mapa_reverso[node_id]
-            net.add_node(
-                node_id,
-                label=nome,
-                color="#79C2EC",
-                title=nome,
-                size=20
-            )
-        
-        for i, (u, v) in enumerate(grafo.arestas):
-            label = gerar_label_aresta(i)
-            net.add_edge(u, v, label=label)
+        registrar_grafo(grafo)
+        salvar_no_catalogo(arquivo.filename, grafo)
+        
+        # Visualização inicial com a física forceAtlas2 para melhor distribuição
+        vis = Visualizacao(grafo, OPCOES_CARGA, cor_arestas=None)
         
         # Salvar visualização
-        salvar_visualizacao(net)
+        salvar_visualizacao(vis)
         
         flash(f"Grafo carregado com sucesso! ({num_vertices} vértices, {len(grafo.arestas)} arestas)", "success")
         return redirect(url_for("index"))
         
     except Exception as e:
-        print(f"Erro detalhado: {str(e)}")  # Log
+        logger.exception("Erro ao processar arquivo do grafo: %s", e)
         flash(f"Erro ao processar arquivo do grafo: {str(e)}", "danger")
         return redirect(url_for("index"))
 
 @app.route("/gerar_arvore", methods=["POST"])
 def gerar_arvore():
-    global grafo_atual, mapa_vertices, mapa_reverso
+    global grafo_atual
     
     if grafo_atual is None:
         flash("Carregue um grafo primeiro!", "warning")
         return redirect(url_for("index"))
     
     try:
-        # Criar grafo NetworkX
-        G = nx.Graph()
-        G.add_edges_from(grafo_atual.arestas)
-        
-        # Gerar árvore geradora mínima
-        T = nx.minimum_spanning_tree(G)
-        arestas_arvore = list(T.edges())
+        # Gerar árvore geradora mínima (Kruskal com union-find, usando os pesos se houver)
+        with medir('arvore_geradora'):
+            arestas_arvore, peso_total = grafo_atual.arvore_geradora_minima()
         
         # Escolher um vértice central (pode ser o de maior grau)
-        centro = max(T.degree, key=lambda x: x[1])[0]
-        
-        # Criar visualização
-        net_tree = Network(height="500px", width="100%", directed=False)
-        
-        # Conjunto para rastrear vértices na árvore
-        vertices_na_arvore = set()
+        graus_arvore = {}
         for u, v in arestas_arvore:
-            vertices_na_arvore.add(u)
-            vertices_na_arvore.add(v)
-        
-        # Adicionar nós - rosa para o centro, verde para os outros na árvore
-        for node_id in range(grafo_atual.vertices):
-            nome = mapa_reverso[node_id]
-            if node_id == centro:
-                net_tree.add_node(node_id, label=nome, color="#FF69B4", title=nome)  # Rosa para o centro
-            elif node_id in vertices_na_arvore:
-                net_tree.add_node(node_id, label=nome, color="#90EE90", title=nome)  # Verde para nós na árvore
-            else:
-                net_tree.add_node(node_id, label=nome, color="#79C2EC", title=nome)  # Azul para outros
-        
-        # Adicionar arestas da árvore com labels numéricas
-        for i, (u, v) in enumerate(arestas_arvore):
-            label = gerar_label_aresta(i)
-            net_tree.add_edge(u, v, label=label, color="#90EE90", width=2)
-        
-        # Adicionar outras arestas em cinza
-        for i, (u, v) in enumerate(grafo_atual.arestas):
-            if (u, v) not in arestas_arvore and (v, u) not in arestas_arvore:
-                label = gerar_label_aresta(i + len(arestas_arvore))
-                net_tree.add_edge(u, v, label=label, color="#D3D3D3", width=1)
-        
-        net_tree.set_options("""
-        var options = {
-          "nodes": {
-            "font": {
-              "size": 12,
-              "color": "rgba(0,0,0,1)"
-            }
-          },
-          "edges": {
-            "font": {
-              "size": 12
-            },
-            "width": 2
-          }
-        }
-        """)
+            graus_arvore[u] = graus_arvore.get(u, 0) + 1
+            graus_arvore[v] = graus_arvore.get(v, 0) + 1
+        centro = max(graus_arvore, key=graus_arvore.get)
+        
+        # Criar visualização - rosa para o centro, verde para a árvore e cinza para as outras arestas
+        vis = Visualizacao(grafo_atual, OPCOES_DESTAQUE, cor_arestas="#D3D3D3", largura_arestas=1)
+        vis.destacar_nos(graus_arvore, "#90EE90")
+        vis.destacar_nos([centro], "#FF69B4")
+        vis.destacar_arestas(vis.arestas_por_pares(arestas_arvore), "#90EE90", largura=2)
         
         # Salvar visualização
-        salvar_visualizacao(net_tree, is_tree_view=True)
+        salvar_visualizacao(vis, is_tree_view=True)
         
-        flash("Árvore geradora mínima gerada com sucesso!", "success")
+        if grafo_atual.is_ponderado():
+            flash(f"Árvore geradora mínima gerada com sucesso! (peso total {peso_total:g})", "success")
+        else:
+            flash("Árvore geradora mínima gerada com sucesso!", "success")
         return redirect(url_for("index"))
         
     except Exception as e:
@@ -294,55 +287,29 @@ def gerar_arvore():
 
 @app.route("/verificar_euleriano", methods=["POST"])
 def verificar_euleriano():
-    global grafo_atual, mapa_vertices, mapa_reverso
+    global grafo_atual
     
     if grafo_atual is None:
         flash("Carregue um grafo primeiro!", "warning")
         return redirect(url_for("index"))
     
     try:
-        eh_euleriano, mensagem = grafo_atual.is_euleriano()
-        
-        # Criar visualização
-        net = Network(height="500px", width="100%", directed=False)
+        with medir('is_euleriano'):
+            eh_euleriano, mensagem = grafo_atual.is_euleriano()
         
         # Gerar lista de adjacência para contar graus
         lista_adj = grafo_atual.gerar_lista_adjacencia()
+        graus = [len(lista_adj[v]) for v in range(grafo_atual.vertices)]
         
-        # Adicionar nós com cores baseadas no grau
-        for node_id in range(grafo_atual.vertices):
-            nome = mapa_reverso[node_id]
-            grau = len(lista_adj[node_id])
-            cor = "#90EE90" if grau % 2 == 0 else "#FFA07A"  # Verde para par, laranja para ímpar
-            net.add_node(node_id, label=nome, color=cor, title=f"{nome} (grau: {grau})")
-        
-        # Adicionar arestas com labels numéricas
-        for i, (u, v) in enumerate(grafo_atual.arestas):
-            label = gerar_label_aresta(i)
-            if len(lista_adj[u]) % 2 == 0 and len(lista_adj[v]) % 2 == 0:
-                net.add_edge(u, v, label=label, color="#90EE90")
-            else:
-                net.add_edge(u, v, label=label, color="#FFA07A")
-        
-        net.set_options("""
-        var options = {
-          "nodes": {
-            "font": {
-              "size": 12,
-              "color": "rgba(0,0,0,1)"
-            }
-          },
-          "edges": {
-            "font": {
-              "size": 12
-            },
-            "width": 2
-          }
-        }
-        """)
+        # Verde para grau par, laranja para ímpar (arestas com alguma ponta de grau ímpar também)
+        vis = Visualizacao(grafo_atual, OPCOES_DESTAQUE, cor_arestas="#FFA07A")
+        vis.titulos_nos(f"{nome} (grau: {grau})" for nome, grau in zip(grafo_atual.rotulos(), graus))
+        vis.destacar_nos([v for v in range(grafo_atual.vertices) if graus[v] % 2], "#FFA07A")
+        vis.destacar_nos([v for v in range(grafo_atual.vertices) if graus[v] % 2 == 0], "#90EE90")
+        vis.destacar_arestas([i for i, (u, v) in enumerate(grafo_atual.arestas) if graus[u] % 2 == 0 and graus[v] % 2 == 0], "#90EE90")
         
         # Salvar visualização
-        salvar_visualizacao(net)
+        salvar_visualizacao(vis)
         
         flash(mensagem, "info")
         return redirect(url_for("index"))
@@ -360,61 +327,20 @@ def verificar_hamiltoniano():
         return redirect(url_for("index"))
     
     try:
-        net = configurar_network()
+        # Articulações e pares de separação descartam o grafo (ou dividem a busca) antes do backtracking
+        with medir('hamiltoniano'):
+            caminho, motivo = grafo_atual.ciclo_hamiltoniano(TEMPO_LIMITE_HAMILTONIANO)
+        e_hamiltoniano = caminho is not None
         
-        # Gerar lista de adjacência
-        lista_adj = grafo_atual.gerar_lista_adjacencia()
-        
-        # Verificar número de vértices com grau 1
-        grau_1 = sum(1 for vizinhos in lista_adj.values() if len(vizinhos) == 1)
-        if grau_1 > 2:
-            flash("O grafo não é hamiltoniano, pois possui mais de dois vértices com grau 1.", "warning")
-            return redirect(url_for("index"))
-        
-        # Verificar se é hamiltoniano
-        vertices = list(range(grafo_atual.vertices))
-        caminho = []
-        visitados = set()
-        
-        def backtrack(vertice_atual):
-            caminho.append(vertice_atual)
-            visitados.add(vertice_atual)
-            
-            if len(caminho) == grafo_atual.vertices:
-                # Verifica se forma um ciclo
-                if caminho[0] in lista_adj[caminho[-1]]:
-                    return True
-                
-            for vizinho in lista_adj[vertice_atual]:
-                if vizinho not in visitados:
-                    if backtrack(vizinho):
-                        return True
-            
-            caminho.pop()
-            visitados.remove(vertice_atual)
-            return False
-        
-        # Tenta encontrar um ciclo hamiltoniano
-        e_hamiltoniano = backtrack(0)
-        
-        # Adicionar nós
-        for node_id in range(grafo_atual.vertices):
-            label = mapa_reverso[node_id]
-            net.add_node(node_id, label=label, color="#79C2EC", title=label)
-        
-        # Adicionar arestas
-        for i, (u, v) in enumerate(grafo_atual.arestas):
-            label = gerar_label_aresta(i)
-            if e_hamiltoniano and ((u in caminho and v == caminho[caminho.index(u)+1]) or 
-                                 (v in caminho and u == caminho[caminho.index(v)+1])):
-                net.add_edge(u, v, label=label, color="#90EE90", width=3)  # Verde para o caminho
-            else:
-                net.add_edge(u, v, label=label, color="#323232")  # Cinza para outras arestas
+        # Verde para as arestas do ciclo (incluindo a que volta ao início), cinza para as outras
+        vis = Visualizacao(grafo_atual)
+        if e_hamiltoniano:
+            vis.destacar_arestas(vis.arestas_por_pares(zip(caminho, caminho[1:] + caminho[:1])), "#90EE90", largura=3)
         
         # Salvar visualização
-        salvar_visualizacao(net)
+        salvar_visualizacao(vis)
         
-        mensagem = "O grafo é hamiltoniano!" if e_hamiltoniano else "O grafo não é hamiltoniano."
+        mensagem = "O grafo é hamiltoniano!" if e_hamiltoniano else f"{motivo}."
         flash(mensagem, "success" if e_hamiltoniano else "warning")
         return redirect(url_for("index"))
         
@@ -432,66 +358,19 @@ def encontrar_menor_corte():
         return redirect(url_for("index"))
     
     try:
-        # Criar visualização
-        net = configurar_network()
-        
-        def eh_corte(arestas_corte, lista_adj):
-            # Criar grafo temporário removendo as arestas do corte
-            grafo_temp = {v: lista_adj[v].copy() for v in lista_adj}
-            
-            # Remover as arestas do corte
-            for u, v in arestas_corte:
-                if v in grafo_temp[u]:
-                    grafo_temp[u].remove(v)
-                if u in grafo_temp[v]:
-                    grafo_temp[v].remove(u)
-            
-            # BFS para verificar conectividade
-            visitados = set()
-            fila = [0]
-            visitados.add(0)
-            
-            while fila:
-                v = fila.pop(0)
-                for u in grafo_temp[v]:
-                    if u not in visitados:
-                        visitados.add(u)
-                        fila.append(u)
-            
-            return len(visitados) != grafo_atual.vertices
-        
         # Encontrar o menor corte possível
-        lista_adj = grafo_atual.gerar_lista_adjacencia()
-        todas_arestas = [(u, v) for u, v in grafo_atual.arestas]
-        menor_corte = None
-        
-        # Testar cortes de tamanho crescente
-        from itertools import combinations
-        for tamanho in range(1, len(todas_arestas) + 1):
-            print(f"Testando cortes de tamanho {tamanho}...")  # Debug
-            for arestas_candidatas in combinations(todas_arestas, tamanho):
-                if eh_corte(arestas_candidatas, lista_adj):
-                    menor_corte = list(arestas_candidatas)
-                    break
-            if menor_corte:
-                break
-        
-        if menor_corte:
-            # Adicionar nós
-            for node_id in range(grafo_atual.vertices):
-                nome = mapa_reverso[node_id]
-                net.add_node(node_id, label=nome, color="#79C2EC", title=nome)
-            
-            # Adicionar arestas - vermelho para arestas do corte
-            for i, (u, v) in enumerate(grafo_atual.arestas):
-                label = gerar_label_aresta(i)
-                if (u, v) in menor_corte or (v, u) in menor_corte:
-                    net.add_edge(u, v, label=label, color="#FF0000", width=3)  # Vermelho e grosso
-                else:
-                    net.add_edge(u, v, label=label, color="#323232")  # Cinza
+        with medir('encontrar_menor_corte'):
+            menor_corte = grafo_atual.encontrar_menor_corte()
+
+        if menor_corte == []:
+            flash("O grafo já é desconexo: nenhuma aresta precisa ser removida.", "info")
+        elif menor_corte:
+            # Vermelho e grosso para as arestas do corte
+            vis = Visualizacao(grafo_atual)
+            vis.destacar_arestas(vis.arestas_por_pares(menor_corte), "#FF0000", largura=3)
             
             # Salvar visualização
-            salvar_visualizacao(net)
+            salvar_visualizacao(vis)
             
             mensagem = f"Encontrado o menor corte possível com {len(menor_corte)} aresta(s)!"
             flash(mensagem, "success")
@@ -513,35 +392,14 @@ def mostrar_original():
         return redirect(url_for("index"))
     
     try:
-        print("Iniciando mostrar_original()")  # Debug
-        
-        net = configurar_network()
-        print("Network configurado com sucesso")  # Debug
-        
-        # Adicionar nós
-        print(f"Adicionando {grafo_atual.vertices} nós")  # Debug
-        for node_id in range(grafo_atual.vertices):
-            label = mapa_reverso[node_id]
-            print(f"Adicionando nó {node_id} com label {label}")  # Debug
-            net.add_node(node_id, label=label, color="#79C2EC", title=label)
-        
-        # Adicionar arestas
-        print(f"Adicionando {len(grafo_atual.arestas)} arestas")  # Debug
-        for i, (u, v) in enumerate(grafo_atual.arestas):
-            label = gerar_label_aresta(i)
-            print(f"Adicionando aresta {u}->{v} com label {label}")  # Debug
-            net.add_edge(u, v, label=label, title=label)
-        
-        print("Salvando visualização")  # Debug
-        salvar_visualizacao(net)
+        logger.debug("Serializando %d nós e %d arestas", grafo_atual.vertices, len(grafo_atual.arestas))
+        salvar_visualizacao(Visualizacao(grafo_atual, cor_arestas=None))
         
         flash("Visualização original do grafo restaurada", "success")
         return redirect(url_for("index"))
         
     except Exception as e:
-        import traceback
-        print("Erro detalhado:")  # Debug
-        print(traceback.format_exc())  # Debug
+        logger.exception("Erro ao mostrar grafo original")
         flash(f"Erro ao mostrar grafo original: {str(e)}", "danger")
         return redirect(url_for("index"))
 
@@ -554,64 +412,18 @@ def limpar_grafo():
             if os.path.exists(filepath):
                 os.remove(filepath)
         except Exception as e:
-            print(f"Erro ao remover arquivo: {e}")
+            logger.warning("Erro ao remover arquivo: %s", e)
     
     # Limpa as variáveis globais e sessão
-    global grafo_atual, mapa_vertices, mapa_reverso
+    global grafo_atual, grafo_anterior
     grafo_atual = None
-    mapa_vertices = {}
-    mapa_reverso = {}
+    grafo_anterior = None
+    registrar_grafo(None)
     session.clear()
     
     flash("Grafo removido com sucesso!", "success")
     return redirect(url_for("index"))
 
-def configurar_network():
-    """
-    Função auxiliar para criar e configurar o Network
-    """
-    net = Network(
-        height="800px",
-        width="100%",
-        directed=False,
-        bgcolor="#ffffff"
-    )
-    
-    options = """
-    {
-      "nodes": {
-        "font": {
-          "size": 12
-        }
-      },
-      "edges": {
-        "font": {
-          "size": 12
-        }
-      },
-      "physics": {
-        "enabled": true,
-        "stabilization": true
-      }
-    }
-    """
-    
-    print("JSON das opções:", options)  # Debug
-    print("Tamanho:", len(options))     # Debug
-    print("Caractere na posição 443:", options[443] if len(options) > 443 else "N/A")  # Debug
-    
-    net.set_options(options)
-    
-    net.html = net.html.replace('<style type="text/css">', '''
-    <style type="text/css">
-    #mynetwork {
-        height: 100vh !important;
-    }
-    </style>
-    ''')
-    
-    return net
-
 @app.route("/encontrar_corte_especifico", methods=["POST"])
 def encontrar_corte_especifico():
     global grafo_atual
@@ -624,74 +436,24 @@ def encontrar_corte_especifico():
         # Pegar o número de arestas desejado do form
         num_arestas = int(request.form.get('num_arestas', 1))
         
-        # Criar visualização
-        net = configurar_network()
-        
-        # Encontrar todos os possíveis cortes com o número específico de arestas
-        def encontrar_cortes_tamanho_n(grafo, n):
-            from itertools import combinations
-            
-            # Gerar lista de adjacência
-            lista_adj = grafo.gerar_lista_adjacencia()
-            
-            # Função para verificar se um conjunto de arestas é um corte
-            def eh_corte(arestas_corte):
-                # Criar grafo temporário removendo as arestas do corte
-                grafo_temp = {v: lista_adj[v].copy() for v in lista_adj}
-                
-                # Remover as arestas do corte
-                for u, v in arestas_corte:
-                    if v in grafo_temp[u]:
-                        grafo_temp[u].remove(v)
-                    if u in grafo_temp[v]:
-                        grafo_temp[v].remove(u)
-                
-                # BFS para verificar conectividade
-                visitados = set()
-                fila = [0]  # Começa do vértice 0
-                visitados.add(0)
-                
-                while fila:
-                    v = fila.pop(0)
-                    for u in grafo_temp[v]:
-                        if u not in visitados:
-                            visitados.add(u)
-                            fila.append(u)
-                
-                # Se não visitou todos os vértices, é um corte
-                return len(visitados) != grafo.vertices
-            
-            # Testar todas as combinações possíveis de n arestas
-            todas_arestas = [(u, v) for u, v in grafo.arestas]
-            for arestas_candidatas in combinations(todas_arestas, n):
-                if eh_corte(arestas_candidatas):
-                    return list(arestas_candidatas)
-            
-            return None
-        
         # Tentar encontrar um corte com o número específico de arestas
-        corte = encontrar_cortes_tamanho_n(grafo_atual, num_arestas)
+        with medir('encontrar_corte_de_tamanho'):
+            corte = grafo_atual.encontrar_corte_de_tamanho(num_arestas)
+        conectividade = grafo_atual.conectividade_arestas()[0]
         
         if corte:
-            mensagem = f"Encontrado um corte com {num_arestas} aresta(s)!"
+            mensagem = f"Encontrado um corte com {num_arestas} aresta(s)! (conectividade de arestas λ = {conectividade})"
+        elif num_arestas < conectividade:
+            mensagem = f"Não existe corte com {num_arestas} aresta(s): o grafo só se desconecta removendo pelo menos λ = {conectividade} arestas."
         else:
             mensagem = f"Não foi encontrado nenhum corte com {num_arestas} aresta(s)."
         
-        # Adicionar nós
-        for node_id in range(grafo_atual.vertices):
-            nome = mapa_reverso[node_id]
-            net.add_node(node_id, label=nome, color="#79C2EC", title=nome)
-        
-        # Adicionar arestas - vermelho para arestas do corte
-        for i, (u, v) in enumerate(grafo_atual.arestas):
-            label = gerar_label_aresta(i)
-            if corte and ((u, v) in corte or (v, u) in corte):
-                net.add_edge(u, v, label=label, color="#FF0000", width=3)  # Vermelho e grosso
-            else:
-                net.add_edge(u, v, label=label, color="#323232")  # Cinza
+        # Vermelho e grosso para as arestas do corte
+        vis = Visualizacao(grafo_atual)
+        vis.destacar_arestas(vis.arestas_por_pares(corte or []), "#FF0000", largura=3)
         
         # Salvar visualização
-        salvar_visualizacao(net)
+        salvar_visualizacao(vis)
         
         flash(mensagem, "success" if corte else "warning")
         return redirect(url_for("index"))
@@ -700,44 +462,6 @@ def encontrar_corte_especifico():
         flash(f"Erro ao encontrar corte: {str(e)}", "danger")
         return redirect(url_for("index"))
 
-def calcular_diametro(grafo):
-    """
-    Calcula o diâmetro do grafo usando o algoritmo de Floyd-Warshall
-    Retorna -1 se o grafo não for conexo
-    """
-    if not grafo or grafo.vertices == 0:
-        return -1
-        
-    # Inicializa a matriz de distâncias
-    INF = float('inf')
-    dist = [[INF] * grafo.vertices for _ in range(grafo.vertices)]
-    
-    # Distância de um vértice para ele mesmo é 0
-    for i in range(grafo.vertices):
-        dist[i][i] = 0
-    
-    # Inicializa as distâncias das arestas existentes como 1
-    for u, v in grafo.arestas:
-        dist[u][v] = 1
-        dist[v][u] = 1  # Grafo não direcionado
-    
-    # Algoritmo de Floyd-Warshall
-    for k in range(grafo.vertices):
-        for i in range(grafo.vertices):
-            for j in range(grafo.vertices):
-                if dist[i][k] != INF and dist[k][j] != INF:
-                    dist[i][j] = min(dist[i][j], dist[i][k] + dist[k][j])
-    
-    # Encontra o maior caminho mínimo (diâmetro)
-    diametro = 0
-    for i in range(grafo.vertices):
-        for j in range(grafo.vertices):
-            if dist[i][j] == INF:  # Se houver vértices desconectados
-                return -1
-            diametro = max(diametro, dist[i][j])
-    
-    return int(diametro)
-
 def calcular_info_grafo(grafo):
     """
     Calcula informações gerais sobre o grafo
@@ -747,6 +471,7 @@ def calcular_info_grafo(grafo):
         
     # Lista de adjacência para cálculos
     lista_adj = grafo.gerar_lista_adjacencia()
+    nomes = grafo.rotulos()
     
     # Calcular graus
     graus = {}
@@ -762,7 +487,7 @@ def calcular_info_grafo(grafo):
                 'vertices': []
             }
         distribuicao_graus[grau]['quantidade'] += 1
-        distribuicao_graus[grau]['vertices'].append(mapa_reverso[vertice])
+        distribuicao_graus[grau]['vertices'].append(nomes[vertice])
     
     # Ordenar a distribuição por grau
     distribuicao_graus = dict(sorted(distribuicao_graus.items()))
@@ -772,8 +497,8 @@ def calcular_info_grafo(grafo):
     menor_grau = min(graus.values()) if graus else 0
     
     # Encontrar vértices de maior e menor grau
-    vertices_maior_grau = [mapa_reverso[v] for v, g in graus.items() if g == maior_grau]
-    vertices_menor_grau = [mapa_reverso[v] for v, g in graus.items() if g == menor_grau]
+    vertices_maior_grau = [nomes[v] for v, g in graus.items() if g == maior_grau]
+    vertices_menor_grau = [nomes[v] for v, g in graus.items() if g == menor_grau]
     
     # Verificar se é conexo usando BFS
     def eh_conexo():
@@ -794,16 +519,24 @@ def calcular_info_grafo(grafo):
         return len(visitados) == grafo.vertices
     
     # Calcular diâmetro
-    diametro = calcular_diametro(grafo)
+    with medir('calcular_diametro'):
+        diametro = grafo.calcular_diametro()
     
     # Encontrar menor ciclo
-    menor_ciclo_info = encontrar_menor_ciclo(grafo)
+    with medir('encontrar_menor_ciclo'):
+        menor_ciclo_info = grafo.encontrar_menor_ciclo()
     if menor_ciclo_info:
         menor_ciclo_tamanho, menor_ciclo = menor_ciclo_info
-        menor_ciclo_vertices = [mapa_reverso[v] for v in menor_ciclo]
+        menor_ciclo_vertices = grafo.rotulos(menor_ciclo)
     else:
         menor_ciclo_tamanho, menor_ciclo_vertices = None, None
     
+    # Hubs pelo PageRank e o maior k-núcleo (ambos lineares por iteração e guardados no cache do grafo)
+    with medir('pagerank'):
+        pagerank = grafo.pagerank()
+    vertices_maior_pagerank = [nomes[v] for v in sorted(range(grafo.vertices), key=lambda v: -pagerank[v])[:3]]
+    degenerescencia = max(grafo.numeros_nucleo(), default=0)
+    
     return {
         'num_vertices': grafo.vertices,
         'num_arestas': len(grafo.arestas),
@@ -815,9 +548,49 @@ def calcular_info_grafo(grafo):
         'diametro': diametro,
         'menor_ciclo_tamanho': menor_ciclo_tamanho,
         'menor_ciclo_vertices': menor_ciclo_vertices,
+        'vertices_maior_pagerank': vertices_maior_pagerank,
+        'degenerescencia': degenerescencia,
         'distribuicao_graus': distribuicao_graus
     }
 
+@app.route("/menor_caminho", methods=["POST"])
+def menor_caminho():
+    global grafo_atual
+    if not grafo_atual:
+        flash("Carregue um grafo primeiro!", "warning")
+        return redirect(url_for("index"))
+    
+    try:
+        nome_origem = request.form.get('origem', '').strip()
+        nome_destino = request.form.get('destino', '').strip()
+        try:
+            origem = grafo_atual.tabela_nomes.id(nome_origem)
+            destino = grafo_atual.tabela_nomes.id(nome_destino)
+        except KeyError as e:
+            flash(f"Vértice não encontrado: {e.args[0]}", "warning")
+            return redirect(url_for("index"))
+        
+        with medir('menor_caminho'):
+            distancia, caminho = grafo_atual.menor_caminho(origem, destino)
+        
+        if caminho is None:
+            flash(f"Não existe caminho entre {nome_origem} e {nome_destino}.", "warning")
+            return redirect(url_for("index"))
+        
+        # Caminho em laranja, extremos em rosa
+        vis = Visualizacao(grafo_atual)
+        vis.destacar_nos(set(caminho), "#ff7f50")
+        vis.destacar_nos({origem, destino}, "#FF69B4")
+        vis.destacar_arestas(vis.arestas_por_pares(zip(caminho, caminho[1:])), "#ff7f50", largura=3)
+        salvar_visualizacao(vis)
+        
+        flash(f"Menor caminho (distância {distancia:g}): {' -> '.join(grafo_atual.rotulos(caminho))}", "success")
+        return redirect(url_for("index"))
+        
+    except Exception as e:
+        flash(f"Erro ao buscar menor caminho: {str(e)}", "danger")
+        return redirect(url_for("index"))
+
 @app.route("/buscar_ciclo", methods=["POST"])
 def buscar_ciclo():
     global grafo_atual
@@ -831,33 +604,18 @@ def buscar_ciclo():
             flash("O tamanho do ciclo deve ser pelo menos 3!", "warning")
             return redirect(url_for("index"))
             
-        ciclo = encontrar_ciclo(grafo_atual, tamanho)
+        with medir('encontrar_ciclo'):
+            ciclo = grafo_atual.encontrar_ciclo(tamanho)
         
         if ciclo:
             # Criar nova visualização destacando o ciclo
-            net = configurar_network()
-            
-            # Adicionar todos os nós
-            for node_id in range(grafo_atual.vertices):
-                nome = mapa_reverso[node_id]
-                if node_id in ciclo:
-                    # Nós do ciclo em destaque
-                    net.add_node(node_id, label=nome, color="#ff7f50", title=nome)
-                else:
-                    net.add_node(node_id, label=nome, color="#79C2EC", title=nome)
-            
-            # Adicionar todas as arestas
-            for i, (u, v) in enumerate(grafo_atual.arestas):
-                if u in ciclo and v in ciclo and abs(ciclo.index(u) - ciclo.index(v)) in [1, len(ciclo)-1]:
-                    # Arestas do ciclo em destaque
-                    net.add_edge(u, v, color="#ff7f50", width=3)
-                else:
-                    net.add_edge(u, v, color="#323232")
-            
-            salvar_visualizacao(net)
+            vis = Visualizacao(grafo_atual)
+            vis.destacar_nos(ciclo, "#ff7f50")
+            vis.destacar_arestas(vis.arestas_por_pares(zip(ciclo, ciclo[1:] + ciclo[:1])), "#ff7f50", largura=3)
+            salvar_visualizacao(vis)
             
             # Criar mensagem com os vértices do ciclo
-            vertices_ciclo = [mapa_reverso[v] for v in ciclo]
+            vertices_ciclo = grafo_atual.rotulos(ciclo)
             flash(f"Ciclo de tamanho {tamanho} encontrado: {' -> '.join(vertices_ciclo)}", "success")
         else:
             flash(f"Não foi encontrado nenhum ciclo de tamanho {tamanho}!", "warning")
@@ -868,85 +626,527 @@ def buscar_ciclo():
         flash(f"Erro ao buscar ciclo: {str(e)}", "danger")
         return redirect(url_for("index"))
 
-def encontrar_ciclo(grafo, tamanho):
-    """
-    Encontra um ciclo de tamanho específico no grafo usando busca em profundidade
-    """
-    def dfs_ciclo(atual, inicio, caminho, visitados):
-        if len(caminho) == tamanho:
-            # Verifica se forma um ciclo voltando ao início
-            if inicio in grafo.lista_adjacencia[atual]:
-                return caminho
-            return None
-            
-        for vizinho in grafo.lista_adjacencia[atual]:
-            if vizinho not in visitados:
-                novo_caminho = dfs_ciclo(vizinho, inicio, caminho + [vizinho], visitados | {vizinho})
-                if novo_caminho:
-                    return novo_caminho
-        return None
+@app.route("/colorir", methods=["POST"])
+def colorir():
+    global grafo_atual
+    if not grafo_atual:
+        flash("Carregue um grafo primeiro!", "warning")
+        return redirect(url_for("index"))
     
-    # Gera lista de adjacência se não existir
-    if not hasattr(grafo, 'lista_adjacencia'):
-        grafo.lista_adjacencia = [[] for _ in range(grafo.vertices)]
-        for u, v in grafo.arestas:
-            grafo.lista_adjacencia[u].append(v)
-            grafo.lista_adjacencia[v].append(u)
+    try:
+        metodo = request.form.get('metodo', 'dsatur')
+        if metodo not in METODOS_COLORACAO:
+            flash(f"Método de coloração desconhecido: {metodo}", "warning")
+            return redirect(url_for("index"))
+        tempo_limite = float(request.form.get('tempo_limite', 10))
+        if not math.isfinite(tempo_limite) or tempo_limite <= 0:
+            flash("O tempo limite deve ser um número positivo de segundos!", "warning")
+            return redirect(url_for("index"))
+        tempo_limite = min(tempo_limite, TEMPO_LIMITE_MAXIMO_COLORACAO)
+        
+        limite_inferior = None
+        with medir(f'colorir_{metodo}'):
+            if metodo == 'dsatur':
+                cores = grafo_atual.colorir_dsatur()
+            elif metodo == 'exato':
+                cores, limite_inferior = grafo_atual.colorir_exato(tempo_limite)
+            else:
+                cores = grafo_atual.colorir_guloso(metodo)
+        num_cores = max(cores) + 1 if cores else 0
+        
+        vis = Visualizacao(grafo_atual)
+        vis.colorir_nos([cor_da_classe(c) for c in cores],
+                        titulos=[f"{nome} (cor {c + 1})" for nome, c in zip(grafo_atual.rotulos(), cores)])
+        salvar_visualizacao(vis)
+        
+        mensagem = f"Coloração com {num_cores} cor(es) pelo método {metodo}."
+        if limite_inferior is not None:
+            if limite_inferior == num_cores:
+                mensagem += " A coloração é ótima (número cromático)."
+            else:
+                mensagem += f" Tempo esgotado: o número cromático está entre {limite_inferior} e {num_cores}."
+        # Cada classe de cor é um grupo sem conflitos (ex.: escolas que podem ser visitadas no mesmo turno)
+        if grafo_atual.vertices <= 100:
+            classes = [[] for _ in range(num_cores)]
+            for v, c in enumerate(cores):
+                classes[c].append(grafo_atual.rotulo(v))
+            mensagem += " " + "; ".join(f"Cor {c + 1}: {', '.join(nomes)}" for c, nomes in enumerate(classes))
+        flash(mensagem, "success")
+        return redirect(url_for("index"))
+        
+    except Exception as e:
+        flash(f"Erro ao colorir grafo: {str(e)}", "danger")
+        return redirect(url_for("index"))
+
+@app.route("/centralidade", methods=["POST"])
+def centralidade():
+    global grafo_atual
+    if not grafo_atual:
+        flash("Carregue um grafo primeiro!", "warning")
+        return redirect(url_for("index"))
     
-    # Tenta encontrar ciclo começando de cada vértice
-    for v in range(grafo.vertices):
-        ciclo = dfs_ciclo(v, v, [v], {v})
-        if ciclo:
-            return ciclo
-            
-    return None
+    try:
+        metrica = request.form.get('metrica', 'intermediacao')
+        if metrica not in METRICAS_CENTRALIDADE:
+            flash(f"Métrica de centralidade desconhecida: {metrica}", "warning")
+            return redirect(url_for("index"))
+        aproximada = grafo_atual.vertices > LIMITE_CENTRALIDADE_EXATA
+        
+        erro = None
+        with medir(f'centralidade_{metrica}'):
+            if metrica == 'grau':
+                valores = grafo_atual.centralidade_grau()
+            elif metrica == 'intermediacao' and aproximada:
+                valores, erro = grafo_atual.centralidade_intermediacao_aproximada(epsilon=0.1, semente=0, processos=PROCESSOS_CENTRALIDADE)
+            elif metrica == 'intermediacao':
+                valores = grafo_atual.centralidade_intermediacao(processos=PROCESSOS_CENTRALIDADE)
+            elif metrica == 'proximidade' and aproximada:
+                valores, erro = grafo_atual.centralidade_proximidade_aproximada(epsilon=0.1, semente=0, processos=PROCESSOS_CENTRALIDADE)
+            elif metrica == 'proximidade':
+                valores = grafo_atual.centralidade_proximidade(processos=PROCESSOS_CENTRALIDADE)
+            elif metrica == 'pagerank':
+                valores = grafo_atual.pagerank()
+            else:
+                valores = grafo_atual.numeros_nucleo()
+        
+        menor, maior = min(valores, default=0), max(valores, default=0)
+        amplitude = (maior - menor) or 1
+        
+        # Tamanho e cor do nó proporcionais à centralidade
+        fracoes = [(valor - menor) / amplitude for valor in valores]
+        vis = Visualizacao(grafo_atual)
+        vis.colorir_nos([cor_da_escala(fracao) for fracao in fracoes],
+                        titulos=[f"{nome} ({METRICAS_CENTRALIDADE[metrica]}: {valor:.4g})" for nome, valor in zip(grafo_atual.rotulos(), valores)],
+                        tamanhos=[10 + 30 * fracao for fracao in fracoes])
+        salvar_visualizacao(vis)
+        
+        principais = sorted(range(grafo_atual.vertices), key=lambda v: -valores[v])[:5]
+        mensagem = f"Centralidade de {METRICAS_CENTRALIDADE[metrica]}. Mais centrais: " + \
+            ", ".join(f"{grafo_atual.rotulo(v)} ({valores[v]:.4g})" for v in principais)
+        if erro is not None:
+            mensagem += f" (valores estimados por amostragem, erro máximo {erro:.3g} com 95% de confiança)"
+        flash(mensagem, "success")
+        return redirect(url_for("index"))
+        
+    except Exception as e:
+        flash(f"Erro ao calcular centralidade: {str(e)}", "danger")
+        return redirect(url_for("index"))
 
-def encontrar_menor_ciclo(grafo):
-    """
-    Encontra o menor ciclo no grafo usando BFS
-    Retorna uma tupla (tamanho, ciclo) ou None se não existir ciclo
-    """
-    if not grafo or grafo.vertices < 3:
-        return None
+@app.route("/emparelhamento", methods=["POST"])
+def emparelhamento():
+    global grafo_atual
+    if not grafo_atual:
+        flash("Carregue um grafo primeiro!", "warning")
+        return redirect(url_for("index"))
+    
+    try:
+        with medir('emparelhamento_maximo'):
+            pares = grafo_atual.emparelhamento_maximo()
+        bipartido = grafo_atual.is_bipartido()
+        cobertura = set()
+        if bipartido:
+            with medir('cobertura_vertices_minima'):
+                cobertura = set(grafo_atual.cobertura_vertices_minima())
+        
+        # Vértices da cobertura mínima em rosa, arestas do emparelhamento em vermelho
+        vis = Visualizacao(grafo_atual)
+        if cobertura:
+            vis.titulos_nos(f"{nome} (cobertura)" if v in cobertura else nome for v, nome in enumerate(grafo_atual.rotulos()))
+            vis.destacar_nos(cobertura, "#FF69B4")
+        vis.destacar_arestas(vis.arestas_por_pares(pares), "#FF0000", largura=3)
+        salvar_visualizacao(vis)
+        
+        if bipartido:
+            mensagem = (f"Grafo bipartido: emparelhamento máximo com {len(pares)} par(es) (Hopcroft-Karp) "
+                        f"e cobertura mínima de vértices com {len(cobertura)} vértice(s) (Kőnig).")
+        else:
+            mensagem = f"Emparelhamento máximo com {len(pares)} par(es) (Edmonds)."
+        if len(pares) <= 30:
+            mensagem += " Pares: " + "; ".join(f"{grafo_atual.rotulo(u)} - {grafo_atual.rotulo(v)}" for u, v in pares)
+        flash(mensagem, "success")
+        return redirect(url_for("index"))
+        
+    except Exception as e:
+        flash(f"Erro ao calcular emparelhamento: {str(e)}", "danger")
+        return redirect(url_for("index"))
 
-    # Gera lista de adjacência
-    lista_adj = grafo.gerar_lista_adjacencia()
+@app.route("/confiabilidade", methods=["POST"])
+def confiabilidade():
+    global grafo_atual
+    if not grafo_atual:
+        flash("Carregue um grafo primeiro!", "warning")
+        return redirect(url_for("index"))
+    
+    try:
+        probabilidade_falha = float(request.form.get('probabilidade_falha', 1)) / 100
+        if not 0 <= probabilidade_falha <= 1:
+            flash("A probabilidade de falha deve estar entre 0 e 100%!", "warning")
+            return redirect(url_for("index"))
+        
+        with medir('confiabilidade'):
+            estimativa, (inferior, superior) = grafo_atual.confiabilidade(
+                probabilidade_falha, AMOSTRAS_CONFIABILIDADE, processos=PROCESSOS_CENTRALIDADE)
+        with medir('arvore_geradora_aleatoria'):
+            arvore = grafo_atual.arvore_geradora_aleatoria()
+        
+        # Destaca uma árvore geradora sorteada uniformemente (algoritmo de Wilson)
+        vis = Visualizacao(grafo_atual, cor_arestas="#C0C0C0")
+        vis.destacar_arestas(vis.arestas_por_pares(arvore), "#2E8B57", largura=3)
+        salvar_visualizacao(vis)
+        
+        flash(f"Com {probabilidade_falha:.1%} de falha por aresta, o grafo continua conexo com probabilidade "
+              f"{estimativa:.4f} (IC 95%: {inferior:.4f} a {superior:.4f}). Em verde, uma árvore geradora sorteada.", "success")
+        return redirect(url_for("index"))
+        
+    except Exception as e:
+        flash(f"Erro ao estimar confiabilidade: {str(e)}", "danger")
+        return redirect(url_for("index"))
 
-    menor_ciclo = None
-    menor_tamanho = float('inf')
+@app.route("/comunidades", methods=["POST"])
+def comunidades():
+    global grafo_atual
+    if not grafo_atual:
+        flash("Carregue um grafo primeiro!", "warning")
+        return redirect(url_for("index"))
+    
+    try:
+        metodo = request.form.get('metodo', 'leiden')
+        if metodo not in METODOS_COMUNIDADES:
+            flash(f"Método de detecção de comunidades desconhecido: {metodo}", "warning")
+            return redirect(url_for("index"))
+        resolucao = float(request.form.get('resolucao', 1))
+        if resolucao <= 0:
+            flash("A resolução deve ser positiva!", "warning")
+            return redirect(url_for("index"))
+        
+        with medir(f'comunidades_{metodo}'):
+            if metodo == 'leiden':
+                rotulos = grafo_atual.comunidades_leiden(resolucao, semente=0)
+            elif metodo == 'louvain':
+                rotulos = grafo_atual.comunidades_louvain(resolucao, semente=0)
+            else:
+                rotulos = grafo_atual.comunidades_propagacao_rotulos(semente=0)
+        num_comunidades = max(rotulos) + 1 if rotulos else 0
+        
+        vis = Visualizacao(grafo_atual)
+        vis.colorir_nos([cor_da_classe(c) for c in rotulos],
+                        titulos=[f"{nome} (comunidade {c + 1})" for nome, c in zip(grafo_atual.rotulos(), rotulos)])
+        # Arestas entre comunidades ficam mais claras
+        vis.destacar_arestas([i for i, (u, v) in enumerate(grafo_atual.arestas) if rotulos[u] != rotulos[v]], "#C0C0C0")
+        salvar_visualizacao(vis)
+        
+        mensagem = (f"{num_comunidades} comunidade(s) pelo método {METODOS_COMUNIDADES[metodo]}, "
+                    f"modularidade {grafo_atual.modularidade(rotulos, resolucao):.4f}.")
+        if grafo_atual.vertices <= 100:
+            grupos = [[] for _ in range(num_comunidades)]
+            for v, c in enumerate(rotulos):
+                grupos[c].append(grafo_atual.rotulo(v))
+            mensagem += " " + "; ".join(f"Comunidade {c + 1}: {', '.join(nomes)}" for c, nomes in enumerate(grupos))
+        flash(mensagem, "success")
+        return redirect(url_for("index"))
+        
+    except Exception as e:
+        flash(f"Erro ao detectar comunidades: {str(e)}", "danger")
+        return redirect(url_for("index"))
 
-    # Para cada vértice como ponto inicial
-    for inicio in range(grafo.vertices):
-        # BFS
-        visitados = [-1] * grafo.vertices
-        pai = [-1] * grafo.vertices
-        fila = [(inicio, -1)]  # (vértice, pai)
+@app.route("/decomposicao", methods=["POST"])
+def decomposicao():
+    global grafo_atual
+    if not grafo_atual:
+        flash("Carregue um grafo primeiro!", "warning")
+        return redirect(url_for("index"))
+    
+    try:
+        heuristica = request.form.get('heuristica', 'grau_minimo')
+        if heuristica not in HEURISTICAS_DECOMPOSICAO:
+            flash("Heurística de decomposição inválida!", "warning")
+            return redirect(url_for("index"))
         
-        visitados[inicio] = 0
+        with medir('componentes_biconexas'):
+            blocos = grafo_atual.blocos_biconexos()
+            articulacoes = grafo_atual.pontos_articulacao()
+        degenerescencia = grafo_atual.ordem_degenerescencia()[1]
+        
+        # Uma cor por bloco biconexo; pontos de articulação em vermelho e maiores
+        vis = Visualizacao(grafo_atual)
+        for i, bloco in enumerate(blocos):
+            vis.destacar_arestas(bloco, cor_da_classe(i), largura=3)
+        vis.destacar_nos(articulacoes, "#FF0000", tamanho=25)
+        salvar_visualizacao(vis)
+        
+        mensagem = f"{len(blocos)} bloco(s) biconexo(s)"
+        if articulacoes:
+            nomes = grafo_atual.rotulos(articulacoes[:20])
+            mensagem += f", {len(articulacoes)} ponto(s) de articulação: {', '.join(nomes)}" + ("..." if len(articulacoes) > 20 else "")
+        else:
+            mensagem += ", sem pontos de articulação"
+        if grafo_atual.vertices <= LIMITE_TRICONEXAS:
+            with medir('componentes_triconexas'):
+                triconexas = grafo_atual.componentes_triconexas()
+            mensagem += f"; {len(triconexas)} componente(s) de separação triconexa(s)"
+        mensagem += f". Degenerescência: {degenerescencia}."
+        if grafo_atual.vertices <= LIMITE_DECOMPOSICAO_ARVORE:
+            with medir('decomposicao_arvore'):
+                largura, bolsas, _, completa = grafo_atual.decomposicao_arvore(heuristica, TEMPO_LIMITE_DECOMPOSICAO)
+            detalhe = f"{len(bolsas)} bolsas, heurística de {HEURISTICAS_DECOMPOSICAO[heuristica]}"
+            if not completa:
+                detalhe += f" (tempo esgotado após {TEMPO_LIMITE_DECOMPOSICAO:g} s; o restante seguiu o grau mínimo)"
+            if largura == degenerescencia:
+                mensagem += f" Largura de árvore: {largura} (exata; {detalhe})."
+            else:
+                mensagem += f" Largura de árvore entre {degenerescencia} e {largura} ({detalhe})."
+        flash(mensagem, "success")
+        return redirect(url_for("index"))
         
-        while fila:
-            v, p = fila.pop(0)
-            
-            for vizinho in lista_adj[v]:
-                if visitados[vizinho] == -1:  # Não visitado
-                    visitados[vizinho] = visitados[v] + 1
-                    pai[vizinho] = v
-                    fila.append((vizinho, v))
-                elif vizinho != p and vizinho != inicio:  # Encontrou ciclo
-                    # Reconstruir o ciclo
-                    ciclo = [v]
-                    atual = v
-                    while atual != inicio:
-                        atual = pai[atual]
-                        ciclo.append(atual)
-                    ciclo.reverse()
-                    
-                    tamanho = len(ciclo)
-                    if tamanho < menor_tamanho:
-                        menor_tamanho = tamanho
-                        menor_ciclo = ciclo
-
-    return (menor_tamanho, menor_ciclo) if menor_ciclo else None
+    except Exception as e:
+        flash(f"Erro ao decompor o grafo: {str(e)}", "danger")
+        return redirect(url_for("index"))
+
+@app.route("/cliques", methods=["POST"])
+def cliques():
+    global grafo_atual
+    if not grafo_atual:
+        flash("Carregue um grafo primeiro!", "warning")
+        return redirect(url_for("index"))
+    
+    try:
+        tipo = request.form.get('tipo', 'clique')
+        if tipo == 'clique':
+            with medir('clique_maxima'):
+                vertices, limite = grafo_atual.clique_maxima(TEMPO_LIMITE_CLIQUES)
+            with medir('cliques_maximais'):
+                quantidade = sum(1 for _ in itertools.islice(grafo_atual.cliques_maximais(), LIMITE_CLIQUES_MAXIMAIS + 1))
+            descricao = "Clique máxima"
+            complemento = (f" O grafo tem {quantidade} cliques maximais." if quantidade <= LIMITE_CLIQUES_MAXIMAIS
+                           else f" O grafo tem mais de {LIMITE_CLIQUES_MAXIMAIS} cliques maximais.")
+        elif tipo == 'independente':
+            with medir('conjunto_independente_maximo'):
+                vertices, limite = grafo_atual.conjunto_independente_maximo(TEMPO_LIMITE_CLIQUES)
+            descricao = "Conjunto independente máximo"
+            complemento = ""
+        else:
+            flash("Tipo de busca inválido!", "warning")
+            return redirect(url_for("index"))
+        
+        # Vértices do conjunto em destaque; numa clique, as arestas entre eles também
+        vis = Visualizacao(grafo_atual)
+        vis.destacar_nos(vertices, "#FF8C00", tamanho=25)
+        if tipo == 'clique':
+            vis.destacar_arestas(vis.arestas_por_pares(itertools.combinations(vertices, 2)), "#FF8C00", largura=3)
+        salvar_visualizacao(vis)
+        
+        if len(vertices) == limite:
+            mensagem = f"{descricao}: {len(vertices)} vértice(s)."
+        else:
+            mensagem = (f"{descricao} (tempo esgotado): {len(vertices)} vértice(s) encontrados, "
+                        f"de no máximo {limite} possíveis.")
+        if len(vertices) <= 30:
+            mensagem += f" Vértices: {', '.join(grafo_atual.rotulos(vertices))}."
+        flash(mensagem + complemento, "success" if len(vertices) == limite else "warning")
+        return redirect(url_for("index"))
+        
+    except Exception as e:
+        flash(f"Erro ao buscar cliques: {str(e)}", "danger")
+        return redirect(url_for("index"))
+
+@app.route("/rota_visita", methods=["POST"])
+def rota_visita():
+    global grafo_atual
+    if not grafo_atual:
+        flash("Carregue um grafo primeiro!", "warning")
+        return redirect(url_for("index"))
+    
+    try:
+        # Paradas separadas por ';' (nomes podem ter vírgulas); vazio = todos os vértices
+        nomes = [nome.strip() for nome in request.form.get('paradas', '').split(';') if nome.strip()]
+        try:
+            paradas = [grafo_atual.tabela_nomes.id(nome) for nome in nomes] or None
+        except KeyError as e:
+            flash(f"Vértice não encontrado: {e.args[0]}", "warning")
+            return redirect(url_for("index"))
+        
+        with medir('rota_visita'):
+            ordem, custo, passeio, exata = grafo_atual.rota_visita(paradas, TEMPO_LIMITE_ROTA)
+        
+        # Passeio em laranja, paradas em destaque e a primeira parada em rosa
+        vis = Visualizacao(grafo_atual)
+        vis.destacar_nos(set(passeio), "#ff7f50")
+        vis.destacar_nos(ordem, "#FF8C00", tamanho=25)
+        vis.destacar_nos({ordem[0]}, "#FF69B4", tamanho=25)
+        vis.destacar_arestas(vis.arestas_por_pares(zip(passeio, passeio[1:])), "#ff7f50", largura=3)
+        salvar_visualizacao(vis)
+        
+        mensagem = (f"Rota {'ótima' if exata else 'heurística'} por {len(ordem)} parada(s), "
+                    f"distância total {custo:g}.")
+        if len(ordem) <= 30:
+            mensagem += f" Ordem: {' -> '.join(grafo_atual.rotulos(ordem + ordem[:1]))}."
+        flash(mensagem, "success")
+        return redirect(url_for("index"))
+        
+    except (ValueError, TimeoutError) as e:
+        flash(str(e), "warning")
+        return redirect(url_for("index"))
+    except Exception as e:
+        flash(f"Erro ao calcular a rota: {str(e)}", "danger")
+        return redirect(url_for("index"))
+
+@app.route("/rede_ego", methods=["POST"])
+def rede_ego():
+    global grafo_atual
+    if not grafo_atual:
+        flash("Carregue um grafo primeiro!", "warning")
+        return redirect(url_for("index"))
+    
+    try:
+        nome_centro = request.form.get('centro', '').strip()
+        raio = int(request.form.get('raio', 1))
+        if raio < 0:
+            flash("O raio deve ser pelo menos 0!", "warning")
+            return redirect(url_for("index"))
+        try:
+            centro = grafo_atual.tabela_nomes.id(nome_centro)
+        except KeyError as e:
+            flash(f"Vértice não encontrado: {e.args[0]}", "warning")
+            return redirect(url_for("index"))
+        
+        # A vizinhança é uma vista sobre o grafo atual: só ela é desenhada, sem copiar o grafo
+        with medir('rede_ego'):
+            vista = grafo_atual.rede_ego(centro, raio)
+        vis = Visualizacao(vista)
+        vis.destacar_nos({vista.local(centro)}, "#FF69B4", tamanho=25)
+        salvar_visualizacao(vis)
+        
+        flash(f"Vizinhança de {nome_centro} (raio {raio}): {vista.vertices} vértice(s) e "
+              f"{len(vista.arestas)} aresta(s) de {grafo_atual.vertices} e {len(grafo_atual.arestas)}.", "success")
+        return redirect(url_for("index"))
+        
+    except Exception as e:
+        flash(f"Erro ao extrair a vizinhança: {str(e)}", "danger")
+        return redirect(url_for("index"))
+
+@app.route("/exportar", methods=["POST"])
+def exportar():
+    global grafo_atual
+    if not grafo_atual:
+        flash("Carregue um grafo primeiro!", "warning")
+        return redirect(url_for("index"))
+    
+    try:
+        formato = request.form.get('formato', 'arestas')
+        conteudo = request.form.get('conteudo', 'grafo')
+        if formato not in FORMATOS_EXPORTACAO or conteudo not in CONTEUDOS_EXPORTACAO:
+            flash("Formato ou conteúdo de exportação inválido!", "warning")
+            return redirect(url_for("index"))
+        
+        # Árvore e corte saem como vistas só com as suas arestas; as comunidades, como atributo dos vértices
+        grafo, atributos_nos = grafo_atual, None
+        with medir(f'exportar_{conteudo}'):
+            if conteudo == 'arvore_geradora':
+                arestas, _ = grafo_atual.arvore_geradora_minima()
+                grafo = grafo_atual.subgrafo_arestas(grafo_atual.indices_arestas(arestas))
+            elif conteudo == 'menor_corte':
+                grafo = grafo_atual.subgrafo_arestas(grafo_atual.indices_arestas(grafo_atual.encontrar_menor_corte() or []))
+            elif conteudo == 'comunidades':
+                atributos_nos = {'comunidade': grafo_atual.comunidades_leiden(semente=0)}
+        
+        # O arquivo é gerado aos pedaços durante o envio, sem ser montado na memória
+        _, tipo, extensao, _ = FORMATOS_EXPORTACAO[formato]
+        return Response(exportar_grafo(grafo, formato, atributos_nos), mimetype=tipo,
+                        headers={'Content-Disposition': f'attachment; filename="{conteudo}.{extensao}"'})
+        
+    except Exception as e:
+        flash(f"Erro ao exportar: {str(e)}", "danger")
+        return redirect(url_for("index"))
+
+@app.route("/comparar_versoes", methods=["POST"])
+def comparar_versoes():
+    global grafo_atual, grafo_anterior
+    if not grafo_atual or not grafo_anterior:
+        flash("Carregue duas versões do grafo para comparar!", "warning")
+        return redirect(url_for("index"))
+    
+    try:
+        with medir('diferenca'):
+            diferenca = grafo_atual.diferenca(grafo_anterior)
+        with medir('comparar_metricas'):
+            metricas = grafo_atual.comparar_metricas(grafo_anterior, diferenca)
+        
+        # Visualiza a união das versões: o que entrou em verde, o que saiu em vermelho tracejado
+        # (pesos alterados em laranja)
+        uniao = grafo_atual.uniao_por_nome(grafo_anterior)
+        tabela = uniao.tabela_nomes
+        vis = Visualizacao(uniao)
+        
+        def indices(arestas):
+            return vis.arestas_por_pares((tabela.id(a), tabela.id(b)) for a, b in arestas)
+        vis.destacar_nos(tabela.ids(diferenca['vertices_adicionados']), "#2E8B57")
+        vis.destacar_nos(tabela.ids(diferenca['vertices_removidos']), "#FF0000")
+        vis.destacar_arestas(indices(diferenca['arestas_adicionadas']), "#2E8B57", largura=3)
+        vis.destacar_arestas(indices(aresta for aresta, _, _ in diferenca['pesos_alterados']), "#FFA500", largura=3)
+        vis.destacar_arestas(indices(diferenca['arestas_removidas']), "#FF0000", largura=3, tracejada=True)
+        salvar_visualizacao(vis)
+        
+        mudancas = [f"{len(diferenca[chave])} {descricao}" for chave, descricao in (
+            ('vertices_adicionados', "vértice(s) adicionado(s)"), ('vertices_removidos', "vértice(s) removido(s)"),
+            ('arestas_adicionadas', "aresta(s) adicionada(s)"), ('arestas_removidas', "aresta(s) removida(s)"),
+            ('pesos_alterados', "peso(s) alterado(s)")) if diferenca[chave]]
+        if not mudancas:
+            flash("As duas versões são iguais.", "info")
+            return redirect(url_for("index"))
+        
+        def descrever(nome, metrica):
+            origem = "recalculado" if metrica['recalculada'] else "sem recálculo"
+            return f"{nome}: {metrica['antes']} → {metrica['depois']} ({origem})"
+        mensagem = "Mudanças desde a versão anterior: " + ", ".join(mudancas) + ". " + "; ".join(
+            descrever(nome, metricas[chave]) for chave, nome in (
+                ('componentes', "Componentes"), ('pontes', "Pontes"), ('diametro', "Diâmetro"))) + "."
+        pontes = metricas['pontes']
+        if pontes['adicionadas'] and len(pontes['adicionadas']) <= 10:
+            mensagem += " Novas pontes: " + "; ".join(f"{a} - {b}" for a, b in pontes['adicionadas']) + "."
+        if sum(len(diferenca[chave]) for chave in diferenca) <= 20:
+            for chave, descricao in (('vertices_adicionados', "Vértices novos"), ('vertices_removidos', "Vértices removidos")):
+                if diferenca[chave]:
+                    mensagem += f" {descricao}: {', '.join(diferenca[chave])}."
+            for chave, descricao in (('arestas_adicionadas', "Arestas novas"), ('arestas_removidas', "Arestas removidas")):
+                if diferenca[chave]:
+                    mensagem += f" {descricao}: " + "; ".join(f"{a} - {b}" for a, b in diferenca[chave]) + "."
+        flash(mensagem, "success")
+        return redirect(url_for("index"))
+        
+    except Exception as e:
+        flash(f"Erro ao comparar versões: {str(e)}", "danger")
+        return redirect(url_for("index"))
+
+@app.route("/carregar_salvo", methods=["POST"])
+def carregar_salvo():
+    global grafo_atual, grafo_anterior
+    if catalogo is None:
+        flash("O catálogo de grafos não está disponível.", "warning")
+        return redirect(url_for("index"))
+    
+    try:
+        # Valor do formulário: "<id do grafo>:<versão>"
+        grafo_id, numero = (int(parte) for parte in request.form.get('versao', '').split(':'))
+        with medir('carregar_snapshot'):
+            grafo = catalogo.carregar(grafo_id, numero)
+        
+        grafo_anterior = grafo_atual
+        grafo_atual = grafo
+        registrar_grafo(grafo)
+        session['grafo_salvo'] = [grafo_id, numero]
+        
+        vis = Visualizacao(grafo, OPCOES_CARGA, cor_arestas=None)
+        salvar_visualizacao(vis)
+        
+        flash(f"Versão {numero} carregada! ({grafo.vertices} vértices, {len(grafo.arestas)} arestas)", "success")
+        return redirect(url_for("index"))
+        
+    except KeyError:
+        flash("Essa versão não está mais no catálogo (pode ter sido removida pela cota).", "warning")
+        return redirect(url_for("index"))
+    except Exception as e:
+        flash(f"Erro ao carregar grafo salvo: {str(e)}", "danger")
+        return redirect(url_for("index"))
 
 # Configuração para o Render
 if __name__ == "__main__":
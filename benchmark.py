@@ -0,0 +1,289 @@
+# benchmark.py
+"""
+Mede tempo e pico de memória dos algoritmos do Grafo em grafos sintéticos de tamanho crescente.
+
+Exemplos:
+    python benchmark.py --tamanhos 8 16 32 64 --saida resultados.json
+    python benchmark.py --algoritmos is_conexo calcular_diametro --comparar resultados.json
+    python benchmark.py --importacao --algoritmos
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from grafo import Grafo
+
+
+def _lado_grade(n):
+    return max(1, int(round(n ** 0.5)))
+
+
+# Cada gerador recebe (número aproximado de vértices, semente)
+GERADORES = {
+    'erdos_renyi': lambda n, semente: Grafo.gerar_grafo_erdos_renyi(n, min(1.0, 4.0 / max(n - 1, 1)), semente),
+    'barabasi_albert': lambda n, semente: Grafo.gerar_grafo_barabasi_albert(max(n, 3), 2, semente),
+    'grade': lambda n, semente: Grafo.gerar_grafo_grade(_lado_grade(n), max(1, n // _lado_grade(n))),
+    'arvore': lambda n, semente: Grafo.gerar_arvore_aleatoria(n, semente),
+    'ciclo': lambda n, semente: Grafo.gerar_grafo_ciclo(max(n, 3)),
+    'regular': lambda n, semente: Grafo.gerar_grafo_regular_aleatorio(max(n, 4) + (n % 2), 3, semente),
+}
+
+
+def _arvore_geradora(grafo, semente):
+    arvore = Grafo(grafo.vertices)
+    for u, v in grafo.arvore_geradora_minima()[0]:
+        arvore.adicionar_aresta(u, v)
+    return arvore
+
+
+def _copia_permutada(grafo, semente):
+    """Cópia do grafo com os vértices renomeados por uma permutação aleatória."""
+    permutacao = list(range(grafo.vertices))
+    random.Random(semente).shuffle(permutacao)
+    copia = Grafo(grafo.vertices)
+    for u, v in grafo.arestas:
+        copia.adicionar_aresta(permutacao[u], permutacao[v])
+    return copia
+
+
+# nome -> (preparação fora da medição, execução medida, maior tamanho testado)
+# Os algoritmos exponenciais têm limite baixo para a varredura terminar em tempo razoável.
+ALGORITMOS = {
+    'is_conexo': (None, lambda g, dados: g.is_conexo(), 4096),
+    'is_euleriano': (None, lambda g, dados: g.is_euleriano(), 4096),
+    'is_hamiltoniano': (None, lambda g, dados: g.is_hamiltoniano(tempo_limite=5.0), 256),
+    'sao_isomorfos': (_copia_permutada, lambda g, dados: g.sao_isomorfos(dados), 1024),
+    'contar_subgrafos': (lambda g, semente: Grafo.gerar_grafo_ciclo(4), lambda g, dados: g.contar_subgrafos(dados), 4096),
+    'conectividade_arestas': (None, lambda g, dados: g.conectividade_arestas(), 131072),
+    'encontrar_menor_corte': (None, lambda g, dados: g.encontrar_menor_corte(), 131072),
+    'encontrar_menor_corte_exaustivo': (None, lambda g, dados: g.encontrar_menor_corte_exaustivo(), 32),
+    'encontrar_corte_de_tamanho': (None, lambda g, dados: g.encontrar_corte_de_tamanho(3), 131072),
+    'encontrar_corte_de_tamanho_exaustivo': (None, lambda g, dados: g.encontrar_corte_de_tamanho_exaustivo(2), 64),
+    'calcular_diametro': (None, lambda g, dados: g.calcular_diametro(), 256),
+    'menor_caminho': (None, lambda g, dados: g.menor_caminho(0, g.vertices - 1), 65536),
+    'encontrar_ciclo': (None, lambda g, dados: g.encontrar_ciclo(4), 1024),
+    'encontrar_menor_ciclo': (None, lambda g, dados: g.encontrar_menor_ciclo(), 512),
+    'colorir_guloso': (None, lambda g, dados: g.colorir_guloso('menor_ultimo'), 65536),
+    'colorir_dsatur': (None, lambda g, dados: g.colorir_dsatur(), 65536),
+    'clique_maxima': (None, lambda g, dados: g.clique_maxima(tempo_limite=5.0), 65536),
+    'cliques_maximais': (None, lambda g, dados: sum(1 for _ in g.cliques_maximais()), 65536),
+    'conjunto_independente_maximo': (None, lambda g, dados: g.conjunto_independente_maximo(tempo_limite=5.0), 4096),
+    'rota_visita': (None, lambda g, dados: g.rota_visita(tempo_limite=2.0, semente=0), 1024),
+    'colorir_exato': (None, lambda g, dados: g.colorir_exato(tempo_limite=5.0), 64),
+    'centralidade_intermediacao': (None, lambda g, dados: g.centralidade_intermediacao(), 1024),
+    'centralidade_intermediacao_aproximada': (None, lambda g, dados: g.centralidade_intermediacao_aproximada(0.1, semente=0), 65536),
+    'centralidade_proximidade': (None, lambda g, dados: g.centralidade_proximidade(), 1024),
+    'pagerank': (None, lambda g, dados: g.pagerank(), 65536),
+    'numeros_nucleo': (None, lambda g, dados: g.numeros_nucleo(), 65536),
+    'emparelhamento_maximo': (None, lambda g, dados: g.emparelhamento_maximo(), 65536),
+    'is_arvore_abrangencia_de': (_arvore_geradora, lambda g, dados: dados.is_arvore_abrangencia_de(g), 65536),
+    'contar_arvores_abrangencia': (None, lambda g, dados: g.contar_arvores_abrangencia(), 1024),
+    'arvore_geradora_aleatoria': (None, lambda g, dados: g.arvore_geradora_aleatoria(semente=0), 65536),
+    'confiabilidade': (None, lambda g, dados: g.confiabilidade(0.01, amostras=10000, semente=0), 16384),
+    'comunidades_propagacao_rotulos': (None, lambda g, dados: g.comunidades_propagacao_rotulos(semente=0), 65536),
+    'comunidades_louvain': (None, lambda g, dados: g.comunidades_louvain(semente=0), 65536),
+    'comunidades_leiden': (None, lambda g, dados: g.comunidades_leiden(semente=0), 65536),
+    'componentes_biconexas': (None, lambda g, dados: g.componentes_biconexas(), 65536),
+    'componentes_triconexas': (None, lambda g, dados: g.componentes_triconexas(), 256),
+    'decomposicao_arvore': (None, lambda g, dados: g.decomposicao_arvore('grau_minimo'), 4096),
+    'decomposicao_arvore_preenchimento': (None, lambda g, dados: g.decomposicao_arvore('preenchimento_minimo'), 4096),
+    'gerar_lista_adjacencia': (None, lambda g, dados: g.gerar_lista_adjacencia(), 65536),
+    'matriz_adjacencia_esparsa': (None, lambda g, dados: g.matriz_adjacencia_esparsa(), 65536),
+}
+
+
+# Tempo máximo de 'import <módulo>' em um processo novo (subida de um worker do gunicorn)
+ORCAMENTO_IMPORTACAO_S = {'grafo': 0.25, 'app': 0.75}
+# Módulos que só devem ser carregados no primeiro uso, nunca no import
+MODULOS_PESADOS = ('networkx', 'matplotlib', 'numpy', 'scipy', 'multiprocessing')
+_CODIGO_IMPORTACAO = """
+import json, resource, sys, time
+inicio = time.perf_counter()
+import {modulo}
+tempo = time.perf_counter() - inicio
+print(json.dumps({{
+    'tempo_s': tempo,
+    'memoria_pico_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'pesados': sorted(m for m in {pesados!r} if m in sys.modules),
+}}))
+"""
+
+
+def medir_importacao(modulo, repeticoes=5):
+    """
+    Mede o import de um módulo em processos novos (o cache de módulos do processo atual
+    esconderia o custo). Retorna o menor tempo, o pico de memória residente e os módulos
+    pesados que o import carregou.
+    """
+    medicoes = []
+    for _ in range(repeticoes):
+        saida = subprocess.run([sys.executable, '-c', _CODIGO_IMPORTACAO.format(modulo=modulo, pesados=MODULOS_PESADOS)],
+                               capture_output=True, text=True, check=True)
+        medicoes.append(json.loads(saida.stdout.strip().splitlines()[-1]))
+    melhor = min(medicoes, key=lambda m: m['tempo_s'])
+    return {'modulo': modulo, 'orcamento_s': ORCAMENTO_IMPORTACAO_S.get(modulo), **melhor}
+
+
+def verificar_importacao(repeticoes=5, saida_log=sys.stdout):
+    """Mede os módulos de ORCAMENTO_IMPORTACAO_S; retorna (medições, módulos fora do orçamento)."""
+    medicoes, violacoes = [], []
+    for modulo, orcamento in ORCAMENTO_IMPORTACAO_S.items():
+        medicao = medir_importacao(modulo, repeticoes)
+        medicoes.append(medicao)
+        if medicao['tempo_s'] > orcamento or medicao['pesados']:
+            violacoes.append(modulo)
+        if saida_log:
+            pesados = f", carregou {', '.join(medicao['pesados'])}" if medicao['pesados'] else ""
+            print(f"import {modulo:<10} {medicao['tempo_s'] * 1000:.1f} ms (orçamento {orcamento * 1000:.0f} ms), "
+                  f"{medicao['memoria_pico_kb']} KB residentes{pesados}", file=saida_log)
+    return medicoes, violacoes
+
+
+def medir(algoritmo, grafo, semente, repeticoes):
+    """Retorna (menor tempo em segundos, pico de memória em KB) de um algoritmo em um grafo."""
+    preparar, executar, _ = ALGORITMOS[algoritmo]
+    dados = preparar(grafo, semente) if preparar else None
+
+    tempos = []
+    for _ in range(repeticoes):
+        # Descarta estruturas em cache (CSR, conectividade...) para medir o cálculo completo
+        grafo._cache = {}
+        inicio = time.perf_counter()
+        executar(grafo, dados)
+        tempos.append(time.perf_counter() - inicio)
+
+    # O rastreamento de memória deixa a execução mais lenta, então é feito em uma rodada separada
+    grafo._cache = {}
+    tracemalloc.start()
+    try:
+        executar(grafo, dados)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(tempos), pico / 1024
+
+
+def executar_benchmark(algoritmos, geradores, tamanhos, semente=42, repeticoes=3, limite_tempo=10.0, saida_log=sys.stdout):
+    """
+    Varre tamanhos x geradores x algoritmos. Quando uma medição passa de limite_tempo segundos,
+    os tamanhos maiores daquela combinação são pulados.
+    """
+    resultados = []
+    for nome_gerador in geradores:
+        for algoritmo in algoritmos:
+            tamanho_maximo = ALGORITMOS[algoritmo][2]
+            for n in sorted(tamanhos):
+                if n > tamanho_maximo:
+                    break
+                grafo = GERADORES[nome_gerador](n, semente)
+                registro = {
+                    'algoritmo': algoritmo,
+                    'gerador': nome_gerador,
+                    'tamanho': n,
+                    'vertices': grafo.vertices,
+                    'arestas': len(grafo.arestas),
+                }
+                try:
+                    tempo, memoria = medir(algoritmo, grafo, semente, repeticoes)
+                    registro['tempo_s'] = tempo
+                    registro['memoria_pico_kb'] = round(memoria, 1)
+                except Exception as e:
+                    # Ex.: RecursionError em buscas recursivas para grafos grandes
+                    registro['erro'] = f"{type(e).__name__}: {e}"
+                resultados.append(registro)
+                if saida_log:
+                    descricao = registro.get('erro') or f"{registro['tempo_s'] * 1000:.2f} ms, {registro['memoria_pico_kb']} KB"
+                    print(f"{algoritmo:<38} {nome_gerador:<16} V={grafo.vertices:<6} E={len(grafo.arestas):<7} {descricao}", file=saida_log)
+                if 'erro' in registro or registro['tempo_s'] > limite_tempo:
+                    break
+    return resultados
+
+
+def _chave(registro):
+    return (registro['algoritmo'], registro['gerador'], registro['tamanho'])
+
+
+def comparar(atuais, anteriores, tolerancia=1.25, piso_s=0.001):
+    """
+    Compara duas execuções. Retorna as medições que ficaram mais de 'tolerancia' vezes mais lentas
+    (tempos abaixo de piso_s são ruído e ficam de fora).
+    """
+    referencia = {_chave(r): r for r in anteriores if 'tempo_s' in r}
+    regressoes = []
+    for registro in atuais:
+        anterior = referencia.get(_chave(registro))
+        if anterior is None or 'tempo_s' not in registro:
+            continue
+        if registro['tempo_s'] < piso_s and anterior['tempo_s'] < piso_s:
+            continue
+        razao = registro['tempo_s'] / max(anterior['tempo_s'], 1e-9)
+        if razao > tolerancia:
+            regressoes.append({**registro, 'tempo_anterior_s': anterior['tempo_s'], 'razao': round(razao, 2)})
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dos algoritmos da classe Grafo")
+    parser.add_argument('--algoritmos', nargs='*', choices=sorted(ALGORITMOS), default=sorted(ALGORITMOS))
+    parser.add_argument('--geradores', nargs='+', choices=sorted(GERADORES), default=sorted(GERADORES))
+    parser.add_argument('--tamanhos', nargs='+', type=int, default=[8, 16, 32, 64, 128, 256])
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--limite-tempo', type=float, default=10.0,
+                        help="segundos por medição antes de pular os tamanhos maiores")
+    parser.add_argument('--saida', help="arquivo JSON onde salvar os resultados")
+    parser.add_argument('--comparar', help="JSON de uma execução anterior para detectar regressões")
+    parser.add_argument('--tolerancia', type=float, default=1.25)
+    parser.add_argument('--importacao', action='store_true',
+                        help="mede também o tempo de import dos módulos contra ORCAMENTO_IMPORTACAO_S")
+    args = parser.parse_args(argv)
+
+    codigo_saida = 0
+    importacao = None
+    if args.importacao:
+        importacao, violacoes = verificar_importacao(args.repeticoes)
+        for modulo in violacoes:
+            print(f"ORÇAMENTO DE IMPORT EXCEDIDO: {modulo}")
+        if violacoes:
+            codigo_saida = 1
+
+    resultados = executar_benchmark(args.algoritmos, args.geradores, args.tamanhos,
+                                    args.semente, args.repeticoes, args.limite_tempo)
+    relatorio = {
+        'metadados': {
+            'data': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'semente': args.semente,
+            'repeticoes': args.repeticoes,
+        },
+        'resultados': resultados,
+    }
+    if importacao is not None:
+        relatorio['importacao'] = importacao
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, indent=2, ensure_ascii=False)
+        print(f"Resultados salvos em {args.saida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            anteriores = json.load(f)['resultados']
+        regressoes = comparar(resultados, anteriores, args.tolerancia)
+        for r in regressoes:
+            print(f"REGRESSÃO {r['algoritmo']} {r['gerador']} n={r['tamanho']}: "
+                  f"{r['tempo_anterior_s'] * 1000:.2f} ms -> {r['tempo_s'] * 1000:.2f} ms ({r['razao']}x)")
+        if regressoes:
+            return 1
+        print("Nenhuma regressão encontrada")
+    return codigo_saida
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,308 @@
+# caixeiro.py
+"""
+Caixeiro-viajante sobre uma matriz de distâncias simétrica que respeita a desigualdade
+triangular (por exemplo, as distâncias de menor caminho entre vértices de um grafo).
+Uma rota é uma lista com cada cidade uma vez; a volta ao início fica implícita.
+
+    rota, custo, exata = resolver(distancias, tempo_limite=5.0)
+
+Até LIMITE_HELD_KARP cidades a rota é ótima (Held–Karp). Acima disso, as rotas do vizinho
+mais próximo e de uma construção no estilo de Christofides passam por 2-opt e Or-opt
+restritos às listas de vizinhos mais próximos, e o tempo que sobra vai para busca local
+iterada (perturbações double-bridge). A melhor rota encontrada é sempre a devolvida.
+"""
+import heapq
+import random
+import time
+from collections import deque
+
+# Instâncias até este tamanho são resolvidas de forma exata: O(2^n n²)
+LIMITE_HELD_KARP = 12
+# Tamanho das listas de vizinhos usadas pelas buscas locais
+VIZINHOS_CANDIDATOS = 10
+# Maior trecho de cidades consecutivas que o Or-opt move de lugar
+TRECHO_OR_OPT = 3
+# A busca local iterada para depois de tantas perturbações seguidas sem melhorar a rota
+PERTURBACOES_SEM_MELHORA = 500
+EPSILON = 1e-9
+
+
+def custo_rota(distancias, rota):
+    return sum(distancias[a][b] for a, b in zip(rota, rota[1:] + rota[:1]))
+
+
+def vizinho_mais_proximo(distancias, inicio=0):
+    """Rota gulosa: sempre para a cidade ainda não visitada mais próxima. O(n²)."""
+    n = len(distancias)
+    restantes = set(range(n)) - {inicio}
+    rota = [inicio]
+    while restantes:
+        linha = distancias[rota[-1]]
+        proxima = min(restantes, key=linha.__getitem__)
+        restantes.remove(proxima)
+        rota.append(proxima)
+    return rota
+
+
+def christofides_guloso(distancias):
+    """
+    Construção no estilo de Christofides: árvore geradora mínima (Prim denso), emparelhamento
+    dos vértices de grau ímpar, circuito euleriano e atalhos pelas cidades repetidas.
+    O emparelhamento é guloso (pares mais próximos primeiro), então não vale a garantia de 3/2
+    do emparelhamento de custo mínimo, mas a rota costuma ser bem melhor que a do vizinho mais próximo.
+    """
+    n = len(distancias)
+    arestas = []
+    custo = [float('inf')] * n
+    pai = [-1] * n
+    fora = set(range(n))
+    custo[0] = 0
+    while fora:
+        v = min(fora, key=custo.__getitem__)
+        fora.remove(v)
+        if pai[v] != -1:
+            arestas.append((pai[v], v))
+        linha = distancias[v]
+        for w in fora:
+            if linha[w] < custo[w]:
+                custo[w] = linha[w]
+                pai[w] = v
+
+    grau = [0] * n
+    for u, v in arestas:
+        grau[u] += 1
+        grau[v] += 1
+    impares = [v for v in range(n) if grau[v] % 2]
+    pares = sorted((distancias[a][b], a, b) for i, a in enumerate(impares) for b in impares[i + 1:])
+    emparelhado = set()
+    for _, a, b in pares:
+        if a not in emparelhado and b not in emparelhado:
+            arestas.append((a, b))
+            emparelhado.update((a, b))
+
+    # Circuito euleriano (Hierholzer iterativo) no multigrafo árvore + emparelhamento
+    incidentes = [[] for _ in range(n)]
+    for e, (u, v) in enumerate(arestas):
+        incidentes[u].append(e)
+        incidentes[v].append(e)
+    usada = [False] * len(arestas)
+    proxima = [0] * n
+    pilha = [0]
+    circuito = []
+    while pilha:
+        v = pilha[-1]
+        while proxima[v] < len(incidentes[v]) and usada[incidentes[v][proxima[v]]]:
+            proxima[v] += 1
+        if proxima[v] == len(incidentes[v]):
+            circuito.append(pilha.pop())
+            continue
+        e = incidentes[v][proxima[v]]
+        usada[e] = True
+        u, w = arestas[e]
+        pilha.append(w if u == v else u)
+    return list(dict.fromkeys(circuito))
+
+
+def held_karp(distancias):
+    """Rota ótima por programação dinâmica sobre subconjuntos (Held–Karp)."""
+    n = len(distancias)
+    if n <= 3:
+        return list(range(n))
+    # custo[mascara][j]: sair da cidade 0, passar pelas cidades da máscara (bit j - 1 = cidade j) e parar em j
+    completo = (1 << (n - 1)) - 1
+    infinito = float('inf')
+    custo = [[infinito] * n for _ in range(completo + 1)]
+    anterior = [[0] * n for _ in range(completo + 1)]
+    for j in range(1, n):
+        custo[1 << (j - 1)][j] = distancias[0][j]
+    for mascara in range(1, completo + 1):
+        linha = custo[mascara]
+        for j in range(1, n):
+            atual = linha[j]
+            if atual == infinito:
+                continue
+            for k in range(1, n):
+                bit = 1 << (k - 1)
+                if mascara & bit:
+                    continue
+                novo = atual + distancias[j][k]
+                if novo < custo[mascara | bit][k]:
+                    custo[mascara | bit][k] = novo
+                    anterior[mascara | bit][k] = j
+    fim = min(range(1, n), key=lambda j: custo[completo][j] + distancias[j][0])
+    rota = []
+    mascara = completo
+    while fim:
+        rota.append(fim)
+        fim, mascara = anterior[mascara][fim], mascara & ~(1 << (fim - 1))
+    return [0] + rota[::-1]
+
+
+def listas_vizinhos(distancias, k=VIZINHOS_CANDIDATOS):
+    """As k cidades mais próximas de cada cidade, da mais próxima para a mais distante."""
+    n = len(distancias)
+    return [[j for j in heapq.nsmallest(k + 1, range(n), key=linha.__getitem__) if j != i][:k]
+            for i, linha in enumerate(distancias)]
+
+
+def _inverter(rota, posicao, i, j):
+    """Inverte o trecho circular rota[i..j]; se for mais curto, inverte o complemento (dá a mesma rota)."""
+    n = len(rota)
+    i %= n
+    j %= n
+    tamanho = (j - i) % n + 1
+    if 2 * tamanho > n:
+        i, j, tamanho = (j + 1) % n, (i - 1) % n, n - tamanho
+    for _ in range(tamanho // 2):
+        a, b = rota[i], rota[j]
+        rota[i], rota[j] = b, a
+        posicao[b], posicao[a] = i, j
+        i = (i + 1) % n
+        j = (j - 1) % n
+
+
+def _dois_opt(distancias, rota, posicao, vizinhos, a):
+    """
+    Melhor troca 2-opt que remove uma das arestas de a e liga a a um vizinho próximo c.
+    Só vale a pena se d(a, c) for menor que a aresta removida, então a lista ordenada pode parar cedo.
+    Retorna as cidades tocadas ou None.
+    """
+    n = len(rota)
+    i = posicao[a]
+    linha = distancias[a]
+    for sentido in (1, -1):
+        b = rota[(i + sentido) % n]
+        removida = linha[b]
+        for c in vizinhos[a]:
+            ligada = linha[c]
+            if ligada >= removida:
+                break
+            j = posicao[c]
+            d = rota[(j + sentido) % n]
+            if c == b or d == a:
+                continue
+            if removida + distancias[c][d] - ligada - distancias[b][d] > EPSILON:
+                if sentido == 1:
+                    _inverter(rota, posicao, i + 1, j)  # a b ... c d -> a c ... b d
+                else:
+                    _inverter(rota, posicao, i, j - 1)  # b a ... d c -> b d ... a c
+                return a, b, c, d
+    return None
+
+
+def _or_opt(distancias, rota, posicao, vizinhos, a):
+    """
+    Move o trecho de 1 a TRECHO_OR_OPT cidades que começa em a para entre duas cidades vizinhas
+    de uma de suas pontas, na orientação que for melhor. Retorna as cidades tocadas ou None.
+    """
+    n = len(rota)
+    i = posicao[a]
+    for tamanho in range(1, min(TRECHO_OR_OPT, n - 3) + 1):
+        trecho = [rota[(i + k) % n] for k in range(tamanho)]
+        primeira, ultima = trecho[0], trecho[-1]
+        p, q = rota[(i - 1) % n], rota[(i + tamanho) % n]
+        retirada = distancias[p][primeira] + distancias[ultima][q] - distancias[p][q]
+        if retirada <= EPSILON:
+            continue
+        no_trecho = set(trecho)
+        for ponta in (primeira, ultima):
+            for c in vizinhos[ponta]:
+                if distancias[ponta][c] >= retirada:
+                    break
+                if c in no_trecho:
+                    continue
+                j = posicao[c]
+                for u, v in ((c, rota[(j + 1) % n]), (rota[(j - 1) % n], c)):
+                    if u in no_trecho or v in no_trecho:
+                        continue
+                    base = distancias[u][v]
+                    direta = distancias[u][primeira] + distancias[ultima][v] - base
+                    invertida = distancias[u][ultima] + distancias[primeira][v] - base
+                    if retirada - min(direta, invertida) > EPSILON:
+                        resto = [x for x in rota if x not in no_trecho]
+                        k = resto.index(u) + 1
+                        resto[k:k] = trecho if direta <= invertida else trecho[::-1]
+                        rota[:] = resto
+                        for k, x in enumerate(rota):
+                            posicao[x] = k
+                        return p, q, u, v, primeira, ultima
+    return None
+
+
+def busca_local(distancias, rota, vizinhos, prazo, pendentes=None):
+    """
+    Aplica 2-opt e Or-opt até nenhuma cidade ter movimento que melhore (ou até o prazo). As cidades
+    a examinar ficam numa fila; depois de um movimento, só as cidades tocadas voltam para ela.
+    Altera e devolve a rota.
+    """
+    n = len(rota)
+    if n < 5:
+        return rota
+    posicao = [0] * n
+    for i, c in enumerate(rota):
+        posicao[c] = i
+    fila = deque(rota if pendentes is None else pendentes)
+    na_fila = [False] * n
+    for c in fila:
+        na_fila[c] = True
+    while fila:
+        if time.perf_counter() > prazo:
+            break
+        a = fila.popleft()
+        na_fila[a] = False
+        tocadas = (_dois_opt(distancias, rota, posicao, vizinhos, a)
+                   or _or_opt(distancias, rota, posicao, vizinhos, a))
+        if tocadas:
+            for c in tocadas:
+                if not na_fila[c]:
+                    na_fila[c] = True
+                    fila.append(c)
+    return rota
+
+
+def _double_bridge(rota, sorteio, alcance=50):
+    """Perturbação A B C D -> A C B D com trechos curtos; devolve a rota nova e as cidades nos cortes."""
+    n = len(rota)
+    inicio = sorteio.randrange(n)
+    girada = rota[inicio:] + rota[:inicio]
+    limite = max(1, min(alcance, (n - 1) // 3))
+    p1 = 1 + sorteio.randrange(limite)
+    p2 = p1 + 1 + sorteio.randrange(limite)
+    p3 = p2 + 1 + sorteio.randrange(limite)
+    nova = girada[:p1] + girada[p2:p3] + girada[p1:p2] + girada[p3:]
+    cortes = {girada[k % n] for p in (p1, p2, p3) for k in (p - 1, p)} | {girada[0], girada[-1]}
+    return nova, cortes
+
+
+def resolver(distancias, tempo_limite=5.0, semente=None):
+    """
+    Melhor rota que couber no tempo_limite (segundos). Retorna (rota, custo, exata).
+    """
+    n = len(distancias)
+    if n <= LIMITE_HELD_KARP:
+        rota = held_karp(distancias)
+        return rota, custo_rota(distancias, rota), True
+    prazo = time.perf_counter() + tempo_limite
+    vizinhos = listas_vizinhos(distancias)
+    melhor, melhor_custo = None, float('inf')
+    for construir in (vizinho_mais_proximo, christofides_guloso):
+        rota = busca_local(distancias, construir(distancias), vizinhos, prazo)
+        custo = custo_rota(distancias, rota)
+        if custo < melhor_custo:
+            melhor, melhor_custo = rota, custo
+        if time.perf_counter() > prazo:
+            break
+
+    # Busca local iterada: perturba a melhor rota e reotimiza só em volta dos cortes
+    sorteio = random.Random(semente)
+    sem_melhora = 0
+    while n >= 8 and sem_melhora < PERTURBACOES_SEM_MELHORA and time.perf_counter() < prazo:
+        rota, cortes = _double_bridge(melhor, sorteio)
+        busca_local(distancias, rota, vizinhos, prazo, cortes)
+        custo = custo_rota(distancias, rota)
+        if custo < melhor_custo - EPSILON:
+            melhor, melhor_custo = rota, custo
+            sem_melhora = 0
+        else:
+            sem_melhora += 1
+    return melhor, melhor_custo, False
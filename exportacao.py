@@ -0,0 +1,225 @@
+# exportacao.py
+"""
+Exportação do grafo (ou de uma vista, como a árvore geradora ou um corte) em formatos de texto.
+Cada exportador é um gerador que produz o arquivo aos pedaços, lendo as arestas na ordem em que
+estão no grafo: o arquivo nunca é montado inteiro na memória, e o mesmo gerador serve para gravar
+em disco ou como corpo de uma resposta HTTP em streaming.
+
+    with open('grafo.graphml', 'w', encoding='utf-8') as f:
+        escrever(f, graphml(grafo, atributos_nos={'comunidade': rotulos}))
+
+atributos_nos e atributos_arestas mapeiam o nome de um atributo para a sequência com o valor de
+cada vértice / aresta (ex.: a comunidade de cada vértice). Só GraphML, DOT e JSON os exportam.
+"""
+import json
+from json.encoder import encode_basestring
+from xml.sax.saxutils import escape, quoteattr
+
+# Linhas juntadas em cada pedaço produzido (poucos pedaços grandes saem mais baratos que muitos pequenos)
+LINHAS_POR_PEDACO = 4096
+
+
+def _em_pedacos(linhas, tamanho=LINHAS_POR_PEDACO):
+    lote = []
+    for linha in linhas:
+        lote.append(linha)
+        if len(lote) >= tamanho:
+            yield ''.join(lote)
+            lote = []
+    if lote:
+        yield ''.join(lote)
+
+
+def _pesos_inteiros(grafo):
+    return grafo.pesos is None or all(type(p) is int for p in grafo.pesos)
+
+
+def lista_arestas(grafo, atributos_nos=None, atributos_arestas=None):
+    """
+    Formato de upload (Grafo.gerar_grafo_de_texto): número de vértices e uma aresta por linha,
+    "nome1" "nome2" [peso]. Vértices isolados não têm como aparecer nesse formato, então ficam de
+    fora também da contagem e o arquivo pode ser carregado de volta.
+    """
+    com_arestas = bytearray(grafo.vertices)
+    for u, v in grafo.arestas:
+        com_arestas[u] = com_arestas[v] = 1
+    yield f"{sum(com_arestas)}\n"
+    rotulo, pesos = grafo.rotulo, grafo.pesos
+
+    def linhas():
+        for i, (u, v) in enumerate(grafo.arestas):
+            peso = f" {pesos[i]}" if pesos is not None else ""
+            yield f'"{rotulo(u)}" "{rotulo(v)}"{peso}\n'
+    yield from _em_pedacos(linhas())
+
+
+def lista_adjacencia(grafo, atributos_nos=None, atributos_arestas=None):
+    """Uma linha por vértice: o nome e os nomes dos vizinhos, separados por tabulação (lidos do CSR do grafo)."""
+    indptr, indices = grafo._csr()
+    rotulo = grafo.rotulo
+
+    def linhas():
+        for v in range(grafo.vertices):
+            vizinhos = ''.join('\t' + rotulo(w) for w in indices[indptr[v]:indptr[v + 1]])
+            yield f"{rotulo(v)}{vizinhos}\n"
+    yield from _em_pedacos(linhas())
+
+
+def matriz_adjacencia_mm(grafo, atributos_nos=None, atributos_arestas=None):
+    """Matriz de adjacência esparsa no formato Matrix Market (simétrica: só o triângulo inferior)."""
+    tipo = 'integer' if _pesos_inteiros(grafo) else 'real'
+    yield f"%%MatrixMarket matrix coordinate {tipo} symmetric\n"
+    yield f"{grafo.vertices} {grafo.vertices} {len(grafo.arestas)}\n"
+    pesos = grafo.pesos
+
+    def linhas():
+        for i, (u, v) in enumerate(grafo.arestas):
+            if u < v:
+                u, v = v, u
+            yield f"{u + 1} {v + 1} {pesos[i] if pesos is not None else 1}\n"
+    yield from _em_pedacos(linhas())
+
+
+def matriz_incidencia_mm(grafo, atributos_nos=None, atributos_arestas=None):
+    """Matriz de incidência (vértice x aresta) esparsa no formato Matrix Market; um laço ocupa uma só posição."""
+    lacos = sum(1 for u, v in grafo.arestas if u == v)
+    yield "%%MatrixMarket matrix coordinate integer general\n"
+    yield f"{grafo.vertices} {len(grafo.arestas)} {2 * len(grafo.arestas) - lacos}\n"
+
+    def linhas():
+        for i, (u, v) in enumerate(grafo.arestas, start=1):
+            yield f"{u + 1} {i} 1\n" if u == v else f"{u + 1} {i} 1\n{v + 1} {i} 1\n"
+    yield from _em_pedacos(linhas())
+
+
+def _tipo_graphml(valores):
+    amostra = next(iter(valores), '')
+    if isinstance(amostra, bool):
+        return 'boolean'
+    if isinstance(amostra, int):
+        return 'long'
+    if isinstance(amostra, float):
+        return 'double'
+    return 'string'
+
+
+def _valor_graphml(valor):
+    if isinstance(valor, bool):
+        return 'true' if valor else 'false'
+    return escape(str(valor))
+
+
+def graphml(grafo, atributos_nos=None, atributos_arestas=None):
+    """GraphML não direcionado; o nome de cada vértice vai no atributo 'nome' e o peso no atributo 'peso'."""
+    atributos_nos = atributos_nos or {}
+    atributos_arestas = atributos_arestas or {}
+    yield ('<?xml version="1.0" encoding="UTF-8"?>\n'
+           '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+           '  <key id="nome" for="node" attr.name="nome" attr.type="string"/>\n')
+    if grafo.is_ponderado():
+        tipo = 'long' if _pesos_inteiros(grafo) else 'double'
+        yield f'  <key id="peso" for="edge" attr.name="peso" attr.type="{tipo}"/>\n'
+    for alvo, atributos in (('node', atributos_nos), ('edge', atributos_arestas)):
+        for nome, valores in atributos.items():
+            yield (f'  <key id={quoteattr(alvo[0] + "_" + nome)} for="{alvo}" attr.name={quoteattr(nome)} '
+                   f'attr.type="{_tipo_graphml(valores)}"/>\n')
+    yield '  <graph edgedefault="undirected">\n'
+    rotulo, pesos = grafo.rotulo, grafo.pesos
+
+    def dados(alvo, atributos, i):
+        return ''.join(f'<data key={quoteattr(alvo + "_" + nome)}>{_valor_graphml(valores[i])}</data>'
+                       for nome, valores in atributos.items())
+
+    def linhas():
+        for v in range(grafo.vertices):
+            yield f'    <node id="n{v}"><data key="nome">{escape(rotulo(v))}</data>{dados("n", atributos_nos, v)}</node>\n'
+        for i, (u, v) in enumerate(grafo.arestas):
+            peso = f'<data key="peso">{pesos[i]}</data>' if pesos is not None else ''
+            yield f'    <edge source="n{u}" target="n{v}">{peso}{dados("e", atributos_arestas, i)}</edge>\n'
+    yield from _em_pedacos(linhas())
+    yield '  </graph>\n</graphml>\n'
+
+
+def _texto_dot(valor):
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        return str(valor)
+    return '"' + str(valor).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def dot(grafo, atributos_nos=None, atributos_arestas=None):
+    """Graphviz DOT ('graph'); cada vértice é o seu id, com o nome em label, e o peso vai em weight e label."""
+    atributos_nos = atributos_nos or {}
+    atributos_arestas = atributos_arestas or {}
+    yield "graph G {\n"
+    rotulo, pesos = grafo.rotulo, grafo.pesos
+
+    def extras(atributos, i):
+        return [f'{nome}={_texto_dot(valores[i])}' for nome, valores in atributos.items()]
+
+    def linhas():
+        for v in range(grafo.vertices):
+            yield f'  {v} [{", ".join([f"label={_texto_dot(rotulo(v))}"] + extras(atributos_nos, v))}];\n'
+        for i, (u, v) in enumerate(grafo.arestas):
+            atributos = [f'weight={pesos[i]}', f'label="{pesos[i]}"'] if pesos is not None else []
+            atributos += extras(atributos_arestas, i)
+            yield f'  {u} -- {v} [{", ".join(atributos)}];\n' if atributos else f'  {u} -- {v};\n'
+    yield from _em_pedacos(linhas())
+    yield "}\n"
+
+
+def json_grafo(grafo, atributos_nos=None, atributos_arestas=None):
+    """JSON node-link (o mesmo de networkx.node_link_data), com os nomes dos vértices como ids."""
+    atributos_nos = atributos_nos or {}
+    atributos_arestas = atributos_arestas or {}
+    yield '{"directed": false, "multigraph": false, "graph": {}, "nodes": ['
+    rotulo, pesos = grafo.rotulo, grafo.pesos
+    # Codificador de strings do próprio módulo json (em C), bem mais rápido que json.dumps por item
+    texto = encode_basestring
+
+    def extras(atributos, i):
+        return ''.join(f', {texto(nome)}: {json.dumps(valores[i], ensure_ascii=False)}' for nome, valores in atributos.items())
+
+    def nos():
+        for v in range(grafo.vertices):
+            yield f'{", " if v else ""}{{"id": {texto(rotulo(v))}{extras(atributos_nos, v)}}}'
+
+    def ligacoes():
+        for i, (u, v) in enumerate(grafo.arestas):
+            peso = f', "weight": {pesos[i]}' if pesos is not None else ''
+            yield (f'{", " if i else ""}{{"source": {texto(rotulo(u))}, "target": {texto(rotulo(v))}'
+                   f'{peso}{extras(atributos_arestas, i)}}}')
+    yield from _em_pedacos(nos())
+    yield '], "links": ['
+    yield from _em_pedacos(ligacoes())
+    yield ']}\n'
+
+
+# nome -> (exportador, tipo MIME, extensão do arquivo, descrição)
+FORMATOS = {
+    'arestas': (lista_arestas, 'text/plain', 'txt', 'Lista de arestas'),
+    'adjacencia': (lista_adjacencia, 'text/tab-separated-values', 'tsv', 'Lista de adjacência'),
+    'graphml': (graphml, 'application/graphml+xml', 'graphml', 'GraphML'),
+    'dot': (dot, 'text/vnd.graphviz', 'dot', 'DOT (Graphviz)'),
+    'json': (json_grafo, 'application/json', 'json', 'JSON (node-link)'),
+    'matriz_adjacencia': (matriz_adjacencia_mm, 'text/plain', 'mtx', 'Matriz de adjacência (Matrix Market)'),
+    'matriz_incidencia': (matriz_incidencia_mm, 'text/plain', 'mtx', 'Matriz de incidência (Matrix Market)'),
+}
+
+
+def exportar(grafo, formato, atributos_nos=None, atributos_arestas=None):
+    """Gerador dos pedaços do grafo no formato dado (uma das chaves de FORMATOS)."""
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconhecido: {formato}")
+    return FORMATOS[formato][0](grafo, atributos_nos, atributos_arestas)
+
+
+def escrever(destino, partes):
+    """Grava os pedaços em um arquivo aberto em modo texto ou em um caminho; retorna o número de caracteres."""
+    if isinstance(destino, str):
+        with open(destino, 'w', encoding='utf-8', newline='') as arquivo:
+            return escrever(arquivo, partes)
+    total = 0
+    for parte in partes:
+        destino.write(parte)
+        total += len(parte)
+    return total
@@ -1,18 +1,675 @@
 # grafo.py
 
-import networkx as nx
-import matplotlib.pyplot as plt
+import bisect
+import hashlib
+import heapq
 import itertools
+import logging
+import math
+import os
+import random
+import statistics
+import struct
+import sys
+import time
+import zlib
+from array import array
+from collections import OrderedDict, deque
+
+import caixeiro
+
+logger = logging.getLogger(__name__)
+
+# Quantas consultas origem-destino recentes cada grafo guarda em cache
+TAMANHO_CACHE_CAMINHOS = 256
+# Codificações tentadas, em ordem, ao ler arquivos de grafo
+CODIFICACOES = ('utf-8', 'utf-16', 'latin1', 'cp1252')
+# Bits de precisão das probabilidades de falha e cenários simulados por lote na confiabilidade
+PRECISAO_BERNOULLI = 24
+LARGURA_LOTE_CONFIABILIDADE = 2048
+# Acima deste número de vértices sao_isomorfos refina as cores só a partir dos graus
+LIMITE_VERTICES_PERFIL_DISTANCIAS = 5000
+# Acima deste número de vértices colorir_exato devolve a coloração do DSatur sem ramificar
+LIMITE_VERTICES_COLORACAO_EXATA = 400
+# Procurar pares de separação custa O(V (V + E)); acima disto a busca hamiltoniana vai direto
+LIMITE_VERTICES_PARES_SEPARACAO = 500
+# Componentes maiores que isto (depois das reduções) têm o conjunto independente escolhido gulosamente
+LIMITE_VERTICES_CONJUNTO_INDEPENDENTE = 5000
+# Trabalho estimado (atualizações da eliminação x bits do resultado) acima do qual
+# contar_arvores_abrangencia recusa o cálculo exato; 5e8 leva da ordem de alguns segundos
+LIMITE_TRABALHO_ARVORES_ABRANGENCIA = 5e8
+# Máximo de paradas de rota_visita: a matriz de distâncias entre elas é quadrática em tempo e memória
+LIMITE_PARADAS_ROTA = 1024
+# Snapshots binários (Grafo.para_bytes): identificador do formato e nível do zlib
+FORMATO_SNAPSHOT = b'GRF1'
+COMPRESSAO_SNAPSHOT = 6
+# Resultados caros do cache que são salvos com os snapshots: chave do cache -> como reconstruir
+# o valor lido do JSON (onde as tuplas viram listas)
+METRICAS_PERSISTENTES = {
+    'diametro': lambda valor: valor,
+    'menor_ciclo': lambda valor: None if valor is None else (valor[0], valor[1]),
+    'conectividade_arestas': lambda valor: (valor[0], None if valor[1] is None else [tuple(a) for a in valor[1]]),
+    'arvores_abrangencia': lambda valor: valor,
+}
+
+
+def decodificar_linhas(dados):
+    """Decodifica o conteúdo de um arquivo de grafo; retorna a lista de linhas ou None."""
+    for codificacao in CODIFICACOES:
+        try:
+            return dados.decode(codificacao).splitlines()
+        except UnicodeDecodeError:
+            continue
+    return None
+
+
+# Funções de trabalho das centralidades. Ficam no nível do módulo para poderem rodar em
+# processos separados; recebem só os arrays do CSR e a lista de fontes daquele bloco.
+
+def _caminhos_minimos_fonte(indptr, vizinhos, pesos_csr, s):
+    """
+    Busca a partir de s (BFS, ou Dijkstra se houver pesos) guardando o que o algoritmo de Brandes usa:
+    (vértices em ordem não decrescente de distância, predecessores, número de menores caminhos, distâncias).
+    """
+    dist = {s: 0}
+    sigma = {s: 1}
+    pred = {s: []}
+    if pesos_csr is None:
+        ordem = [s]
+        for v in ordem:
+            dv = dist[v] + 1
+            for w in vizinhos[indptr[v]:indptr[v + 1]]:
+                if w not in dist:
+                    dist[w] = dv
+                    sigma[w] = 0
+                    pred[w] = []
+                    ordem.append(w)
+                if dist[w] == dv:
+                    sigma[w] += sigma[v]
+                    pred[w].append(v)
+        return ordem, pred, sigma, dist
+
+    ordem = []
+    finalizado = set()
+    heap = [(0, s)]
+    while heap:
+        d, v = heapq.heappop(heap)
+        if v in finalizado:
+            continue
+        finalizado.add(v)
+        ordem.append(v)
+        for i in range(indptr[v], indptr[v + 1]):
+            w = vizinhos[i]
+            nd = d + pesos_csr[i]
+            if w not in dist or nd < dist[w]:
+                dist[w] = nd
+                sigma[w] = sigma[v]
+                pred[w] = [v]
+                heapq.heappush(heap, (nd, w))
+            elif nd == dist[w] and w not in finalizado:
+                sigma[w] += sigma[v]
+                pred[w].append(v)
+    return ordem, pred, sigma, dist
+
+
+def _dependencias_brandes(indptr, vizinhos, pesos_csr, fontes):
+    """Soma das dependências de Brandes de cada vértice para as fontes dadas."""
+    total = [0.0] * (len(indptr) - 1)
+    for s in fontes:
+        ordem, pred, sigma, _ = _caminhos_minimos_fonte(indptr, vizinhos, pesos_csr, s)
+        delta = dict.fromkeys(ordem, 0.0)
+        for w in reversed(ordem):
+            coeficiente = (1 + delta[w]) / sigma[w]
+            for v in pred[w]:
+                delta[v] += sigma[v] * coeficiente
+            if w != s:
+                total[w] += delta[w]
+    return total
+
+
+def _somas_distancias(indptr, vizinhos, pesos_csr, fontes):
+    """
+    Para cada fonte, (soma das distâncias aos alcançáveis, quantidade de alcançáveis, excentricidade),
+    e a soma, por vértice, das distâncias a partir de todas as fontes.
+    """
+    por_fonte = []
+    soma_por_vertice = [0.0] * (len(indptr) - 1)
+    for s in fontes:
+        _, _, _, dist = _caminhos_minimos_fonte(indptr, vizinhos, pesos_csr, s)
+        for v, d in dist.items():
+            soma_por_vertice[v] += d
+        por_fonte.append((sum(dist.values()), len(dist), max(dist.values())))
+    return por_fonte, soma_por_vertice
+
+
+# Confiabilidade: cenários de falha simulados em lote, um cenário por bit de inteiros grandes
+
+def _mascara_bernoulli(p, largura, sortear):
+    """
+    Inteiro de 'largura' bits, cada um igual a 1 com probabilidade p, independentes. Usa a expansão
+    binária de p (PRECISAO_BERNOULLI bits): do bit menos para o mais significativo, OU com bits
+    aleatórios onde a expansão tem 1 e E onde tem 0.
+    """
+    numerador = round(p * (1 << PRECISAO_BERNOULLI))
+    if numerador <= 0:
+        return 0
+    if numerador >= 1 << PRECISAO_BERNOULLI:
+        return (1 << largura) - 1
+    # Zeros à direita da expansão não mudam o resultado (E com a máscara ainda vazia)
+    bits = PRECISAO_BERNOULLI
+    while numerador % 2 == 0:
+        numerador //= 2
+        bits -= 1
+    mascara = 0
+    for _ in range(bits):
+        if numerador & 1:
+            mascara |= sortear(largura)
+        else:
+            mascara &= sortear(largura)
+        numerador >>= 1
+    return mascara
+
+
+def _simular_confiabilidade(indptr, vizinhos, ids_arestas, sobrevivencia, lotes, semente):
+    """
+    Sorteia 'lotes' lotes de LARGURA_LOTE_CONFIABILIDADE cenários de falha e retorna em quantos o grafo
+    continua conexo. alcance[v] marca, bit a bit, os cenários em que v é alcançado a partir do vértice 0.
+    """
+    sortear = random.Random(semente).getrandbits
+    largura = LARGURA_LOTE_CONFIABILIDADE
+    todos = (1 << largura) - 1
+    n = len(indptr) - 1
+    conexos = 0
+    for _ in range(lotes):
+        vivas = [_mascara_bernoulli(p, largura, sortear) for p in sobrevivencia]
+        alcance = [0] * n
+        alcance[0] = todos
+        na_fila = [False] * n
+        na_fila[0] = True
+        fila = [0]
+        for v in fila:
+            na_fila[v] = False
+            alcance_v = alcance[v]
+            for i in range(indptr[v], indptr[v + 1]):
+                w = vizinhos[i]
+                novos = alcance_v & vivas[ids_arestas[i]] & ~alcance[w]
+                if novos:
+                    alcance[w] |= novos
+                    if not na_fila[w]:
+                        na_fila[w] = True
+                        fila.append(w)
+        conectado = todos
+        for a in alcance:
+            conectado &= a
+            if not conectado:
+                break
+        conexos += conectado.bit_count()
+    return conexos
+
+
+def _indices_bits(bits):
+    """Posições dos bits ligados de um inteiro usado como conjunto, em ordem crescente."""
+    while bits:
+        menor = bits & -bits
+        yield menor.bit_length() - 1
+        bits ^= menor
+
+
+class MatrizEsparsa:
+    """
+    Matriz esparsa de 0/1 nos formatos COO ou CSR.
+    Usa os mesmos nomes de atributos do scipy.sparse (shape, row, col, indptr,
+    indices, data), então pode ser trocada com outras ferramentas sem conversão.
+    """
+    def __init__(self, shape, formato, dados, row=None, col=None, indptr=None, indices=None):
+        self.shape = shape
+        self.format = formato
+        self.data = dados
+        self.row = row
+        self.col = col
+        self.indptr = indptr
+        self.indices = indices
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    def tocoo(self):
+        if self.format == 'coo':
+            return self
+        linhas = array('l')
+        for i in range(self.shape[0]):
+            linhas.extend([i] * (self.indptr[i + 1] - self.indptr[i]))
+        return MatrizEsparsa(self.shape, 'coo', self.data, row=linhas, col=self.indices)
+
+    def tocsr(self):
+        if self.format == 'csr':
+            return self
+        # Contagem por linha seguida de soma de prefixos: O(nnz + linhas)
+        indptr = array('l', [0] * (self.shape[0] + 1))
+        for i in self.row:
+            indptr[i + 1] += 1
+        for i in range(self.shape[0]):
+            indptr[i + 1] += indptr[i]
+        posicao = array('l', indptr)
+        indices = array('l', [0] * self.nnz)
+        dados = array(self.data.typecode, [0] * self.nnz)
+        for i, j, valor in zip(self.row, self.col, self.data):
+            indices[posicao[i]] = j
+            dados[posicao[i]] = valor
+            posicao[i] += 1
+        return MatrizEsparsa(self.shape, 'csr', dados, indptr=indptr, indices=indices)
+
+    def toarray(self):
+        """Materializa a matriz densa (lista de listas), como gerar_matriz_*."""
+        coo = self.tocoo()
+        matriz = [[0] * self.shape[1] for _ in range(self.shape[0])]
+        for i, j, valor in zip(coo.row, coo.col, coo.data):
+            matriz[i][j] = valor
+        return matriz
+
+    def to_scipy(self):
+        """Converte para scipy.sparse (coo_matrix ou csr_matrix). Requer scipy instalado."""
+        try:
+            from scipy import sparse
+        except ImportError as e:
+            raise ImportError("A conversão para scipy.sparse requer o pacote scipy") from e
+        if self.format == 'csr':
+            return sparse.csr_matrix((self.data, self.indices, self.indptr), shape=self.shape)
+        return sparse.coo_matrix((self.data, (self.row, self.col)), shape=self.shape)
+
+    def __iter__(self):
+        coo = self.tocoo()
+        return zip(coo.row, coo.col, coo.data)
+
+
+class TabelaNomes:
+    """
+    Nomes dos vértices em um único buffer de texto com offsets, mais um índice de hash
+    (endereçamento aberto) que guarda só ids. Cada nome é armazenado uma única vez,
+    ao contrário de um par de dicts nome -> id e id -> nome.
+    """
+    def __init__(self, nomes=()):
+        partes = list(nomes)
+        self._buffer = ''.join(partes)
+        self._offsets = array('l', [0]) * (len(partes) + 1)
+        posicao = 0
+        for i, nome in enumerate(partes):
+            posicao += len(nome)
+            self._offsets[i + 1] = posicao
+        self._indexar()
+
+    @classmethod
+    def de_buffer(cls, buffer, offsets):
+        """Tabela a partir do buffer e dos offsets já prontos (ex.: lidos de um snapshot)."""
+        tabela = cls.__new__(cls)
+        tabela._buffer = buffer
+        tabela._offsets = array('l', offsets)
+        tabela._indexar()
+        return tabela
+
+    def _indexar(self):
+        n = len(self)
+        capacidade = 8
+        while capacidade < 2 * n:
+            capacidade *= 2
+        self._mascara = capacidade - 1
+        self._indice = array('l', [-1]) * capacidade
+        for i in range(n):
+            nome = self.nome(i)
+            slot = self._procurar(nome)
+            if self._indice[slot] != -1:
+                raise ValueError(f"Nome de vértice repetido: {nome}")
+            self._indice[slot] = i
+
+    def _procurar(self, nome):
+        # Sondagem linear: para no slot com o id do nome ou no primeiro slot vazio
+        slot = hash(nome) & self._mascara
+        while True:
+            id_vertice = self._indice[slot]
+            if id_vertice == -1 or self.nome(id_vertice) == nome:
+                return slot
+            slot = (slot + 1) & self._mascara
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __iter__(self):
+        return iter(self.nomes())
+
+    def __contains__(self, nome):
+        return self._indice[self._procurar(nome)] != -1
+
+    def nome(self, id_vertice):
+        return self._buffer[self._offsets[id_vertice]:self._offsets[id_vertice + 1]]
+
+    def id(self, nome):
+        id_vertice = self._indice[self._procurar(nome)]
+        if id_vertice == -1:
+            raise KeyError(nome)
+        return id_vertice
+
+    def nomes(self, ids=None):
+        """Nomes de vários vértices de uma vez (todos, na ordem dos ids, se ids for None)."""
+        buffer, offsets = self._buffer, self._offsets
+        if ids is None:
+            ids = range(len(self))
+        return [buffer[offsets[i]:offsets[i + 1]] for i in ids]
+
+    def ids(self, nomes):
+        """Ids de vários nomes de uma vez; levanta KeyError se algum não existir."""
+        return [self.id(nome) for nome in nomes]
+
+
+class UniaoBusca:
+    """Union-find com compressão de caminho (por divisão) e união por tamanho."""
+    def __init__(self, n):
+        self.pai = list(range(n))
+        self.tamanho = [1] * n
+        self.componentes = n
+
+    def encontrar(self, x):
+        pai = self.pai
+        while pai[x] != x:
+            pai[x] = pai[pai[x]]
+            x = pai[x]
+        return x
+
+    def unir(self, a, b):
+        """Une os conjuntos de a e b; retorna False se já estavam juntos."""
+        a, b = self.encontrar(a), self.encontrar(b)
+        if a == b:
+            return False
+        if self.tamanho[a] < self.tamanho[b]:
+            a, b = b, a
+        self.pai[b] = a
+        self.tamanho[a] += self.tamanho[b]
+        self.componentes -= 1
+        return True
+
 
 class Grafo:
     def __init__(self, vertices=None):
         self.vertices = vertices if vertices is not None else 0
         self.arestas = []
+        self.pesos = None  # pesos opcionais, paralelos a self.arestas (None = grafo sem pesos)
+        self.tabela_nomes = None  # TabelaNomes opcional com o nome de cada vértice
+        self._cache = {}
 
-    def adicionar_aresta(self, u, v):
+    def is_ponderado(self):
+        return self.pesos is not None
+
+    def peso(self, indice_aresta):
+        return self.pesos[indice_aresta] if self.pesos is not None else 1
+
+    def rotulo(self, vertice):
+        """Nome do vértice, ou o próprio id como texto quando o grafo não tem nomes."""
+        if self.tabela_nomes is None:
+            return str(vertice)
+        return self.tabela_nomes.nome(vertice)
+
+    def rotulos(self, vertices=None):
+        """Nomes de vários vértices de uma vez (todos, se vertices for None)."""
+        if self.tabela_nomes is None:
+            return [str(v) for v in (range(self.vertices) if vertices is None else vertices)]
+        return self.tabela_nomes.nomes(vertices)
+
+    @staticmethod
+    def _ler_linha_aresta(linha):
+        """
+        Separa uma linha de aresta em (nome1, nome2, peso). Os nomes vêm entre aspas
+        (ou, sem aspas, separados por espaço) e o peso opcional é um número finito e não negativo
+        no fim da linha.
+        """
+        if '"' in linha:
+            partes = linha.split('"')
+            nomes = [nome.strip() for nome in partes[1::2] if nome.strip()]
+            resto = ''.join(partes[0::2]).split()
+        else:
+            tokens = linha.split()
+            nomes, resto = tokens[:2], tokens[2:]
+        if len(nomes) != 2 or len(resto) > 1:
+            raise ValueError(f"Linha inválida: {linha}")
+        try:
+            peso = float(resto[0]) if resto else None
+        except ValueError:
+            raise ValueError(f"Peso inválido na linha: {linha}")
+        # nan, infinito e pesos negativos quebrariam Dijkstra e a árvore geradora mínima
+        if peso is not None and not (math.isfinite(peso) and peso >= 0):
+            raise ValueError(f"Peso inválido na linha: {linha}")
+        return nomes[0], nomes[1], peso
+
+    @staticmethod
+    def gerar_grafo_de_texto(linhas):
+        """
+        Lê o formato de upload: a primeira linha tem o número de vértices e cada linha seguinte
+        uma aresta entre dois nomes entre aspas, seguidos opcionalmente do peso da aresta.
+        Os ids seguem a ordem alfabética dos nomes. Se alguma linha tiver peso, o grafo é
+        ponderado e as arestas sem peso valem 1. Levanta ValueError se o arquivo estiver mal formatado.
+        """
+        num_vertices = int(linhas[0])
+        logger.info("Número de vértices: %d", num_vertices)
+
+        # Primeira passagem: coletar os pares de nomes
+        pares = []
+        for linha in linhas[1:]:
+            if not linha.strip():
+                continue
+            try:
+                pares.append(Grafo._ler_linha_aresta(linha))
+            except ValueError:
+                logger.warning("Erro ao processar linha %r", linha)
+                raise
+
+        vertices_unicos = {nome for v1, v2, _ in pares for nome in (v1, v2)}
+        ponderado = any(peso is not None for _, _, peso in pares)
+        logger.info("Vértices únicos encontrados: %d", len(vertices_unicos))
+
+        # Verifica se o número de vértices corresponde
+        if len(vertices_unicos) != num_vertices:
+            raise ValueError(f"Número de vértices declarado ({num_vertices}) não corresponde ao número de vértices únicos encontrados ({len(vertices_unicos)})")
+
+        grafo = Grafo(num_vertices)
+        grafo.tabela_nomes = TabelaNomes(sorted(vertices_unicos))
+        if ponderado:
+            grafo.pesos = []
+
+        # Segunda passagem: adicionar arestas usando os ids da tabela
+        for v1, v2, peso in pares:
+            grafo.adicionar_aresta(grafo.tabela_nomes.id(v1), grafo.tabela_nomes.id(v2), peso)
+        logger.info("Número de arestas: %d", len(grafo.arestas))
+        return grafo
+
+    @staticmethod
+    def carregar_arquivo(caminho):
+        """Lê um arquivo no formato de upload (mesmas regras de gerar_grafo_de_texto)."""
+        with open(caminho, 'rb') as f:
+            linhas = decodificar_linhas(f.read())
+        if linhas is None:
+            raise ValueError("Não foi possível decodificar o arquivo")
+        return Grafo.gerar_grafo_de_texto(linhas)
+
+    def para_bytes(self):
+        """
+        Snapshot binário compacto: arrays little-endian de extremos, pesos e tabela de nomes
+        (buffer UTF-8 + offsets), comprimidos com zlib. Lido de volta por Grafo.de_bytes.
+        """
+        tipo_vertice = 'I' if self.vertices < 2 ** 32 else 'Q'
+        inteiros = self.pesos is not None and all(type(p) is int for p in self.pesos)
+        flags = (self.pesos is not None) | (self.tabela_nomes is not None) << 1 | inteiros << 2 | (tipo_vertice == 'Q') << 3
+        secoes = [array(tipo_vertice, itertools.chain.from_iterable(self.arestas))]
+        if self.pesos is not None:
+            secoes.append(array('q' if inteiros else 'd', self.pesos))
+        if self.tabela_nomes is not None:
+            secoes.append(self.tabela_nomes._buffer.encode('utf-8'))
+            secoes.append(array('Q', self.tabela_nomes._offsets))
+        partes = [struct.pack('<4sBQQ', FORMATO_SNAPSHOT, flags, self.vertices, len(self.arestas))]
+        for secao in secoes:
+            if isinstance(secao, array):
+                if sys.byteorder == 'big':
+                    secao.byteswap()
+                secao = secao.tobytes()
+            partes.append(struct.pack('<Q', len(secao)))
+            partes.append(secao)
+        return zlib.compress(b''.join(partes), COMPRESSAO_SNAPSHOT)
+
+    @staticmethod
+    def de_bytes(dados):
+        """Reconstrói um grafo salvo por para_bytes, sem reprocessar o texto original."""
+        bruto = zlib.decompress(dados)
+        formato, flags, vertices, num_arestas = struct.unpack_from('<4sBQQ', bruto)
+        if formato != FORMATO_SNAPSHOT:
+            raise ValueError("Snapshot de grafo em formato desconhecido")
+        posicao = struct.calcsize('<4sBQQ')
+
+        def ler(tipo=None):
+            nonlocal posicao
+            (tamanho,) = struct.unpack_from('<Q', bruto, posicao)
+            posicao += 8
+            secao = bruto[posicao:posicao + tamanho]
+            posicao += tamanho
+            if tipo is None:
+                return secao
+            valores = array(tipo)
+            valores.frombytes(secao)
+            if sys.byteorder == 'big':
+                valores.byteswap()
+            return valores
+
+        grafo = Grafo(vertices)
+        extremos = ler('Q' if flags & 8 else 'I')
+        grafo.arestas = list(zip(extremos[0::2], extremos[1::2]))
+        if flags & 1:
+            grafo.pesos = ler('q' if flags & 4 else 'd').tolist()
+        if flags & 2:
+            buffer = ler().decode('utf-8')
+            grafo.tabela_nomes = TabelaNomes.de_buffer(buffer, ler('Q'))
+        if len(grafo.arestas) != num_arestas:
+            raise ValueError("Snapshot de grafo corrompido")
+        return grafo
+
+    def metricas_em_cache(self):
+        """Resultados de METRICAS_PERSISTENTES já calculados para o grafo (para salvar com o snapshot)."""
+        self._em_cache('__assinatura__', None)  # descarta o cache se o grafo mudou
+        return {chave: self._cache[chave] for chave in METRICAS_PERSISTENTES if chave in self._cache}
+
+    def restaurar_metricas(self, metricas):
+        """Coloca no cache métricas salvas por metricas_em_cache (ignora chaves desconhecidas)."""
+        for chave, valor in metricas.items():
+            if chave in METRICAS_PERSISTENTES:
+                self._em_cache(chave, lambda: METRICAS_PERSISTENTES[chave](valor))
+
+    def _assinatura(self):
+        # Guarda as próprias listas (e não seus ids) para que uma lista nova nunca seja confundida com a antiga
+        return (self.vertices, self.arestas, len(self.arestas), self.pesos)
+
+    def _em_cache(self, chave, calcular):
+        """
+        Guarda estruturas derivadas (CSR, conjunto de arestas...) enquanto o grafo não muda.
+        O cache é descartado quando o número de vértices, a lista de arestas ou a de pesos muda.
+        """
+        assinatura = self._assinatura()
+        cache = self.__dict__.get('_cache')
+        anterior = cache.get('__assinatura__') if cache else None
+        if (anterior is None or anterior[0] != assinatura[0] or anterior[1] is not assinatura[1]
+                or anterior[2] != assinatura[2] or anterior[3] is not assinatura[3]):
+            cache = {'__assinatura__': assinatura}
+            self._cache = cache
+        if chave not in cache:
+            cache[chave] = calcular()
+        return cache[chave]
+
+    def _chaves_arestas(self):
+        # Arestas normalizadas como (menor, maior) para busca em O(1)
+        return self._em_cache('chaves', lambda: {(u, v) if u <= v else (v, u) for u, v in self.arestas})
+
+    def indices_arestas(self, pares):
+        """Índices das arestas dadas como pares (u, v), em qualquer orientação (pares ausentes são ignorados)."""
+        chaves = {(u, v) if u <= v else (v, u) for u, v in pares}
+        return [i for i, (u, v) in enumerate(self.arestas) if ((u, v) if u <= v else (v, u)) in chaves]
+
+    def _csr(self):
+        """Lista de adjacência compacta em formato CSR: vizinhos de v em indices[indptr[v]:indptr[v + 1]]."""
+        return self._em_cache('csr', self._montar_csr)
+
+    def _montar_csr(self):
+        indptr = array('l', [0] * (self.vertices + 1))
+        for u, v in self.arestas:
+            indptr[u + 1] += 1
+            if u != v:
+                indptr[v + 1] += 1
+        for i in range(self.vertices):
+            indptr[i + 1] += indptr[i]
+        posicao = array('l', indptr)
+        indices = array('l', [0] * indptr[-1])
+        for u, v in self.arestas:
+            indices[posicao[u]] = v
+            posicao[u] += 1
+            if u != v:
+                indices[posicao[v]] = u
+                posicao[v] += 1
+        return indptr, indices
+
+    def _csr_incidencia(self):
+        """Como _csr(), mas guardando também o índice da aresta: (indptr, vizinhos, ids_arestas)."""
+        return self._em_cache('csr_incidencia', self._montar_csr_incidencia)
+
+    def _montar_csr_incidencia(self):
+        indptr = array('l', self._csr()[0])
+        posicao = array('l', indptr)
+        vizinhos = array('l', [0] * indptr[-1])
+        ids_arestas = array('l', [0] * indptr[-1])
+        for idx, (u, v) in enumerate(self.arestas):
+            vizinhos[posicao[u]] = v
+            ids_arestas[posicao[u]] = idx
+            posicao[u] += 1
+            if u != v:
+                vizinhos[posicao[v]] = u
+                ids_arestas[posicao[v]] = idx
+                posicao[v] += 1
+        return indptr, vizinhos, ids_arestas
+
+    def _rotulos_componentes(self):
+        """Array com o número da componente conexa de cada vértice (BFS iterativa sobre o CSR)."""
+        def calcular():
+            indptr, indices = self._csr()
+            rotulo = array('l', [-1]) * self.vertices
+            atual = 0
+            for inicio in range(self.vertices):
+                if rotulo[inicio] != -1:
+                    continue
+                rotulo[inicio] = atual
+                fila = [inicio]
+                for v in fila:
+                    for w in indices[indptr[v]:indptr[v + 1]]:
+                        if rotulo[w] == -1:
+                            rotulo[w] = atual
+                            fila.append(w)
+                atual += 1
+            return rotulo
+        return self._em_cache('componentes', calcular)
+
+    def componentes_conexas(self):
+        """Lista de componentes conexas, cada uma como lista de vértices."""
+        componentes = {}
+        for v, c in enumerate(self._rotulos_componentes()):
+            componentes.setdefault(c, []).append(v)
+        return list(componentes.values())
+
+    def adicionar_aresta(self, u, v, peso=None):
         if u < self.vertices and v < self.vertices:
-            if (v, u) not in self.arestas and (u, v) not in self.arestas:
+            chaves = self._chaves_arestas()
+            chave = (u, v) if u <= v else (v, u)
+            if chave not in chaves:
+                if peso is not None and self.pesos is None:
+                    # Primeira aresta com peso: as anteriores passam a valer 1
+                    self.pesos = [1] * len(self.arestas)
+                if self.pesos is not None:
+                    self.pesos.append(1 if peso is None else peso)
                 self.arestas.append((u, v))
+                chaves.add(chave)
+                # Mantém apenas o conjunto de arestas, já atualizado, no cache
+                self._cache = {'__assinatura__': self._assinatura(), 'chaves': chaves}
         else:
             print("Vértice inválido")
 
@@ -40,8 +697,43 @@ class Grafo:
         for linha in matriz:
             print(linha)
 
+    def matriz_adjacencia_esparsa(self, formato='csr'):
+        """
+        Matriz de adjacência esparsa ('csr' ou 'coo'), calculada sob demanda
+        a partir da lista de arestas sem materializar a matriz densa.
+        """
+        indptr, indices = self._csr()
+        dados = array('b', [1]) * len(indices)
+        matriz = MatrizEsparsa((self.vertices, self.vertices), 'csr', dados, indptr=indptr, indices=indices)
+        return matriz if formato == 'csr' else matriz.tocoo()
+
+    def matriz_incidencia_esparsa(self, formato='csr'):
+        """
+        Matriz de incidência esparsa ('csr' ou 'coo'): linha = vértice, coluna = índice da aresta.
+        """
+        linhas = array('l')
+        colunas = array('l')
+        for idx, (u, v) in enumerate(self.arestas):
+            linhas.append(u)
+            colunas.append(idx)
+            if u != v:
+                linhas.append(v)
+                colunas.append(idx)
+        dados = array('b', [1]) * len(linhas)
+        matriz = MatrizEsparsa((self.vertices, len(self.arestas)), 'coo', dados, row=linhas, col=colunas)
+        return matriz.tocsr() if formato == 'csr' else matriz
+
     @staticmethod
     def gerar_grafo_de_matriz_adjacencia(matriz):
+        # Entrada esparsa (MatrizEsparsa ou scipy.sparse): percorre só os elementos não nulos
+        if hasattr(matriz, 'tocoo'):
+            coo = matriz.tocoo()
+            novo_grafo = Grafo(coo.shape[0])
+            for i, j, valor in zip(coo.row, coo.col, coo.data):
+                if i < j and valor == 1:
+                    novo_grafo.adicionar_aresta(int(i), int(j))
+            return novo_grafo
+
         vertices = len(matriz)
         novo_grafo = Grafo(vertices)
         for i in range(vertices):
@@ -52,6 +744,20 @@ class Grafo:
 
     @staticmethod
     def gerar_grafo_de_matriz_incidencia(matriz):
+        if hasattr(matriz, 'tocoo'):
+            coo = matriz.tocoo()
+            vertices, arestas = coo.shape
+            extremos = [[] for _ in range(arestas)]
+            for i, j, valor in zip(coo.row, coo.col, coo.data):
+                if valor == 1:
+                    extremos[j].append(int(i))
+            grafo = Grafo(vertices)
+            for linhas in extremos:
+                if len(linhas) >= 2:
+                    linhas.sort()
+                    grafo.adicionar_aresta(linhas[0], linhas[1])
+            return grafo
+
         vertices = len(matriz)
         arestas = len(matriz[0]) if vertices > 0 else 0
         grafo = Grafo(vertices)
@@ -82,10 +788,30 @@ class Grafo:
         for u, v in self.arestas:
             print(f"{u} -> {v}")
 
-    def visualizar_grafo(self):
+    def visualizar_grafo(self, arquivo=None):
+        """
+        Desenha o grafo com matplotlib. Com 'arquivo', a figura é desenhada fora do pyplot (numa
+        Figure própria, renderizada pelo Agg) e salva nele, sem mudar o backend do processo. Sem
+        'arquivo', abre uma janela pelo pyplot; se não houver backend interativo (servidor sem
+        tela), levanta RuntimeError em vez de não mostrar nada.
+        """
+        # networkx e matplotlib são pesados e só servem aqui: importados no primeiro uso
+        import networkx as nx
         G = nx.Graph()
+        G.add_nodes_from(range(self.vertices))
         G.add_edges_from(self.arestas)
-        nx.draw(G, with_labels=True, node_color='lightblue', node_size=500, font_size=10, font_weight='bold')
+        opcoes = dict(with_labels=True, node_color='lightblue', node_size=500, font_size=10, font_weight='bold')
+        if arquivo:
+            from matplotlib.figure import Figure
+            figura = Figure()
+            nx.draw(G, ax=figura.add_subplot(), **opcoes)
+            figura.savefig(arquivo)
+            return
+        import matplotlib.pyplot as plt
+        from matplotlib import rcsetup
+        if plt.get_backend().lower() in (nome.lower() for nome in rcsetup.non_interactive_bk):
+            raise RuntimeError(f"Sem backend interativo ({plt.get_backend()}) para abrir a janela; informe 'arquivo'")
+        nx.draw(G, **opcoes)
         plt.show()
 
     def gerar_lista_adjacencia(self):
@@ -108,25 +834,205 @@ class Grafo:
                 grafo.adicionar_aresta(i, j)
         return grafo
 
+    @staticmethod
+    def gerar_grafo_ciclo(vertices):
+        grafo = Grafo(vertices)
+        for i in range(vertices):
+            grafo.adicionar_aresta(i, (i + 1) % vertices)
+        return grafo
+
+    @staticmethod
+    def gerar_grafo_grade(linhas, colunas):
+        grafo = Grafo(linhas * colunas)
+        for i in range(linhas):
+            for j in range(colunas):
+                v = i * colunas + j
+                if j + 1 < colunas:
+                    grafo.adicionar_aresta(v, v + 1)
+                if i + 1 < linhas:
+                    grafo.adicionar_aresta(v, v + colunas)
+        return grafo
+
+    @staticmethod
+    def gerar_arvore_aleatoria(vertices, semente=None):
+        """Árvore aleatória: cada vértice novo se liga a um vértice anterior sorteado."""
+        rng = random.Random(semente)
+        grafo = Grafo(vertices)
+        for v in range(1, vertices):
+            grafo.adicionar_aresta(rng.randrange(v), v)
+        return grafo
+
+    @staticmethod
+    def gerar_grafo_erdos_renyi(vertices, p, semente=None):
+        """
+        Grafo aleatório G(n, p). Sorteia o salto até a próxima aresta presente
+        (Batagelj-Brandes), então o custo é O(V + E) e não O(V²).
+        """
+        rng = random.Random(semente)
+        grafo = Grafo(vertices)
+        if p <= 0:
+            return grafo
+        if p >= 1:
+            return Grafo.gerar_grafo_completo(vertices)
+        log_q = math.log(1.0 - p)
+        v, w = 1, -1
+        while v < vertices:
+            w += 1 + int(math.log(1.0 - rng.random()) / log_q)
+            while w >= v and v < vertices:
+                w -= v
+                v += 1
+            if v < vertices:
+                grafo.adicionar_aresta(w, v)
+        return grafo
+
+    @staticmethod
+    def gerar_grafo_barabasi_albert(vertices, m, semente=None):
+        """Ligação preferencial: cada vértice novo se liga a m vértices escolhidos proporcionalmente ao grau."""
+        if m < 1 or m >= vertices:
+            raise ValueError("m deve estar entre 1 e vertices - 1")
+        rng = random.Random(semente)
+        grafo = Grafo(vertices)
+        # Cada vértice aparece em 'repetidos' uma vez por aresta incidente
+        repetidos = []
+        alvos = list(range(m))
+        for novo in range(m, vertices):
+            for alvo in alvos:
+                grafo.adicionar_aresta(alvo, novo)
+            repetidos.extend(alvos)
+            repetidos.extend([novo] * m)
+            escolhidos = set()
+            while len(escolhidos) < m:
+                escolhidos.add(rng.choice(repetidos))
+            alvos = list(escolhidos)
+        return grafo
+
+    @staticmethod
+    def gerar_grafo_regular_aleatorio(vertices, grau, semente=None, tentativas=100):
+        """Grafo d-regular aleatório pelo modelo de pareamento, recomeçando quando surge laço ou aresta múltipla."""
+        if (vertices * grau) % 2 != 0 or grau >= vertices:
+            raise ValueError("Não existe grafo regular com esses parâmetros")
+        rng = random.Random(semente)
+        for _ in range(tentativas):
+            pontos = [v for v in range(vertices) for _ in range(grau)]
+            rng.shuffle(pontos)
+            chaves = set()
+            valido = True
+            for i in range(0, len(pontos), 2):
+                u, v = pontos[i], pontos[i + 1]
+                chave = (u, v) if u < v else (v, u)
+                if u == v or chave in chaves:
+                    valido = False
+                    break
+                chaves.add(chave)
+            if valido:
+                grafo = Grafo(vertices)
+                for u, v in chaves:
+                    grafo.adicionar_aresta(u, v)
+                return grafo
+        raise ValueError("Não foi possível gerar o grafo regular; aumente o número de tentativas")
+
     def sao_isomorfos(self, outro_grafo):
+        """
+        Verifica isomorfismo: descarta pelos invariantes (tamanhos, sequência de graus, hash WL)
+        e confirma com a busca de subgrafo induzido do mesmo tamanho, que é uma bijeção.
+        """
         if self.vertices != outro_grafo.vertices or len(self.arestas) != len(outro_grafo.arestas):
             return False
-        
-        lista1 = self.gerar_lista_adjacencia()
-        lista2 = outro_grafo.gerar_lista_adjacencia()
-        
+        if self.hash_weisfeiler_lehman() != outro_grafo.hash_weisfeiler_lehman():
+            return False
+        cores = Grafo._refinar_cores_conjunto(self, outro_grafo)
+        if cores is None:
+            return False
+        return next(self._buscar_subgrafo(outro_grafo, True, *cores), None) is not None
+
+    def sao_isomorfos_exaustivo(self, outro_grafo):
+        """
+        Versão por força bruta de sao_isomorfos: testa todas as permutações dos vértices, O(n!·E).
+        Só serve para grafos bem pequenos; fica como referência para conferir a versão rápida.
+        """
+        if self.vertices != outro_grafo.vertices or len(self.arestas) != len(outro_grafo.arestas):
+            return False
+        arestas_outro = outro_grafo._chaves_arestas()
         for permutacao in itertools.permutations(range(self.vertices)):
             isomorfico = True
-            for vertice in range(self.vertices):
-                adjacentes1 = set(lista1[vertice])
-                adjacentes2 = set(permutacao[v] for v in lista2[permutacao[vertice]])
-                if adjacentes1 != adjacentes2:
+            for u, v in self.arestas:
+                a, b = permutacao[u], permutacao[v]
+                if ((a, b) if a <= b else (b, a)) not in arestas_outro:
                     isomorfico = False
                     break
             if isomorfico:
                 return True
         return False
 
+    def _perfil_distancias(self):
+        """Quantidade de vértices a cada distância, para cada vértice (uma BFS por vértice)."""
+        def calcular():
+            indptr, indices = self._csr()
+            perfis = []
+            for inicio in range(self.vertices):
+                dist = {inicio: 0}
+                fila = [inicio]
+                for v in fila:
+                    for w in indices[indptr[v]:indptr[v + 1]]:
+                        if w not in dist:
+                            dist[w] = dist[v] + 1
+                            fila.append(w)
+                camadas = [0] * (dist[fila[-1]] + 1)
+                for d in dist.values():
+                    camadas[d] += 1
+                perfis.append(tuple(camadas))
+            return perfis
+        return self._em_cache('perfil_distancias', calcular)
+
+    @staticmethod
+    def _refinar_cores_conjunto(g1, g2):
+        """
+        Refinamento de cores feito nos dois grafos ao mesmo tempo, para que as cores sejam comparáveis:
+        começa pelo perfil de distâncias (ou pelo grau, em grafos grandes) e repete o passo de
+        Weisfeiler-Lehman até estabilizar. Vértices associados por um isomorfismo têm a mesma cor.
+        Retorna (cores de g1, cores de g2), ou None se as contagens de cores já diferirem.
+        """
+        iniciais = []
+        for g in (g1, g2):
+            if g.vertices <= LIMITE_VERTICES_PERFIL_DISTANCIAS:
+                iniciais.append(g._perfil_distancias())
+            else:
+                indptr, _ = g._csr()
+                iniciais.append([indptr[v + 1] - indptr[v] for v in range(g.vertices)])
+        numeracao = {a: i for i, a in enumerate(sorted(set(iniciais[0]) | set(iniciais[1])))}
+        cores = [[numeracao[a] for a in inicial] for inicial in iniciais]
+        classes = len(numeracao)
+        while True:
+            if sorted(cores[0]) != sorted(cores[1]):
+                return None
+            assinaturas = []
+            for g, c in zip((g1, g2), cores):
+                indptr, indices = g._csr()
+                assinaturas.append([(c[v], tuple(sorted(c[w] for w in indices[indptr[v]:indptr[v + 1]])))
+                                    for v in range(g.vertices)])
+            numeracao = {a: i for i, a in enumerate(sorted(set(assinaturas[0]) | set(assinaturas[1])))}
+            cores = [[numeracao[a] for a in a_g] for a_g in assinaturas]
+            if len(numeracao) == classes:
+                return (cores[0], cores[1]) if sorted(cores[0]) == sorted(cores[1]) else None
+            classes = len(numeracao)
+
+    def hash_weisfeiler_lehman(self, iteracoes=3):
+        """
+        Invariante de isomorfismo pelo refinamento de cores de Weisfeiler-Lehman.
+        Grafos isomorfos têm sempre o mesmo hash (o contrário não é garantido).
+        """
+        indptr, indices = self._csr()
+        cores = [indptr[v + 1] - indptr[v] for v in range(self.vertices)]
+        resumo = hashlib.sha1(f"{self.vertices}:{len(self.arestas)}:{sorted(cores)}".encode())
+        for _ in range(iteracoes):
+            assinaturas = [(cores[v], tuple(sorted(cores[w] for w in indices[indptr[v]:indptr[v + 1]])))
+                           for v in range(self.vertices)]
+            # Renumera as cores pela ordem das assinaturas, que não depende da numeração dos vértices
+            novas = {a: i for i, a in enumerate(sorted(set(assinaturas)))}
+            resumo.update(repr(sorted(assinaturas)).encode())
+            cores = [novas[a] for a in assinaturas]
+        return resumo.hexdigest()
+
     def uniao(self, outro_grafo):
         total_vertices = max(self.vertices, outro_grafo.vertices)
         matriz_self = self.gerar_matriz_adjacencia()
@@ -174,35 +1080,108 @@ class Grafo:
         grafo_diff_sim.arestas = list(set(self.arestas) ^ set(outro_grafo.arestas))
         return grafo_diff_sim
 
-    def remover_vertice(self, vertice):
-        if vertice < self.vertices:
-            novo_grafo = Grafo(self.vertices - 1)
-            novo_grafo.arestas = [(u, v) for u, v in self.arestas if u != vertice and v != vertice]
-            return novo_grafo
+    def remover_vertice(self, vertice, copia=False):
+        """
+        Vista sem o vértice; os vértices seguintes são renumerados (v passa a ser v - 1).
+        A vista é somente leitura: com copia=True (ou chamando materializar() no resultado)
+        volta um Grafo independente, que pode ser alterado.
+        """
+        if 0 <= vertice < self.vertices:
+            vista = self.subgrafo_induzido(itertools.chain(range(vertice), range(vertice + 1, self.vertices)))
+            return vista.materializar() if copia else vista
         else:
             print("Vértice não encontrado.")
-            return self
+            return self.materializar() if copia else self
 
-    def remover_aresta(self, aresta):
-        if aresta in self.arestas:
-            novo_grafo = Grafo(self.vertices)
-            novo_grafo.arestas = [a for a in self.arestas if a != aresta]
-            return novo_grafo
+    def remover_aresta(self, aresta, copia=False):
+        """
+        Vista sem a aresta (em qualquer orientação); a lista de arestas não é copiada. A aresta é
+        localizada pela lista de incidência de u no CSR, em O(grau(u)). Como em remover_vertice,
+        copia=True devolve um Grafo independente.
+        """
+        u, v = aresta
+        indice = None
+        if 0 <= u < self.vertices and 0 <= v < self.vertices:
+            indptr, vizinhos, ids_arestas = self._csr_incidencia()
+            indice = next((ids_arestas[k] for k in range(indptr[u], indptr[u + 1]) if vizinhos[k] == v), None)
+        if indice is not None:
+            vista = self.subgrafo_arestas([indice], excluir=True)
+            return vista.materializar() if copia else vista
         else:
             print("Aresta não encontrada.")
-            return self
+            return self.materializar() if copia else self
+
+    def subgrafo_induzido(self, vertices=None, mascara=None):
+        """
+        Vista (VistaSubgrafo) do subgrafo induzido pelos vértices dados, ou pelos vértices v
+        com mascara[v] verdadeiro. Os vértices da vista são renumerados 0..k-1 na ordem dos ids.
+        """
+        if mascara is not None:
+            vertices = [v for v, marcado in enumerate(mascara) if marcado]
+        return VistaSubgrafo(self, vertices=vertices)
+
+    def subgrafo_arestas(self, indices, excluir=False):
+        """
+        Vista com todos os vértices e só as arestas de índices dados (ou todas menos elas, com
+        excluir=True). Os ids dos vértices não mudam.
+        """
+        return VistaSubgrafo(self, arestas=indices, excluir=excluir)
+
+    def materializar(self):
+        """Cópia independente como Grafo comum (de uma vista, ou do próprio grafo)."""
+        grafo = Grafo(self.vertices)
+        grafo.arestas = list(self.arestas)
+        pesos = self.pesos
+        grafo.pesos = None if pesos is None else list(pesos)
+        if self.tabela_nomes is not None:
+            grafo.tabela_nomes = TabelaNomes(self.rotulos())
+        return grafo
+
+    def rede_ego(self, centro, raio=1):
+        """
+        Vista da vizinhança de centro: o subgrafo induzido pelos vértices a no máximo raio
+        arestas dele. Só a vizinhança é percorrida (BFS no CSR do grafo). Na vista, o centro
+        é vista.local(centro).
+        """
+        if not 0 <= centro < self.vertices:
+            raise ValueError("Vértice inválido")
+        indptr, indices = self._csr()
+        alcancados = {centro}
+        fronteira = [centro]
+        for _ in range(raio):
+            proxima = []
+            for v in fronteira:
+                for w in indices[indptr[v]:indptr[v + 1]]:
+                    if w not in alcancados:
+                        alcancados.add(w)
+                        proxima.append(w)
+            if not proxima:
+                break
+            fronteira = proxima
+        return VistaSubgrafo(self, vertices=alcancados)
 
     def fundir_vertices(self, v1, v2):
+        """
+        Leva as arestas de v2 para v1 (v2 fica isolado). Laços formados são descartados e arestas
+        paralelas viram uma só, com o menor dos pesos.
+        """
         if v1 < self.vertices and v2 < self.vertices:
-            novas_arestas = set()
-            for u, v in self.arestas:
+            novas_arestas = {}
+            for i, (u, v) in enumerate(self.arestas):
                 if u == v2:
                     u = v1
                 if v == v2:
                     v = v1
-                if u != v or v != u:
-                    novas_arestas.add((min(u, v), max(u, v)))
+                if u != v:
+                    chave = (min(u, v), max(u, v))
+                    peso = self.peso(i)
+                    if chave not in novas_arestas or peso < novas_arestas[chave]:
+                        novas_arestas[chave] = peso
+            ponderado = self.pesos is not None
             self.arestas = list(novas_arestas)
+            self.pesos = list(novas_arestas.values()) if ponderado else None
+            # Arestas e pesos mudaram juntos: CSR, caminhos e métricas em cache não valem mais
+            self._cache = {}
         else:
             print("Um ou ambos os vértices não foram encontrados.")
 
@@ -212,35 +1191,32 @@ class Grafo:
         return self.is_conexo()
 
     def is_conexo(self):
+        # Uma única componente no rótulo (BFS sobre o CSR, em cache): O(V + E)
         if not self.vertices:
             return True
-        
-        visitados = set()
-        def dfs(v):
-            visitados.add(v)
-            for u, w in self.arestas:
-                if u == v and w not in visitados:
-                    dfs(w)
-                elif w == v and u not in visitados:
-                    dfs(u)
-        
-        dfs(0)  # começa do vértice 0
-        return len(visitados) == self.vertices
+        return max(self._rotulos_componentes()) == 0
 
     def is_subgrafo_de(self, G):
+        """Subgrafo com os mesmos rótulos de vértices; para procurar um padrão em qualquer posição, use buscar_subgrafo."""
         if self.vertices > G.vertices:
             return False
-        for u, v in self.arestas:
-            if (u, v) not in G.arestas and (v, u) not in G.arestas:
-                return False
-        return True
+        chaves = G._chaves_arestas()
+        return all(((u, v) if u <= v else (v, u)) in chaves for u, v in self.arestas)
 
     def is_arvore_abrangencia_de(self, G):
-        if not self.is_arvore():
-            return False
-        if self.vertices != G.vertices:
+        """
+        Verifica em O(V + E) se este grafo é uma árvore geradora de G: mesmos vértices, V - 1
+        arestas, todas presentes em G (conjunto de chaves de G) e nenhum ciclo (union-find).
+        """
+        if self.vertices != G.vertices or len(self.arestas) != self.vertices - 1:
             return False
-        return self.is_subgrafo_de(G)
+        chaves = G._chaves_arestas()
+        uniao = UniaoBusca(self.vertices)
+        for u, v in self.arestas:
+            if ((u, v) if u <= v else (v, u)) not in chaves or not uniao.unir(u, v):
+                return False
+        # V - 1 arestas sem ciclo formam uma árvore
+        return True
 
     def is_euleriano(self):
         # Verifica se o grafo é conexo
@@ -262,49 +1238,168 @@ class Grafo:
         else:
             return False, "O grafo não é euleriano nem semi-euleriano"
 
-    def is_hamiltoniano(self):
+    def is_hamiltoniano(self, tempo_limite=10.0):
+        ciclo, motivo = self.ciclo_hamiltoniano(tempo_limite)
+        if ciclo is not None:
+            return True, "O grafo é hamiltoniano (possui um ciclo hamiltoniano)"
+        return False, motivo
+
+    def ciclo_hamiltoniano(self, tempo_limite=10.0):
+        """
+        Procura um ciclo que passa uma vez por cada vértice. Antes da busca exponencial, usa a
+        estrutura do grafo: um ponto de articulação impede o ciclo, assim como um par de vértices
+        cuja remoção deixa 3 ou mais componentes. Se um par {a, b} deixa exatamente 2 componentes,
+        o ciclo é formado por um caminho a -> b em cada lado, e cada lado é resolvido separadamente.
+        Retorna (ciclo, None) ou (None, motivo); o motivo diz também se o tempo_limite se esgotou.
+        """
         if self.vertices < 3:
-            return False, "O grafo precisa ter pelo menos 3 vértices para ser hamiltoniano"
-        
-        def tem_ciclo_hamiltoniano(grafo, pos, caminho, visitados, inicio):
-            # Se todos os vértices foram visitados e podemos voltar ao início
-            if len(caminho) == grafo.vertices and caminho[0] in grafo.get_vizinhos(caminho[-1]):
-                return True
-            
-            # Tenta adicionar cada vértice adjacente não visitado ao caminho
-            for v in grafo.get_vizinhos(pos):
-                if v not in visitados:
-                    visitados.add(v)
-                    caminho.append(v)
-                    if tem_ciclo_hamiltoniano(grafo, v, caminho, visitados, inicio):
-                        return True
-                    visitados.remove(v)
-                    caminho.pop()
-            return False
-        
-        def get_vizinhos(self, vertice):
-            vizinhos = []
-            for u, v in self.arestas:
-                if u == vertice:
-                    vizinhos.append(v)
-                elif v == vertice:
-                    vizinhos.append(u)
-            return vizinhos
-        
-        # Adiciona o método get_vizinhos temporariamente à instância
-        self.get_vizinhos = lambda v: get_vizinhos(self, v)
-        
-        # Tenta encontrar um ciclo hamiltoniano começando de cada vértice
-        for inicio in range(self.vertices):
-            caminho = [inicio]
-            visitados = {inicio}
-            if tem_ciclo_hamiltoniano(self, inicio, caminho, visitados, inicio):
-                return True, "O grafo é hamiltoniano (possui um ciclo hamiltoniano)"
-        
-        # Remove o método temporário
-        delattr(self, 'get_vizinhos')
-        
-        return False, "O grafo não é hamiltoniano"
+            return None, "O grafo precisa ter pelo menos 3 vértices para ser hamiltoniano"
+        if not self.is_conexo():
+            return None, "O grafo não é conexo"
+        vizinhos = self._vizinhos_simples()
+        for v in range(self.vertices):
+            if len(vizinhos[v]) < 2:
+                return None, f"O vértice {self.rotulo(v)} tem menos de 2 vizinhos"
+        articulacoes = self.pontos_articulacao()
+        if articulacoes:
+            return None, (f"O vértice {self.rotulo(articulacoes[0])} é ponto de articulação: "
+                          "um ciclo não consegue passar duas vezes por ele")
+
+        prazo = time.perf_counter() + tempo_limite
+        try:
+            melhor = None
+            if self.vertices <= LIMITE_VERTICES_PARES_SEPARACAO:
+                for a, b, pedacos in Grafo._pares_separacao(vizinhos):
+                    if len(pedacos) >= 3:
+                        return None, (f"Remover {self.rotulo(a)} e {self.rotulo(b)} deixa {len(pedacos)} componentes: "
+                                      "um ciclo só consegue atravessar dois")
+                    if melhor is None or max(map(len, pedacos)) < max(map(len, melhor[2])):
+                        melhor = (a, b, pedacos)
+            # Tentativa rápida por rotações de Pósa; se não achar, a busca exata decide
+            ciclo = Grafo._ciclo_hamiltoniano_rotacoes(
+                vizinhos, random.Random(self.vertices), min(prazo, time.perf_counter() + tempo_limite / 4))
+            if ciclo is not None:
+                return ciclo, None
+            if melhor is None:
+                # Grafo triconexo (ou grande demais para procurar pares): busca direta, com o vértice
+                # de menor grau duplicado para que o ciclo vire um caminho entre as duas cópias
+                inicio = min(range(self.vertices), key=lambda v: len(vizinhos[v]))
+                copia = self.vertices
+                locais = [list(vz) for vz in vizinhos] + [list(vizinhos[inicio])]
+                for w in vizinhos[inicio]:
+                    locais[w].append(copia)
+                caminho = Grafo._caminho_hamiltoniano(locais, inicio, copia, prazo)
+                return (caminho[:-1], None) if caminho else (None, "O grafo não é hamiltoniano")
+
+            a, b, pedacos = melhor
+            ciclo = []
+            for pedaco in pedacos:
+                # Caminho a -> b (ou b -> a, no segundo lado) cobrindo o pedaço, só com as arestas do lado
+                lado = [a, b] + sorted(pedaco)
+                local = {v: i for i, v in enumerate(lado)}
+                locais = [[local[w] for w in vizinhos[v] if w in local] for v in lado]
+                caminho = Grafo._caminho_hamiltoniano(locais, 0, 1, prazo) if not ciclo else \
+                    Grafo._caminho_hamiltoniano(locais, 1, 0, prazo)
+                if caminho is None:
+                    return None, (f"O grafo não é hamiltoniano (não há caminho entre {self.rotulo(a)} e "
+                                  f"{self.rotulo(b)} passando por todos os vértices de um dos lados)")
+                ciclo.extend(lado[i] for i in caminho[:-1])
+            return ciclo, None
+        except TimeoutError:
+            return None, f"Tempo esgotado ({tempo_limite:g} s): não foi possível decidir se o grafo é hamiltoniano"
+
+    @staticmethod
+    def _ciclo_hamiltoniano_rotacoes(vizinhos, sorteio, prazo):
+        """
+        Heurística de rotação e extensão de Pósa: estende o caminho pela ponta enquanto houver vizinho
+        novo; senão, escolhe um vizinho v[i] da ponta e inverte o trecho depois dele, o que troca a ponta
+        por v[i + 1]. Acha ciclos hamiltonianos rapidamente em grafos esparsos que os têm, mas não prova
+        que não existem. Retorna o ciclo ou None ao chegar no prazo.
+        """
+        n = len(vizinhos)
+        while time.perf_counter() < prazo:
+            caminho = [sorteio.randrange(n)]
+            posicao = [-1] * n
+            posicao[caminho[0]] = 0
+            for _ in range(50 * n):
+                ponta = caminho[-1]
+                novos = [w for w in vizinhos[ponta] if posicao[w] == -1]
+                if novos:
+                    w = sorteio.choice(novos)
+                    posicao[w] = len(caminho)
+                    caminho.append(w)
+                    continue
+                if len(caminho) == n and caminho[0] in vizinhos[ponta]:
+                    return caminho
+                i = posicao[sorteio.choice(vizinhos[ponta])]
+                if i == len(caminho) - 2:
+                    continue
+                caminho[i + 1:] = caminho[:i:-1]
+                for j in range(i + 1, len(caminho)):
+                    posicao[caminho[j]] = j
+                if time.perf_counter() > prazo:
+                    return None
+        return None
+
+    @staticmethod
+    def _caminho_hamiltoniano(vizinhos, inicio, fim, prazo):
+        """
+        Caminho de inicio a fim que passa por todos os vértices (listas de adjacência locais, sem
+        repetições), ou None. Backtracking iterativo com poda: todo vértice ainda não visitado precisa
+        de duas saídas utilizáveis, e um vizinho do vértice atual que só tem mais uma saída tem de
+        ser o próximo. Levanta TimeoutError depois do prazo (time.perf_counter()).
+        """
+        n = len(vizinhos)
+        for v in range(n):
+            if len(vizinhos[v]) < (1 if v in (inicio, fim) else 2):
+                return None
+        adjacentes = [set(vz) for vz in vizinhos]
+        visitado = [False] * n
+        livres = [len(vz) for vz in vizinhos]  # vizinhos ainda não visitados
+
+        def visitar(v):
+            visitado[v] = True
+            for w in vizinhos[v]:
+                livres[w] -= 1
+
+        def opcoes(v, anterior, restantes):
+            if restantes == 1:
+                return [fim] if fim in adjacentes[v] else []
+            # Só os vizinhos do vértice atual e do anterior mudaram de situação
+            for vz in (vizinhos[v], vizinhos[anterior] if anterior is not None else ()):
+                for w in vz:
+                    if not visitado[w]:
+                        saidas = livres[w] + (w in adjacentes[v])
+                        if saidas < (1 if w == fim else 2):
+                            return []
+            candidatos = [w for w in vizinhos[v] if not visitado[w] and w != fim]
+            obrigatorios = [w for w in candidatos if livres[w] == 1]
+            if obrigatorios:
+                return obrigatorios if len(obrigatorios) == 1 else []
+            # Os de menos saídas primeiro (a pilha tira do fim)
+            candidatos.sort(key=lambda w: -livres[w])
+            return candidatos
+
+        visitar(inicio)
+        caminho = [inicio]
+        pilha = [opcoes(inicio, None, n - 1)]
+        while pilha:
+            if time.perf_counter() > prazo:
+                raise TimeoutError
+            if not pilha[-1]:
+                pilha.pop()
+                v = caminho.pop()
+                visitado[v] = False
+                for w in vizinhos[v]:
+                    livres[w] += 1
+                continue
+            v = pilha[-1].pop()
+            visitar(v)
+            caminho.append(v)
+            if len(caminho) == n:
+                return caminho
+            pilha.append(opcoes(v, caminho[-2], n - len(caminho)))
+        return None
 
     def encontrar_corte_fundamental(self):
         if not self.is_conexo():
@@ -313,6 +1408,8 @@ class Grafo:
         if not self.arestas:
             return None, "O grafo não possui arestas"
         
+        import networkx as nx  # importado só quando usado, para não pesar no início dos workers
+
         # Criar grafo NetworkX
         G = nx.Graph()
         G.add_edges_from(self.arestas)
@@ -346,3 +1443,2633 @@ class Grafo:
             
         except Exception as e:
             return None, f"Erro ao encontrar corte fundamental: {str(e)}"
+
+    def calcular_diametro(self):
+        """
+        Calcula o diâmetro do grafo com uma BFS a partir de cada vértice sobre o CSR
+        (ou Dijkstra a partir de cada vértice, se o grafo for ponderado).
+        Retorna -1 se o grafo não for conexo. O resultado fica no cache do grafo.
+        """
+        return self._em_cache('diametro', self._calcular_diametro)
+
+    def _calcular_diametro(self):
+        if self.vertices == 0:
+            return -1
+
+        if self.is_ponderado():
+            diametro = 0
+            for origem in range(self.vertices):
+                maior = max(self.dijkstra(origem)[0])
+                if maior == math.inf:
+                    return -1
+                diametro = max(diametro, maior)
+            return diametro
+
+        indptr, indices = self._csr()
+        diametro = 0
+        for origem in range(self.vertices):
+            dist = [-1] * self.vertices
+            dist[origem] = 0
+            fila = [origem]
+            for v in fila:
+                for w in indices[indptr[v]:indptr[v + 1]]:
+                    if dist[w] < 0:
+                        dist[w] = dist[v] + 1
+                        fila.append(w)
+            if len(fila) < self.vertices:
+                return -1
+            diametro = max(diametro, dist[fila[-1]])
+        return diametro
+
+    def _diametro_exaustivo(self):
+        """Diâmetro por Floyd-Warshall, O(V³): referência para conferir calcular_diametro."""
+        if self.vertices == 0:
+            return -1
+
+        # Inicializa a matriz de distâncias
+        INF = float('inf')
+        dist = [[INF] * self.vertices for _ in range(self.vertices)]
+
+        # Distância de um vértice para ele mesmo é 0
+        for i in range(self.vertices):
+            dist[i][i] = 0
+
+        # Inicializa as distâncias das arestas existentes com o peso (1 se não for ponderado)
+        for indice, (u, v) in enumerate(self.arestas):
+            if u != v:
+                dist[u][v] = dist[v][u] = min(dist[u][v], self.peso(indice))
+
+        # Algoritmo de Floyd-Warshall
+        for k in range(self.vertices):
+            for i in range(self.vertices):
+                for j in range(self.vertices):
+                    if dist[i][k] != INF and dist[k][j] != INF:
+                        dist[i][j] = min(dist[i][j], dist[i][k] + dist[k][j])
+
+        # Encontra o maior caminho mínimo (diâmetro)
+        diametro = 0
+        for i in range(self.vertices):
+            for j in range(self.vertices):
+                if dist[i][j] == INF:  # Se houver vértices desconectados
+                    return -1
+                diametro = max(diametro, dist[i][j])
+
+        return diametro
+
+    def _verificar_pesos_nao_negativos(self):
+        if self.pesos is not None and self._em_cache('peso_minimo', lambda: min(self.pesos, default=0)) < 0:
+            raise ValueError("Dijkstra exige pesos não negativos")
+
+    def dijkstra(self, origem):
+        """
+        Distâncias mínimas a partir de origem (Dijkstra com heap; peso 1 se o grafo não
+        for ponderado). Retorna (dist, pai), com dist[v] = inf para vértices inalcançáveis.
+        """
+        self._verificar_pesos_nao_negativos()
+        indptr, vizinhos, ids_arestas = self._csr_incidencia()
+        pesos = self.pesos
+        dist = [math.inf] * self.vertices
+        pai = [-1] * self.vertices
+        dist[origem] = 0
+        heap = [(0, origem)]
+        while heap:
+            d, v = heapq.heappop(heap)
+            if d > dist[v]:
+                continue  # entrada desatualizada
+            for i in range(indptr[v], indptr[v + 1]):
+                w = vizinhos[i]
+                nd = d + (pesos[ids_arestas[i]] if pesos is not None else 1)
+                if nd < dist[w]:
+                    dist[w] = nd
+                    pai[w] = v
+                    heapq.heappush(heap, (nd, w))
+        return dist, pai
+
+    def menor_caminho(self, origem, destino):
+        """
+        Menor caminho entre origem e destino: BFS bidirecional (ou Dijkstra bidirecional
+        se o grafo for ponderado). Retorna (distância, lista de vértices do caminho), ou
+        (inf, None) se não houver caminho. As consultas recentes ficam em um cache LRU, com o
+        caminho guardado como tupla; cada chamada devolve uma lista nova, que pode ser alterada.
+        """
+        if not (0 <= origem < self.vertices and 0 <= destino < self.vertices):
+            raise ValueError("Vértice inválido")
+        cache = self._em_cache('caminhos', OrderedDict)
+        chave = (origem, destino) if origem <= destino else (destino, origem)
+        if chave in cache:
+            cache.move_to_end(chave)
+            distancia, caminho = cache[chave]
+        else:
+            if self.is_ponderado():
+                distancia, caminho = self._dijkstra_bidirecional(*chave)
+            else:
+                distancia, caminho = self._bfs_bidirecional(*chave)
+            if caminho is not None:
+                caminho = tuple(caminho)
+            cache[chave] = (distancia, caminho)
+            if len(cache) > TAMANHO_CACHE_CAMINHOS:
+                cache.popitem(last=False)
+        if caminho is None:
+            return distancia, None
+        return distancia, list(caminho if chave[0] == origem else reversed(caminho))
+
+    @staticmethod
+    def _juntar_caminho(encontro, pai_origem, pai_destino):
+        caminho = []
+        v = encontro
+        while v != -1:
+            caminho.append(v)
+            v = pai_origem[v]
+        caminho.reverse()
+        v = pai_destino[encontro]
+        while v != -1:
+            caminho.append(v)
+            v = pai_destino[v]
+        return caminho
+
+    def _bfs_bidirecional(self, origem, destino):
+        if origem == destino:
+            return 0, [origem]
+        indptr, indices = self._csr()
+        # dist/pai de cada lado; sempre expande um nível inteiro da menor fronteira
+        dist = ({origem: 0}, {destino: 0})
+        pai = ({origem: -1}, {destino: -1})
+        fronteiras = ([origem], [destino])
+        while fronteiras[0] and fronteiras[1]:
+            lado = 0 if len(fronteiras[0]) <= len(fronteiras[1]) else 1
+            meu_dist, outro_dist, meu_pai = dist[lado], dist[1 - lado], pai[lado]
+            proxima = []
+            melhor, encontro = math.inf, -1
+            for x in fronteiras[lado]:
+                for w in indices[indptr[x]:indptr[x + 1]]:
+                    if w in meu_dist:
+                        continue
+                    meu_dist[w] = meu_dist[x] + 1
+                    meu_pai[w] = x
+                    proxima.append(w)
+                    if w in outro_dist and meu_dist[w] + outro_dist[w] < melhor:
+                        melhor, encontro = meu_dist[w] + outro_dist[w], w
+            if encontro != -1:
+                return melhor, self._juntar_caminho(encontro, pai[0], pai[1])
+            fronteiras = (proxima, fronteiras[1]) if lado == 0 else (fronteiras[0], proxima)
+        return math.inf, None
+
+    def _dijkstra_bidirecional(self, origem, destino):
+        if origem == destino:
+            return 0, [origem]
+        self._verificar_pesos_nao_negativos()
+        indptr, vizinhos, ids_arestas = self._csr_incidencia()
+        pesos = self.pesos
+        dist = ({origem: 0}, {destino: 0})
+        pai = ({origem: -1}, {destino: -1})
+        fechados = (set(), set())
+        heaps = ([(0, origem)], [(0, destino)])
+        melhor, encontro = math.inf, -1
+        while heaps[0] and heaps[1]:
+            # Critério de parada: nenhum caminho ainda não visto pode ser menor que o melhor encontrado
+            if heaps[0][0][0] + heaps[1][0][0] >= melhor:
+                break
+            lado = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            d, v = heapq.heappop(heaps[lado])
+            if v in fechados[lado] or d > dist[lado][v]:
+                continue
+            fechados[lado].add(v)
+            meu_dist, outro_dist = dist[lado], dist[1 - lado]
+            for i in range(indptr[v], indptr[v + 1]):
+                w = vizinhos[i]
+                nd = d + pesos[ids_arestas[i]]
+                if nd < meu_dist.get(w, math.inf):
+                    meu_dist[w] = nd
+                    pai[lado][w] = v
+                    heapq.heappush(heaps[lado], (nd, w))
+                if w in outro_dist and meu_dist[w] + outro_dist[w] < melhor:
+                    melhor, encontro = meu_dist[w] + outro_dist[w], w
+        if encontro == -1:
+            return math.inf, None
+        return melhor, self._juntar_caminho(encontro, pai[0], pai[1])
+
+    def _distancias_entre(self, paradas, prazo=None):
+        """
+        Matriz de distâncias de menor caminho entre as paradas (BFS, ou Dijkstra se o grafo for
+        ponderado), com uma busca por parada que termina ao alcançar todas as outras. Levanta
+        TimeoutError se o prazo (time.perf_counter()) passar antes de a matriz ficar pronta.
+        """
+        indptr, vizinhos, ids_arestas = self._csr_incidencia()
+        pesos = self.pesos
+        if pesos is not None:
+            self._verificar_pesos_nao_negativos()
+        indice = {v: i for i, v in enumerate(paradas)}
+        matriz = []
+        for s in paradas:
+            if prazo is not None and time.perf_counter() > prazo:
+                raise TimeoutError("Tempo esgotado ao calcular as distâncias entre as paradas; informe menos paradas")
+            linha = [None] * len(paradas)
+            faltam = len(paradas)
+            dist = {s: 0}
+            if pesos is None:
+                fila = deque([s])
+                while fila and faltam:
+                    v = fila.popleft()
+                    if v in indice:
+                        linha[indice[v]] = dist[v]
+                        faltam -= 1
+                    for w in vizinhos[indptr[v]:indptr[v + 1]]:
+                        if w not in dist:
+                            dist[w] = dist[v] + 1
+                            fila.append(w)
+            else:
+                heap = [(0, s)]
+                while heap and faltam:
+                    d, v = heapq.heappop(heap)
+                    if d > dist[v]:
+                        continue
+                    if v in indice and linha[indice[v]] is None:
+                        linha[indice[v]] = d
+                        faltam -= 1
+                    for i in range(indptr[v], indptr[v + 1]):
+                        w = vizinhos[i]
+                        nd = d + pesos[ids_arestas[i]]
+                        if nd < dist.get(w, math.inf):
+                            dist[w] = nd
+                            heapq.heappush(heap, (nd, w))
+            if faltam:
+                raise ValueError("Nem todas as paradas estão no mesmo componente do grafo")
+            matriz.append(linha)
+        return matriz
+
+    def rota_visita(self, paradas=None, tempo_limite=5.0, semente=None):
+        """
+        Ordem de visita das paradas (por padrão, todos os vértices) que fecha o passeio mais curto,
+        começando e terminando na primeira parada: caixeiro-viajante sobre as distâncias de menor
+        caminho do grafo (veja o módulo caixeiro). Retorna (ordem, custo, passeio, exata), em que
+        passeio é a sequência de vértices percorrida no grafo, com os menores caminhos entre paradas
+        consecutivas, e exata indica que a ordem é comprovadamente ótima.
+        O tempo_limite conta desde o início, incluindo a matriz de distâncias entre as paradas; se
+        ela não ficar pronta a tempo, levanta TimeoutError. Mais de LIMITE_PARADAS_ROTA paradas
+        levantam ValueError.
+        """
+        prazo = time.perf_counter() + tempo_limite
+        paradas = list(range(self.vertices)) if paradas is None else list(dict.fromkeys(paradas))
+        if not paradas:
+            raise ValueError("Nenhuma parada informada")
+        if len(paradas) > LIMITE_PARADAS_ROTA:
+            raise ValueError(f"A rota aceita no máximo {LIMITE_PARADAS_ROTA} paradas ({len(paradas)} pedidas); "
+                             f"informe as paradas")
+        for v in paradas:
+            if not 0 <= v < self.vertices:
+                raise ValueError("Vértice inválido")
+        distancias = self._distancias_entre(paradas, prazo)
+        rota, custo, exata = caixeiro.resolver(distancias, max(0.0, prazo - time.perf_counter()), semente)
+        inicio = rota.index(0)
+        ordem = [paradas[i] for i in rota[inicio:] + rota[:inicio]]
+        passeio = [ordem[0]]
+        if len(ordem) > 1:
+            for a, b in zip(ordem, ordem[1:] + ordem[:1]):
+                passeio.extend(self.menor_caminho(a, b)[1][1:])
+        return ordem, custo, passeio, exata
+
+    def arvore_geradora_minima(self, metodo='kruskal'):
+        """
+        Árvore (ou floresta, se o grafo for desconexo) geradora mínima pelos pesos das arestas.
+        metodo: 'kruskal' (ordenação + union-find) ou 'prim' (heap).
+        Retorna (lista de arestas da árvore, peso total).
+        """
+        if metodo == 'prim':
+            indices = self._prim()
+        elif metodo == 'kruskal':
+            indices = self._kruskal()
+        else:
+            raise ValueError(f"Método desconhecido: {metodo}")
+        return [self.arestas[i] for i in indices], sum(self.peso(i) for i in indices)
+
+    def _kruskal(self):
+        uf = UniaoBusca(self.vertices)
+        ordem = range(len(self.arestas))
+        if self.pesos is not None:
+            ordem = sorted(ordem, key=self.pesos.__getitem__)
+        escolhidas = []
+        for i in ordem:
+            u, v = self.arestas[i]
+            if uf.unir(u, v):
+                escolhidas.append(i)
+                if uf.componentes == 1:
+                    break
+        return escolhidas
+
+    def _prim(self):
+        indptr, vizinhos, ids_arestas = self._csr_incidencia()
+        na_arvore = [False] * self.vertices
+        escolhidas = []
+        for raiz in range(self.vertices):
+            if na_arvore[raiz]:
+                continue
+            na_arvore[raiz] = True
+            heap = [(self.peso(ids_arestas[i]), ids_arestas[i], vizinhos[i]) for i in range(indptr[raiz], indptr[raiz + 1])]
+            heapq.heapify(heap)
+            while heap:
+                _, e, v = heapq.heappop(heap)
+                if na_arvore[v]:
+                    continue
+                na_arvore[v] = True
+                escolhidas.append(e)
+                for i in range(indptr[v], indptr[v + 1]):
+                    if not na_arvore[vizinhos[i]]:
+                        heapq.heappush(heap, (self.peso(ids_arestas[i]), ids_arestas[i], vizinhos[i]))
+        return escolhidas
+
+    def _eh_corte(self, arestas_corte, lista_adj):
+        # Criar grafo temporário removendo as arestas do corte
+        grafo_temp = {v: lista_adj[v].copy() for v in lista_adj}
+
+        # Remover as arestas do corte
+        for u, v in arestas_corte:
+            if v in grafo_temp[u]:
+                grafo_temp[u].remove(v)
+            if u in grafo_temp[v]:
+                grafo_temp[v].remove(u)
+
+        # BFS para verificar conectividade
+        visitados = set()
+        fila = [0]  # Começa do vértice 0
+        visitados.add(0)
+
+        while fila:
+            v = fila.pop(0)
+            for u in grafo_temp[v]:
+                if u not in visitados:
+                    visitados.add(u)
+                    fila.append(u)
+
+        # Se não visitou todos os vértices, é um corte
+        return len(visitados) != self.vertices
+
+    def _certificado_esparso(self, k):
+        """
+        Certificado esparso de Nagamochi-Ibaraki: numera as arestas pela floresta em que
+        entram numa busca de adjacência máxima e mantém as de número <= k. O subgrafo
+        resultante tem no máximo k * V arestas e os mesmos cortes de tamanho < k.
+        Retorna os índices das arestas mantidas.
+        """
+        indptr, vizinhos, ids_arestas = self._csr_incidencia()
+        n = self.vertices
+        r = [0] * n
+        escaneado = [False] * n
+        rotulo = [0] * len(self.arestas)
+        baldes = [list(range(n))]
+        maior = 0
+        restantes = n
+        while restantes:
+            while not baldes[maior]:
+                maior -= 1
+            v = baldes[maior].pop()
+            if escaneado[v] or r[v] != maior:
+                continue  # entrada desatualizada do balde
+            escaneado[v] = True
+            restantes -= 1
+            for i in range(indptr[v], indptr[v + 1]):
+                w = vizinhos[i]
+                e = ids_arestas[i]
+                if escaneado[w] or rotulo[e]:
+                    continue
+                r[w] += 1
+                rotulo[e] = r[w]
+                if r[w] == len(baldes):
+                    baldes.append([])
+                baldes[r[w]].append(w)
+                if r[w] > maior:
+                    maior = r[w]
+        return [e for e, numero in enumerate(rotulo) if numero <= k]
+
+    def conectividade_arestas(self):
+        """
+        Conectividade de arestas λ(G) e um corte mínimo, por fluxo máximo com capacidades
+        unitárias (Even-Tarjan) sobre o certificado esparso de Nagamochi-Ibaraki. Só é preciso
+        levar fluxo até os vértices de um conjunto dominante (Matula); cada vértice já tratado
+        é unido à fonte, então a busca de cada caminho aumentante para ao alcançar a região
+        já coberta em vez de percorrer o grafo inteiro.
+        Retorna (λ, arestas do corte); o corte é [] se o grafo já for desconexo
+        e None se não houver corte possível (menos de 2 vértices).
+        """
+        def calcular():
+            if self.vertices < 2:
+                return 0, None
+            if max(self._rotulos_componentes()) > 0:
+                return 0, []
+
+            # Limite superior: isolar o vértice de menor grau
+            indptr, indices = self._csr()
+            graus = [0] * self.vertices
+            for u, v in self.arestas:
+                if u != v:
+                    graus[u] += 1
+                    graus[v] += 1
+            s = min(range(self.vertices), key=graus.__getitem__)
+            melhor = graus[s]
+            lado_t = None
+
+            # Fluxos só sobre o certificado esparso, que preserva os cortes menores que δ
+            selecionadas = self._certificado_esparso(melhor)
+            origem = [self.arestas[e][0] for e in selecionadas]
+            destino = [self.arestas[e][1] for e in selecionadas]
+            inicio_adj = [0] * (self.vertices + 1)
+            for a, b in zip(origem, destino):
+                if a != b:
+                    inicio_adj[a + 1] += 1
+                    inicio_adj[b + 1] += 1
+            for v in range(self.vertices):
+                inicio_adj[v + 1] += inicio_adj[v]
+            proximo = inicio_adj[:-1]
+            adj_vertice = [0] * inicio_adj[-1]
+            adj_aresta = [0] * inicio_adj[-1]
+            for i, (a, b) in enumerate(zip(origem, destino)):
+                if a != b:
+                    adj_vertice[proximo[a]], adj_aresta[proximo[a]] = b, i
+                    proximo[a] += 1
+                    adj_vertice[proximo[b]], adj_aresta[proximo[b]] = a, i
+                    proximo[b] += 1
+
+            # Conjunto dominante guloso contendo s: todo corte mínimo menor que δ separa dois de seus vértices
+            dominado = bytearray(self.vertices)
+            dominante = []
+            for v in itertools.chain([s], range(self.vertices)):
+                if not dominado[v]:
+                    dominante.append(v)
+                    dominado[v] = 1
+                    for w in indices[indptr[v]:indptr[v + 1]]:
+                        dominado[w] = 1
+            # Em ordem aleatória (com semente fixa) os vértices já tratados ficam espalhados pelo grafo,
+            # e os caminhos de cada novo vértice até algum deles são curtos (ex.: num ciclo, os dois lados)
+            terminais = dominante[1:]
+            random.Random(0).shuffle(terminais)
+
+            # Se o corte mínimo não separa os vértices já tratados de t, ele não os separa entre si:
+            # eles formam uma única fonte e o fluxo de cada t vai até qualquer um deles.
+            # O fluxo corre de t para a fonte; fluxo[e] é +1 no sentido origem -> destino, -1 no contrário.
+            na_fonte = bytearray(self.vertices)
+            na_fonte[s] = 1
+            fluxo = [0] * len(origem)
+            marca = [0] * self.vertices
+            pai_vertice = [0] * self.vertices
+            pai_aresta = [0] * self.vertices
+            carimbo = 0
+            for t in terminais:
+                tocadas = []
+                valor = 0
+                while valor < melhor:
+                    # BFS no grafo residual procurando caminho aumentante de t até a fonte
+                    carimbo += 1
+                    marca[t] = carimbo
+                    fila = [t]
+                    chegada = -1
+                    for x in fila:
+                        for k in range(inicio_adj[x], inicio_adj[x + 1]):
+                            w = adj_vertice[k]
+                            if marca[w] == carimbo:
+                                continue
+                            e = adj_aresta[k]
+                            if (fluxo[e] < 1) if origem[e] == x else (fluxo[e] > -1):
+                                marca[w] = carimbo
+                                pai_vertice[w] = x
+                                pai_aresta[w] = e
+                                if na_fonte[w]:
+                                    chegada = w
+                                    break
+                                fila.append(w)
+                        if chegada >= 0:
+                            break
+                    if chegada < 0:
+                        break
+                    w = chegada
+                    while w != t:
+                        x, e = pai_vertice[w], pai_aresta[w]
+                        fluxo[e] += 1 if origem[e] == x else -1
+                        tocadas.append(e)
+                        w = x
+                    valor += 1
+                if valor < melhor:
+                    # A última BFS (sem sucesso) marcou exatamente o lado de t do corte mínimo
+                    melhor = valor
+                    lado_t = fila
+                for e in tocadas:
+                    fluxo[e] = 0
+                na_fonte[t] = 1
+                if melhor == 1:
+                    break  # grafo conexo: não há corte menor
+
+            if lado_t is None:
+                lado_t = [s]
+            no_lado = bytearray(self.vertices)
+            for v in lado_t:
+                no_lado[v] = 1
+            corte = [(u, v) for u, v in self.arestas if no_lado[u] != no_lado[v]]
+            return melhor, corte
+        return self._em_cache('conectividade_arestas', calcular)
+
+    def encontrar_menor_corte(self):
+        """
+        Menor conjunto de arestas cuja remoção desconecta o grafo ([] se já for desconexo,
+        None se o grafo tiver menos de 2 vértices).
+        """
+        return self.conectividade_arestas()[1]
+
+    def encontrar_corte_de_tamanho(self, n):
+        """
+        Conjunto de exatamente n arestas cuja remoção desconecta o grafo, ou None se não existir.
+        Existe se e somente se λ(G) <= n <= E: basta completar um corte mínimo com outras arestas.
+        """
+        conectividade, corte = self.conectividade_arestas()
+        if corte is None or n < conectividade or n > len(self.arestas):
+            return None
+        chaves_corte = {(u, v) if u <= v else (v, u) for u, v in corte}
+        extras = (a for a in self.arestas if (a if a[0] <= a[1] else (a[1], a[0])) not in chaves_corte)
+        return corte + list(itertools.islice(extras, n - conectividade))
+
+    def encontrar_corte_de_tamanho_exaustivo(self, n):
+        """
+        Procura um conjunto de exatamente n arestas cuja remoção desconecta o grafo,
+        testando todas as combinações possíveis. Retorna a lista de arestas ou None.
+        Exponencial; mantido como referência para conferir encontrar_corte_de_tamanho.
+        """
+        lista_adj = self.gerar_lista_adjacencia()
+        for arestas_candidatas in itertools.combinations(self.arestas, n):
+            if self._eh_corte(arestas_candidatas, lista_adj):
+                return list(arestas_candidatas)
+        return None
+
+    def encontrar_menor_corte_exaustivo(self):
+        """
+        Testa cortes de tamanho crescente até encontrar o menor. Retorna a lista de arestas ou None.
+        Exponencial; mantido como referência para conferir encontrar_menor_corte.
+        """
+        lista_adj = self.gerar_lista_adjacencia()
+        for tamanho in range(1, len(self.arestas) + 1):
+            logger.debug("Testando cortes de tamanho %d...", tamanho)
+            for arestas_candidatas in itertools.combinations(self.arestas, tamanho):
+                if self._eh_corte(arestas_candidatas, lista_adj):
+                    return list(arestas_candidatas)
+        return None
+
+    def encontrar_ciclo(self, tamanho):
+        """
+        Encontra um ciclo com 'tamanho' vértices (>= 3), ou None. Um ciclo nunca atravessa dois blocos
+        biconexos, então cada bloco com vértices suficientes é buscado separadamente. Em cada bloco o
+        ciclo é procurado a partir do seu menor vértice, e um ramo é cortado quando a distância de
+        volta ao início já não cabe no que falta do ciclo.
+        """
+        if tamanho < 3:
+            return None
+        vizinhos = self._vizinhos_simples()
+        for bloco in self.componentes_biconexas():
+            if len(bloco) < tamanho:
+                continue
+            no_bloco = set(bloco)
+            for inicio in bloco:
+                # Só vértices maiores que o início: cada ciclo é encontrado a partir do seu menor vértice
+                permitidos = {v for v in no_bloco if v > inicio}
+                distancia = {inicio: 0}
+                fila = deque([inicio])
+                while fila:
+                    v = fila.popleft()
+                    for w in vizinhos[v]:
+                        if w in permitidos and w not in distancia:
+                            distancia[w] = distancia[v] + 1
+                            fila.append(w)
+                if len(distancia) < tamanho:
+                    continue
+                caminho = [inicio]
+                no_caminho = {inicio}
+                pilha = [iter(vizinhos[inicio])]
+                while pilha:
+                    for w in pilha[-1]:
+                        if w in no_caminho or w not in distancia:
+                            continue
+                        # Depois de w ainda faltam tamanho - len(caminho) - 1 vértices e a volta ao início
+                        if distancia[w] > tamanho - len(caminho):
+                            continue
+                        if len(caminho) + 1 == tamanho:
+                            if inicio in vizinhos[w]:
+                                return caminho + [w]
+                            continue
+                        caminho.append(w)
+                        no_caminho.add(w)
+                        pilha.append(iter(vizinhos[w]))
+                        break
+                    else:
+                        pilha.pop()
+                        no_caminho.discard(caminho.pop())
+        return None
+
+    def _encontrar_ciclo_exaustivo(self, tamanho):
+        """
+        Busca em profundidade por todos os caminhos simples a partir de cada vértice, sem podas:
+        referência exponencial para conferir encontrar_ciclo.
+        """
+        if tamanho < 3:
+            return None
+        vizinhos = self._vizinhos_simples()
+
+        def dfs_ciclo(atual, inicio, caminho, visitados):
+            if len(caminho) == tamanho:
+                # Verifica se forma um ciclo voltando ao início
+                return caminho if inicio in vizinhos[atual] else None
+            for vizinho in vizinhos[atual]:
+                if vizinho not in visitados:
+                    novo_caminho = dfs_ciclo(vizinho, inicio, caminho + [vizinho], visitados | {vizinho})
+                    if novo_caminho:
+                        return novo_caminho
+            return None
+
+        # Tenta encontrar ciclo começando de cada vértice
+        for v in range(self.vertices):
+            ciclo = dfs_ciclo(v, v, [v], {v})
+            if ciclo:
+                return ciclo
+        return None
+
+    def encontrar_menor_ciclo(self):
+        """
+        Encontra o menor ciclo no grafo (cintura) usando BFS a partir de cada vértice:
+        cada aresta fora da árvore da BFS fecha um ciclo de tamanho dist[v] + dist[w] + 1.
+        Retorna uma tupla (tamanho, ciclo) ou None se não existir ciclo. O resultado fica no cache do grafo.
+        """
+        return self._em_cache('menor_ciclo', self._calcular_menor_ciclo)
+
+    def _calcular_menor_ciclo(self):
+        if self.vertices < 3:
+            return None
+
+        indptr, indices = self._csr()
+        menor_tamanho = math.inf
+        menor_ciclo = None
+
+        for inicio in range(self.vertices):
+            dist = {inicio: 0}
+            pai = {inicio: -1}
+            fila = [inicio]
+            for v in fila:
+                # Ciclos encontrados daqui em diante teriam pelo menos 2 * dist[v] + 1 vértices
+                if 2 * dist[v] + 1 >= menor_tamanho:
+                    break
+                for w in indices[indptr[v]:indptr[v + 1]]:
+                    if w not in dist:
+                        dist[w] = dist[v] + 1
+                        pai[w] = v
+                        fila.append(w)
+                    elif w != pai[v] and v != w:
+                        tamanho = dist[v] + dist[w] + 1
+                        if tamanho < menor_tamanho:
+                            # Sobe de v e de w até o início da BFS e junta os dois ramos
+                            ramo_v, x = [], v
+                            while x != -1:
+                                ramo_v.append(x)
+                                x = pai[x]
+                            ramo_w, x = [], w
+                            while x != -1:
+                                ramo_w.append(x)
+                                x = pai[x]
+                            menor_tamanho = tamanho
+                            menor_ciclo = ramo_v[::-1] + ramo_w[:-1]
+
+        return (menor_tamanho, menor_ciclo) if menor_ciclo else None
+
+    def encontrar_pontes(self):
+        """
+        Arestas cuja remoção aumenta o número de componentes (Tarjan, DFS iterativa com lowlink).
+        """
+        indptr, vizinhos, ids_arestas = self._csr_incidencia()
+        ordem = [-1] * self.vertices
+        low = [0] * self.vertices
+        pontes = []
+        contador = 0
+        for raiz in range(self.vertices):
+            if ordem[raiz] != -1:
+                continue
+            ordem[raiz] = low[raiz] = contador
+            contador += 1
+            # Pilha de (vértice, aresta usada para chegar nele, próxima posição no CSR)
+            pilha = [(raiz, -1, indptr[raiz])]
+            while pilha:
+                v, aresta_pai, i = pilha[-1]
+                if i < indptr[v + 1]:
+                    pilha[-1] = (v, aresta_pai, i + 1)
+                    w, e = vizinhos[i], ids_arestas[i]
+                    if e == aresta_pai:
+                        continue
+                    if ordem[w] == -1:
+                        ordem[w] = low[w] = contador
+                        contador += 1
+                        pilha.append((w, e, indptr[w]))
+                    elif ordem[w] < low[v]:
+                        low[v] = ordem[w]
+                else:
+                    pilha.pop()
+                    if pilha:
+                        p = pilha[-1][0]
+                        if low[v] < low[p]:
+                            low[p] = low[v]
+                        if low[v] > ordem[p]:
+                            pontes.append(self.arestas[aresta_pai])
+        return pontes
+
+    # ------------------------------------------------------------- decomposição
+
+    def _vizinhos_simples(self):
+        """Vizinhos de cada vértice sem laços nem repetições (arestas paralelas), em listas ordenadas."""
+        def calcular():
+            indptr, indices = self._csr()
+            return [sorted(set(indices[indptr[v]:indptr[v + 1]]) - {v}) for v in range(self.vertices)]
+        return self._em_cache('vizinhos_simples', calcular)
+
+    def blocos_biconexos(self):
+        """Índices das arestas de cada bloco biconexo (os laços não entram em nenhum)."""
+        return [list(bloco) for bloco in self._blocos_biconexos()]
+
+    def componentes_biconexas(self):
+        """Vértices de cada bloco biconexo (uma ponte forma um bloco de 2 vértices)."""
+        blocos = []
+        for bloco in self._blocos_biconexos():
+            vertices = set()
+            for e in bloco:
+                vertices.update(self.arestas[e])
+            blocos.append(sorted(vertices))
+        return blocos
+
+    def pontos_articulacao(self):
+        """Vértices cuja remoção aumenta o número de componentes: os que estão em mais de um bloco."""
+        contagem = [0] * self.vertices
+        for bloco in self.componentes_biconexas():
+            for v in bloco:
+                contagem[v] += 1
+        return [v for v in range(self.vertices) if contagem[v] > 1]
+
+    @staticmethod
+    def _separadores(vizinhos, removido):
+        """
+        Pontos de articulação do grafo dado por listas de adjacência sem repetições, ignorando os
+        vértices removidos. Retorna {vértice: componentes que restam do seu componente sem ele}.
+        """
+        ordem = [-1] * len(vizinhos)
+        low = [0] * len(vizinhos)
+        separados = {}
+        raizes = set()
+        contador = 0
+        for raiz in range(len(vizinhos)):
+            if removido[raiz] or ordem[raiz] != -1:
+                continue
+            raizes.add(raiz)
+            ordem[raiz] = low[raiz] = contador
+            contador += 1
+            pilha = [(raiz, -1, 0)]
+            while pilha:
+                v, pai, i = pilha[-1]
+                if i < len(vizinhos[v]):
+                    pilha[-1] = (v, pai, i + 1)
+                    w = vizinhos[v][i]
+                    if removido[w] or w == pai:
+                        continue
+                    if ordem[w] == -1:
+                        ordem[w] = low[w] = contador
+                        contador += 1
+                        pilha.append((w, v, 0))
+                    elif ordem[w] < low[v]:
+                        low[v] = ordem[w]
+                else:
+                    pilha.pop()
+                    if pilha:
+                        p = pilha[-1][0]
+                        if low[v] < low[p]:
+                            low[p] = low[v]
+                        if low[v] >= ordem[p]:
+                            # a subárvore de v só se liga ao resto por p
+                            separados[p] = separados.get(p, 0) + 1
+        # Fora da raiz, o lado do pai também é um componente; a raiz só separa com 2 ou mais filhos
+        return {v: k if v in raizes else k + 1 for v, k in separados.items() if v not in raizes or k > 1}
+
+    @staticmethod
+    def _componentes_sem(vizinhos, removido):
+        componentes = []
+        visto = list(removido)
+        for raiz in range(len(vizinhos)):
+            if visto[raiz]:
+                continue
+            visto[raiz] = True
+            componente = [raiz]
+            for v in componente:
+                for w in vizinhos[v]:
+                    if not visto[w]:
+                        visto[w] = True
+                        componente.append(w)
+            componentes.append(componente)
+        return componentes
+
+    @staticmethod
+    def _pares_separacao(vizinhos):
+        """
+        Pares {a, b} (a < b) de um grafo biconexo cuja remoção o desconecta, com os componentes que
+        restam. Cada vértice a é removido e os pontos de articulação do resto completam o par: O(V (V + E)).
+        """
+        removido = [False] * len(vizinhos)
+        for a in range(len(vizinhos)):
+            removido[a] = True
+            for b in sorted(Grafo._separadores(vizinhos, removido)):
+                if b > a:
+                    removido[b] = True
+                    yield a, b, Grafo._componentes_sem(vizinhos, removido)
+                    removido[b] = False
+            removido[a] = False
+
+    def componentes_triconexas(self):
+        """
+        Divide cada bloco biconexo por pares de separação {a, b} até que cada pedaço seja triconexo,
+        um ciclo ou tenha no máximo 3 vértices. Os dois lados de um corte mantêm a e b, ligados por
+        uma aresta virtual. É a decomposição em componentes de separação sem as fusões de ciclos e
+        ligações da árvore SPQR (os pedaços podem não ser os mínimos), em O(V² (V + E)) no pior caso.
+        Retorna [(vértices, arestas virtuais)].
+        """
+        vizinhos = self._vizinhos_simples()
+        resultado = []
+        for bloco in self.componentes_biconexas():
+            pendentes = [(bloco, [])]
+            while pendentes:
+                vertices, virtuais = pendentes.pop()
+                local = {v: i for i, v in enumerate(vertices)}
+                locais = [[local[w] for w in vizinhos[v] if w in local] for v in vertices]
+                for a, b in virtuais:
+                    if local[b] not in locais[local[a]]:
+                        locais[local[a]].append(local[b])
+                        locais[local[b]].append(local[a])
+                if len(vertices) <= 3 or all(len(vz) == 2 for vz in locais):
+                    resultado.append((vertices, virtuais))
+                    continue
+                par = next(Grafo._pares_separacao(locais), None)
+                if par is None:
+                    resultado.append((vertices, virtuais))
+                    continue
+                a, b, pedacos = par
+                a, b = vertices[a], vertices[b]
+                for pedaco in pedacos:
+                    lado = sorted([vertices[i] for i in pedaco] + [a, b])
+                    no_lado = set(lado)
+                    pendentes.append((lado, [(x, y) for x, y in virtuais if x in no_lado and y in no_lado
+                                             and {x, y} != {a, b}] + [(a, b)]))
+        return resultado
+
+    def ordem_degenerescencia(self):
+        """
+        Ordem em que cada vértice tem no máximo k vizinhos depois dele, com o menor k possível
+        (a degenerescência). Retorna (ordem, k).
+        """
+        ordem, nucleo = self._ordem_menor_ultimo()
+        return list(ordem), max(nucleo, default=0)
+
+    def decomposicao_arvore(self, heuristica='grau_minimo', tempo_limite=None):
+        """
+        Decomposição em árvore por eliminação de vértices: cada vértice eliminado forma uma bolsa com
+        seus vizinhos restantes, que passam a formar uma clique. A ordem vem da heurística:
+        'grau_minimo' (menor grau restante) ou 'preenchimento_minimo' (menos arestas novas).
+        A bolsa de v liga-se à do primeiro dos seus vizinhos restantes a ser eliminado.
+        O preenchimento de cada vértice é C(grau, 2) menos as arestas entre seus vizinhos, contagem
+        atualizada a cada aresta removida ou criada só nos vizinhos comuns dos seus extremos. Se o
+        tempo_limite (segundos) se esgotar, o resto da ordem segue o grau mínimo.
+        Retorna (largura, bolsas, arestas da árvore entre índices de bolsas, completa), com completa
+        False se a heurística pedida foi trocada pelo grau mínimo; a largura de árvore do grafo fica
+        entre a degenerescência e essa largura.
+        """
+        if heuristica not in ('grau_minimo', 'preenchimento_minimo'):
+            raise ValueError(f"Heurística desconhecida: {heuristica}")
+        prazo = None if tempo_limite is None else time.monotonic() + tempo_limite
+        vizinhos = [set(vz) for vz in self._vizinhos_simples()]
+        preenchimento = heuristica == 'preenchimento_minimo'
+        # entre[v]: arestas entre os vizinhos de v (só mantido para o preenchimento mínimo)
+        entre = [0] * self.vertices
+        if preenchimento:
+            for v in range(self.vertices):
+                entre[v] = sum(len(vizinhos[v] & vizinhos[x]) for x in vizinhos[v]) // 2
+
+        def custo(v):
+            grau = len(vizinhos[v])
+            return grau * (grau - 1) // 2 - entre[v] if preenchimento else grau
+
+        def criar_aresta(a, b, tocados):
+            comuns = vizinhos[a] & vizinhos[b]
+            for w in comuns:
+                entre[w] += 1
+            entre[a] += len(comuns)
+            entre[b] += len(comuns)
+            tocados.update(comuns)
+
+        custos = [custo(v) for v in range(self.vertices)]
+        heap = [(c, v) for v, c in enumerate(custos)]
+        heapq.heapify(heap)
+        posicao = [-1] * self.vertices
+        bolsas = []
+        completa = True
+        while heap:
+            if preenchimento and prazo is not None and time.monotonic() > prazo:
+                # Tempo esgotado: o resto da ordem segue o grau mínimo, que não precisa das contagens
+                preenchimento = completa = False
+                custos = [custo(v) for v in range(self.vertices)]
+                heap = [(custos[v], v) for v in range(self.vertices) if posicao[v] == -1]
+                heapq.heapify(heap)
+                continue
+            c, v = heapq.heappop(heap)
+            if posicao[v] != -1 or c != custos[v]:
+                continue  # entrada desatualizada
+            posicao[v] = len(bolsas)
+            restantes = vizinhos[v]
+            bolsas.append([v] + sorted(restantes))
+            tocados = set(restantes)
+            ligados = set(restantes)  # vizinhos de v cuja aresta com v ainda não foi retirada
+            for x in restantes:
+                if preenchimento:
+                    # A aresta v-x some da vizinhança dos vizinhos comuns (todos já estão em tocados)
+                    ligados.discard(x)
+                    comuns = ligados & vizinhos[x]
+                    for w in comuns:
+                        entre[w] -= 1
+                    entre[x] -= len(comuns)
+                vizinhos[x].discard(v)
+            lista = sorted(restantes)
+            for i, x in enumerate(lista):
+                for y in lista[i + 1:]:
+                    if y in vizinhos[x]:
+                        continue
+                    if preenchimento:
+                        criar_aresta(x, y, tocados)
+                    vizinhos[x].add(y)
+                    vizinhos[y].add(x)
+            for x in tocados:
+                if posicao[x] == -1:
+                    custos[x] = custo(x)
+                    heapq.heappush(heap, (custos[x], x))
+        arestas = []
+        raizes = []
+        for i, bolsa in enumerate(bolsas):
+            if len(bolsa) > 1:
+                arestas.append((i, min(posicao[w] for w in bolsa[1:])))
+            else:
+                raizes.append(i)
+        # Sem vizinhos restantes, a bolsa encerra um componente: as raízes são ligadas em sequência
+        arestas.extend(zip(raizes, raizes[1:]))
+        largura = max((len(bolsa) for bolsa in bolsas), default=1) - 1
+        return largura, bolsas, arestas, completa
+
+    # ------------------------------------------------------------------ cliques
+
+    def _vizinhos_posteriores(self):
+        """
+        Posição de cada vértice na ordem de degenerescência e seus vizinhos que vêm depois (no máximo k).
+        Toda clique é formada pelo seu primeiro vértice nessa ordem e por vizinhos posteriores dele.
+        """
+        def calcular():
+            posicao = [0] * self.vertices
+            for i, v in enumerate(self._ordem_menor_ultimo()[0]):
+                posicao[v] = i
+            vizinhos = self._vizinhos_simples()
+            return posicao, [[w for w in vizinhos[v] if posicao[w] > posicao[v]] for v in range(self.vertices)]
+        return self._em_cache('vizinhos_posteriores', calcular)
+
+    def _bits_locais(self, vertices):
+        """Adjacência entre 'vertices' em inteiros: o bit j de linhas[i] liga vertices[i] a vertices[j]."""
+        vizinhos = self._vizinhos_simples()
+        local = {v: i for i, v in enumerate(vertices)}
+        linhas = []
+        for v in vertices:
+            bits = 0
+            lista = vizinhos[v]
+            if len(lista) <= len(vertices):
+                for w in lista:
+                    j = local.get(w)
+                    if j is not None:
+                        bits |= 1 << j
+            else:
+                # Vértice de grau alto: procura cada vértice local na lista ordenada de vizinhos
+                for j, w in enumerate(vertices):
+                    i = bisect.bisect_left(lista, w)
+                    if i < len(lista) and lista[i] == w:
+                        bits |= 1 << j
+            linhas.append(bits)
+        return linhas
+
+    def cliques_maximais(self):
+        """
+        Gera as cliques maximais (listas ordenadas de vértices) uma de cada vez: Bron–Kerbosch com pivô
+        de Tomita sobre a ordem de degenerescência (Eppstein). Cada vértice v abre uma busca com os
+        vizinhos posteriores como candidatos e os anteriores como excluídos, em bitsets locais.
+        Laços são ignorados; um vértice isolado é uma clique de 1 vértice.
+        """
+        posicao, posteriores = self._vizinhos_posteriores()
+        vizinhos = self._vizinhos_simples()
+        for v in range(self.vertices):
+            locais = posteriores[v] + [w for w in vizinhos[v] if posicao[w] < posicao[v]]
+            linhas = self._bits_locais(locais)
+            candidatos = (1 << len(posteriores[v])) - 1
+            excluidos = ((1 << len(locais)) - 1) ^ candidatos
+            for clique in Grafo._bron_kerbosch(linhas, candidatos, excluidos, 0):
+                yield sorted([v] + [locais[i] for i in _indices_bits(clique)])
+
+    @staticmethod
+    def _bron_kerbosch(linhas, candidatos, excluidos, atual):
+        if not candidatos:
+            if not excluidos:
+                yield atual
+            return
+        # Pivô com mais vizinhos entre os candidatos: só os candidatos fora da vizinhança dele abrem ramos
+        pivo = max(_indices_bits(candidatos | excluidos), key=lambda u: (candidatos & linhas[u]).bit_count())
+        for u in _indices_bits(candidatos & ~linhas[pivo]):
+            bit = 1 << u
+            yield from Grafo._bron_kerbosch(linhas, candidatos & linhas[u], excluidos & linhas[u], atual | bit)
+            candidatos &= ~bit
+            excluidos |= bit
+
+    @staticmethod
+    def _colorir_bits(linhas, candidatos):
+        """Coloração gulosa dos candidatos por classes independentes. Retorna (vértices, cor de cada um)."""
+        ordem, cores = [], []
+        cor = 0
+        while candidatos:
+            cor += 1
+            livres = candidatos
+            while livres:
+                menor = livres & -livres
+                u = menor.bit_length() - 1
+                livres &= ~(linhas[u] | menor)
+                candidatos ^= menor
+                ordem.append(u)
+                cores.append(cor)
+        return ordem, cores
+
+    @staticmethod
+    def _expandir_clique(linhas, candidatos, estado):
+        """
+        Branch-and-bound MCQ (Tomita), iterativo: colore os candidatos e tenta do último ao primeiro,
+        cortando quando o tamanho atual + cor não supera estado['tamanho']. Atualiza estado['melhor']
+        (índices locais) e estado['tamanho']; marca estado['esgotado'] ao passar de estado['prazo'].
+        """
+        atual = []
+        # Cada quadro: [vértices na ordem da coloração, cores, próxima posição, candidatos restantes]
+        ordem, cores = Grafo._colorir_bits(linhas, candidatos)
+        pilha = [[ordem, cores, len(ordem) - 1, candidatos]]
+        while pilha:
+            if time.perf_counter() > estado['prazo']:
+                estado['esgotado'] = True
+                return
+            quadro = pilha[-1]
+            ordem, cores, i = quadro[0], quadro[1], quadro[2]
+            if i < 0 or len(atual) + cores[i] <= estado['tamanho']:
+                pilha.pop()
+                if pilha:
+                    # Volta ao quadro anterior: o vértice escolhido lá sai dos candidatos
+                    u = atual.pop()
+                    pilha[-1][3] &= ~(1 << u)
+                    pilha[-1][2] -= 1
+                continue
+            u = ordem[i]
+            atual.append(u)
+            restantes = quadro[3] & linhas[u]
+            if restantes:
+                ordem, cores = Grafo._colorir_bits(linhas, restantes)
+                pilha.append([ordem, cores, len(ordem) - 1, restantes])
+                continue
+            if len(atual) > estado['tamanho']:
+                estado['melhor'] = list(atual)
+                estado['tamanho'] = len(atual)
+            atual.pop()
+            quadro[3] &= ~(1 << u)
+            quadro[2] -= 1
+
+    def clique_maxima(self, tempo_limite=10.0):
+        """
+        Maior clique por branch-and-bound em bitsets. Cada vértice só procura entre seus vizinhos
+        posteriores na ordem de degenerescência (no máximo k), então grafos grandes e esparsos nunca
+        montam estruturas densas; os vértices com mais vizinhos posteriores vêm primeiro.
+        Retorna (clique, limite_superior): a clique é máxima quando len(clique) == limite_superior.
+        """
+        if self.vertices == 0:
+            return [], 0
+        _, posteriores = self._vizinhos_posteriores()
+        ordem = sorted(range(self.vertices), key=lambda v: -len(posteriores[v]))
+        melhor = [ordem[0]]
+        limite_superior = 1
+        estado = {'prazo': time.perf_counter() + tempo_limite, 'esgotado': False}
+        for v in ordem:
+            cota = len(posteriores[v]) + 1
+            if cota <= len(melhor):
+                break  # os próximos vértices têm ainda menos vizinhos posteriores
+            locais = posteriores[v]
+            # Com v, só interessa uma clique local maior que len(melhor) - 1
+            estado['melhor'], estado['tamanho'] = None, len(melhor) - 1
+            Grafo._expandir_clique(self._bits_locais(locais), (1 << len(locais)) - 1, estado)
+            if estado['melhor'] is not None:
+                melhor = [v] + [locais[i] for i in estado['melhor']]
+            if estado['esgotado']:
+                limite_superior = cota
+                break
+        return sorted(melhor), max(limite_superior, len(melhor))
+
+    def conjunto_independente_maximo(self, tempo_limite=10.0):
+        """
+        Maior conjunto de vértices sem arestas entre si, como clique máxima do complemento. Antes, as
+        reduções exatas de grau 0 e 1 (um vértice isolado ou uma folha sempre pode entrar) encolhem o
+        grafo; cada componente restante tem o complemento montado em bitsets só para os seus vértices.
+        Vértices com laço nunca entram. Retorna (conjunto, limite_superior); sem busca completa o
+        limite é V - |M| para um emparelhamento M (cada aresta de M tem no máximo uma ponta no conjunto).
+        """
+        vizinhos = self._vizinhos_simples()
+        ativo = [True] * self.vertices
+        for u, v in self.arestas:
+            if u == v:
+                ativo[u] = False
+        grau = [sum(1 for w in vizinhos[v] if ativo[w]) if ativo[v] else 0 for v in range(self.vertices)]
+        conjunto = []
+
+        def remover(v):
+            ativo[v] = False
+            for w in vizinhos[v]:
+                if ativo[w]:
+                    grau[w] -= 1
+                    if grau[w] <= 1:
+                        pendentes.append(w)
+
+        pendentes = [v for v in range(self.vertices) if ativo[v] and grau[v] <= 1]
+        while pendentes:
+            v = pendentes.pop()
+            if not ativo[v] or grau[v] > 1:
+                continue
+            vizinho = next((w for w in vizinhos[v] if ativo[w]), None)
+            conjunto.append(v)
+            remover(v)
+            if vizinho is not None:
+                remover(vizinho)
+
+        exato = True
+        prazo = time.perf_counter() + tempo_limite
+        restantes = [v for v in range(self.vertices) if ativo[v]]
+        for componente in Grafo._componentes_sem(vizinhos, [not a for a in ativo]):
+            componente.sort(key=lambda v: grau[v])
+            linhas = self._bits_locais(componente)
+            # Gulosa pelo menor grau: solução inicial (ou final, em componentes grandes demais)
+            livres = (1 << len(componente)) - 1
+            gulosa = []
+            for i in range(len(componente)):
+                if livres >> i & 1:
+                    gulosa.append(i)
+                    livres &= ~linhas[i]
+            if len(componente) <= LIMITE_VERTICES_CONJUNTO_INDEPENDENTE:
+                todos = (1 << len(componente)) - 1
+                complemento = [todos & ~(linha | 1 << i) for i, linha in enumerate(linhas)]
+                estado = {'melhor': gulosa, 'tamanho': len(gulosa), 'prazo': prazo, 'esgotado': False}
+                Grafo._expandir_clique(complemento, todos, estado)
+                gulosa = estado['melhor']
+                exato = exato and not estado['esgotado']
+            else:
+                exato = False
+            conjunto.extend(componente[i] for i in gulosa)
+        logger.debug("Conjunto independente: %d vértices (%d depois das reduções)", len(conjunto), len(restantes))
+        if exato:
+            return sorted(conjunto), len(conjunto)
+        # O emparelhamento máximo, se já estiver no cache; senão o guloso, que é linear
+        par = self._cache.get('emparelhamento') or self._emparelhamento_guloso()
+        return sorted(conjunto), self.vertices - sum(1 for p in par if p != -1) // 2
+
+    # ---------------------------------------------------------------- coloração
+
+    def _ordem_menor_ultimo(self):
+        """
+        Remove sempre o vértice de menor grau restante, com baldes por grau: O(V + E).
+        Retorna (ordem de remoção, número do k-núcleo de cada vértice); a degenerescência é o maior núcleo.
+        """
+        def calcular():
+            indptr, indices = self._csr()
+            grau = [indptr[v + 1] - indptr[v] for v in range(self.vertices)]
+            baldes = [set() for _ in range(max(grau, default=0) + 1)]
+            for v, d in enumerate(grau):
+                baldes[d].add(v)
+            removido = [False] * self.vertices
+            nucleo = [0] * self.vertices
+            ordem = []
+            k = 0
+            menor = 0
+            for _ in range(self.vertices):
+                while not baldes[menor]:
+                    menor += 1
+                v = baldes[menor].pop()
+                k = max(k, menor)
+                nucleo[v] = k
+                removido[v] = True
+                ordem.append(v)
+                for w in indices[indptr[v]:indptr[v + 1]]:
+                    if not removido[w]:
+                        baldes[grau[w]].discard(w)
+                        grau[w] -= 1
+                        baldes[grau[w]].add(w)
+                # Remover v só pode baixar o menor grau em uma unidade
+                menor = max(menor - 1, 0)
+            return ordem, nucleo
+        return self._em_cache('menor_ultimo', calcular)
+
+    def colorir_guloso(self, ordem='maior_grau', semente=None):
+        """
+        Coloração gulosa: cada vértice, na ordem escolhida, recebe a menor cor livre entre os vizinhos.
+        Ordens: 'natural', 'maior_grau', 'menor_ultimo' (usa no máximo degenerescência + 1 cores)
+        e 'aleatoria'. Retorna a lista com a cor (0, 1, ...) de cada vértice.
+        """
+        indptr, indices = self._csr()
+        if ordem == 'natural':
+            sequencia = range(self.vertices)
+        elif ordem == 'maior_grau':
+            sequencia = sorted(range(self.vertices), key=lambda v: indptr[v] - indptr[v + 1])
+        elif ordem == 'menor_ultimo':
+            sequencia = self._ordem_menor_ultimo()[0][::-1]
+        elif ordem == 'aleatoria':
+            sequencia = list(range(self.vertices))
+            random.Random(semente).shuffle(sequencia)
+        else:
+            raise ValueError(f"Ordem de coloração desconhecida: {ordem}")
+
+        cores = [-1] * self.vertices
+        # marca[c] == v indica que a cor c já está em um vizinho de v (evita limpar a lista a cada vértice)
+        marca = [-1] * (max((indptr[v + 1] - indptr[v] for v in range(self.vertices)), default=0) + 1)
+        for v in sequencia:
+            for w in indices[indptr[v]:indptr[v + 1]]:
+                if cores[w] != -1:
+                    marca[cores[w]] = v
+            c = 0
+            while marca[c] == v:
+                c += 1
+            cores[v] = c
+        return cores
+
+    def colorir_dsatur(self):
+        """
+        DSatur (Brélaz): colore primeiro o vértice com mais cores distintas na vizinhança
+        (saturação), desempatando pelo grau. Fila de prioridade com remoção preguiçosa: O((V + E) log V).
+        """
+        indptr, indices = self._csr()
+        cores = [-1] * self.vertices
+        cores_vizinhas = [set() for _ in range(self.vertices)]
+        heap = [(0, indptr[v] - indptr[v + 1], v) for v in range(self.vertices)]
+        heapq.heapify(heap)
+        while heap:
+            saturacao, _, v = heapq.heappop(heap)
+            if cores[v] != -1 or -saturacao != len(cores_vizinhas[v]):
+                continue  # entrada antiga: o vértice já foi colorido ou ganhou saturação
+            usadas = cores_vizinhas[v]
+            c = 0
+            while c in usadas:
+                c += 1
+            cores[v] = c
+            for w in indices[indptr[v]:indptr[v + 1]]:
+                if cores[w] == -1 and c not in cores_vizinhas[w]:
+                    cores_vizinhas[w].add(c)
+                    heapq.heappush(heap, (-len(cores_vizinhas[w]), indptr[w] - indptr[w + 1], w))
+            cores_vizinhas[v] = None  # libera memória
+        return cores
+
+    def colorir_exato(self, tempo_limite=10.0):
+        """
+        Coloração com o menor número de cores por branch-and-bound no estilo DSatur.
+        O limite superior inicial vem do próprio DSatur e o inferior da clique máxima (procurada por até
+        um quarto do tempo); a busca para quando os dois se encontram ou quando o tempo_limite (segundos) se esgota.
+        Retorna (cores, limite_inferior): a coloração é ótima quando max(cores) + 1 == limite_inferior.
+        """
+        melhor = self.colorir_dsatur()
+        if self.vertices == 0:
+            return melhor, 0
+        prazo = time.perf_counter() + tempo_limite
+        k_melhor = max(melhor) + 1
+        clique, _ = self.clique_maxima(tempo_limite / 4)
+        limite_inferior = len(clique)
+        if k_melhor == limite_inferior or self.vertices > LIMITE_VERTICES_COLORACAO_EXATA:
+            return melhor, limite_inferior
+
+        indptr, indices = self._csr()
+        vizinhos = [[w for w in indices[indptr[v]:indptr[v + 1]] if w != v] for v in range(self.vertices)]
+        cores = [-1] * self.vertices
+        # contagem[v][c]: quantos vizinhos de v têm a cor c; saturacao[v]: quantas cores distintas
+        contagem = [[0] * k_melhor for _ in range(self.vertices)]
+        saturacao = [0] * self.vertices
+        estado = {'melhor': melhor, 'k': k_melhor, 'esgotado': False}
+
+        def pintar(v, c):
+            cores[v] = c
+            for w in vizinhos[v]:
+                contagem[w][c] += 1
+                if contagem[w][c] == 1:
+                    saturacao[w] += 1
+
+        def despintar(v, c):
+            cores[v] = -1
+            for w in vizinhos[v]:
+                contagem[w][c] -= 1
+                if contagem[w][c] == 0:
+                    saturacao[w] -= 1
+
+        def ramificar(coloridos, usadas):
+            if time.perf_counter() > prazo:
+                estado['esgotado'] = True
+                return
+            if coloridos == self.vertices:
+                estado['melhor'] = list(cores)
+                estado['k'] = usadas
+                return
+            v = max((x for x in range(self.vertices) if cores[x] == -1),
+                    key=lambda x: (saturacao[x], len(vizinhos[x])))
+            # Cores novas além de 'usadas' são equivalentes entre si: basta tentar uma
+            for c in range(min(usadas + 1, estado['k'] - 1)):
+                if contagem[v][c] == 0:
+                    pintar(v, c)
+                    ramificar(coloridos + 1, max(usadas, c + 1))
+                    despintar(v, c)
+                    if estado['esgotado'] or estado['k'] == limite_inferior:
+                        return
+
+        # A clique recebe cores fixas, o que também elimina as soluções simétricas
+        for c, v in enumerate(clique):
+            pintar(v, c)
+        ramificar(len(clique), len(clique))
+        if not estado['esgotado']:
+            # Busca completa: não existe coloração com menos cores que a melhor encontrada
+            limite_inferior = estado['k']
+        logger.debug("Coloração exata: %d cores, limite inferior %d%s", estado['k'], limite_inferior,
+                     " (tempo esgotado)" if estado['esgotado'] else "")
+        return estado['melhor'], limite_inferior
+
+    # ------------------------------------------------------------ centralidade
+
+    def _pesos_csr(self):
+        """Peso de cada posição do CSR de incidência, ou None se o grafo não for ponderado."""
+        if self.pesos is None:
+            return None
+        self._verificar_pesos_nao_negativos()
+        return self._em_cache('pesos_csr', lambda: array('d', (self.pesos[e] for e in self._csr_incidencia()[2])))
+
+    def _somar_por_fontes(self, funcao, fontes, processos=None):
+        """
+        Executa funcao(indptr, vizinhos, pesos_csr, bloco) para blocos de fontes, em 'processos'
+        processos se pedido. Retorna a lista de pares (bloco, resultado).
+        """
+        indptr, vizinhos, _ = self._csr_incidencia()
+        pesos_csr = self._pesos_csr()
+        if not processos or processos < 2 or len(fontes) < 2 * processos:
+            return [(fontes, funcao(indptr, vizinhos, pesos_csr, fontes))]
+        blocos = [fontes[i::processos] for i in range(processos)]
+        from concurrent.futures import ProcessPoolExecutor  # o multiprocessing só é carregado se usado
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            futuros = [pool.submit(funcao, indptr, vizinhos, pesos_csr, bloco) for bloco in blocos]
+            return [(bloco, futuro.result()) for bloco, futuro in zip(blocos, futuros)]
+
+    @staticmethod
+    def amostras_para_erro(vertices, epsilon, confianca):
+        """
+        Número de fontes amostradas para que, pela desigualdade de Hoeffding com união sobre os
+        vértices, todas as estimativas fiquem a menos de epsilon (na escala [0, 1]) com a confiança dada.
+        """
+        return math.ceil(math.log(2 * max(vertices, 1) / (1 - confianca)) / (2 * epsilon ** 2))
+
+    def centralidade_grau(self):
+        indptr, _ = self._csr()
+        escala = 1 / (self.vertices - 1) if self.vertices > 1 else 1
+        return [(indptr[v + 1] - indptr[v]) * escala for v in range(self.vertices)]
+
+    def _intermediacao(self, fontes, processos):
+        total = [0.0] * self.vertices
+        for _, parcial in self._somar_por_fontes(_dependencias_brandes, fontes, processos):
+            for v, valor in enumerate(parcial):
+                total[v] += valor
+        n = self.vertices
+        # Normalização do networkx para grafos não direcionados, extrapolada das fontes amostradas para todas
+        escala = n / len(fontes) / ((n - 1) * (n - 2)) if n > 2 else 0.5
+        return [valor * escala for valor in total]
+
+    def centralidade_intermediacao(self, processos=None):
+        """Centralidade de intermediação (betweenness) exata pelo algoritmo de Brandes: O(V·E), ou O(V·E log V) com pesos."""
+        return self._em_cache('intermediacao',
+                              lambda: self._intermediacao(list(range(self.vertices)), processos) if self.vertices else [])
+
+    def centralidade_intermediacao_aproximada(self, epsilon=0.05, confianca=0.95, semente=None, processos=None):
+        """
+        Intermediação estimada a partir de fontes sorteadas (Brandes-Pich). Retorna (valores, erro):
+        com a confiança dada, todos os valores estão a menos de 'erro' dos exatos.
+        Se a amostra necessária cobrir o grafo inteiro, calcula o valor exato (erro 0).
+        """
+        def calcular():
+            n = self.vertices
+            amostras = Grafo.amostras_para_erro(n, epsilon, confianca)
+            if amostras >= n:
+                return self.centralidade_intermediacao(processos), 0.0
+            fontes = random.Random(semente).sample(range(n), amostras)
+            # Cada fonte contribui com δ_s(v) / (n - 2) ∈ [0, 1]; o estimador ainda é multiplicado por n / (n - 1)
+            erro = n / (n - 1) * math.sqrt(math.log(2 * n / (1 - confianca)) / (2 * amostras))
+            return self._intermediacao(fontes, processos), erro
+        return self._em_cache(('intermediacao_aproximada', epsilon, confianca, semente), calcular)
+
+    def centralidade_proximidade(self, processos=None):
+        """
+        Centralidade de proximidade (closeness) exata, com a correção de Wasserman-Faust para grafos
+        desconexos (mesma definição do networkx): uma busca a partir de cada vértice.
+        """
+        def calcular():
+            valores = [0.0] * self.vertices
+            for bloco, (por_fonte, _) in self._somar_por_fontes(_somas_distancias, list(range(self.vertices)), processos):
+                for s, (soma, alcancaveis, _) in zip(bloco, por_fonte):
+                    if soma > 0 and self.vertices > 1:
+                        valores[s] = (alcancaveis - 1) / soma * (alcancaveis - 1) / (self.vertices - 1)
+            return valores
+        return self._em_cache('proximidade', calcular)
+
+    def centralidade_proximidade_aproximada(self, epsilon=0.05, confianca=0.95, semente=None, processos=None):
+        """
+        Proximidade estimada por amostragem de fontes (Eppstein-Wang), sorteadas dentro de cada
+        componente conexa. Retorna (valores, erro), em que 'erro' limita, com a confiança dada,
+        o desvio da distância média estimada de cada vértice (epsilon vezes um limite do diâmetro).
+        Componentes menores que a amostra são calculadas de forma exata.
+        """
+        def calcular():
+            n = self.vertices
+            amostras = Grafo.amostras_para_erro(n, epsilon, confianca)
+            if amostras >= n:
+                return self.centralidade_proximidade(processos), 0.0
+            sorteio = random.Random(semente)
+            componentes = self.componentes_conexas()
+            fontes, tamanho_amostra = [], {}
+            for c, componente in enumerate(componentes):
+                tamanho_amostra[c] = min(len(componente), amostras)
+                fontes.extend(sorteio.sample(componente, tamanho_amostra[c]))
+
+            soma = [0.0] * n
+            excentricidade = 0
+            for _, (por_fonte, parcial) in self._somar_por_fontes(_somas_distancias, fontes, processos):
+                excentricidade = max([excentricidade] + [e for _, _, e in por_fonte])
+                for v, valor in enumerate(parcial):
+                    soma[v] += valor
+
+            rotulo = self._rotulos_componentes()
+            valores = [0.0] * n
+            for v in range(n):
+                tamanho = len(componentes[rotulo[v]])
+                # Soma estimada das distâncias de v a todos os vértices da sua componente
+                total = soma[v] * tamanho / tamanho_amostra[rotulo[v]]
+                if total > 0:
+                    valores[v] = (tamanho - 1) / total * (tamanho - 1) / (n - 1)
+            # A excentricidade de qualquer vértice é pelo menos metade do diâmetro
+            exato = all(tamanho_amostra[c] == len(componente) for c, componente in enumerate(componentes))
+            erro = 0.0 if exato else 2 * excentricidade * math.sqrt(math.log(2 * n / (1 - confianca)) / (2 * amostras))
+            return valores, erro
+        return self._em_cache(('proximidade_aproximada', epsilon, confianca, semente), calcular)
+
+    def pagerank(self, amortecimento=0.85, tolerancia=1e-6, max_iteracoes=100):
+        """
+        PageRank por iteração de potência sobre o CSR (pesos das arestas, se houver). Vértices sem
+        vizinhos distribuem sua massa igualmente entre todos. Mesma parada do networkx (erro L1 < V·tolerancia).
+        """
+        def calcular():
+            n = self.vertices
+            if n == 0:
+                return []
+            indptr, vizinhos, _ = self._csr_incidencia()
+            pesos_csr = self._pesos_csr()
+            if pesos_csr is None:
+                saida = [float(indptr[v + 1] - indptr[v]) for v in range(n)]
+            else:
+                saida = [sum(pesos_csr[indptr[v]:indptr[v + 1]]) for v in range(n)]
+            rank = [1.0 / n] * n
+            for _ in range(max_iteracoes):
+                massa_solta = sum(rank[v] for v in range(n) if saida[v] == 0)
+                base = (1 - amortecimento + amortecimento * massa_solta) / n
+                novo = [base] * n
+                for v in range(n):
+                    if saida[v] == 0:
+                        continue
+                    fator = amortecimento * rank[v] / saida[v]
+                    for i in range(indptr[v], indptr[v + 1]):
+                        novo[vizinhos[i]] += fator * (pesos_csr[i] if pesos_csr is not None else 1)
+                erro = sum(abs(a - b) for a, b in zip(novo, rank))
+                rank = novo
+                if erro < n * tolerancia:
+                    return rank
+            logger.warning("PageRank não convergiu em %d iterações", max_iteracoes)
+            return rank
+        return self._em_cache(('pagerank', amortecimento, tolerancia, max_iteracoes), calcular)
+
+    def numeros_nucleo(self):
+        """Decomposição em k-núcleos: o maior k tal que o vértice pertence ao k-núcleo."""
+        return list(self._ordem_menor_ultimo()[1])
+
+    # ----------------------------------------------------------- emparelhamento
+
+    def particao_bipartida(self):
+        """
+        Lado (0 ou 1) de cada vértice por 2-coloração em BFS, ou None se o grafo não for bipartido
+        (tiver ciclo ímpar, incluindo laços).
+        """
+        def calcular():
+            indptr, indices = self._csr()
+            lado = [-1] * self.vertices
+            for inicio in range(self.vertices):
+                if lado[inicio] != -1:
+                    continue
+                lado[inicio] = 0
+                fila = [inicio]
+                for v in fila:
+                    for w in indices[indptr[v]:indptr[v + 1]]:
+                        if lado[w] == -1:
+                            lado[w] = 1 - lado[v]
+                            fila.append(w)
+                        elif lado[w] == lado[v]:
+                            return None
+            return lado
+        return self._em_cache('bipartido', calcular)
+
+    def is_bipartido(self):
+        return self.particao_bipartida() is not None
+
+    def _emparelhamento_guloso(self):
+        # Ponto de partida para os dois algoritmos: vértices de menor grau primeiro
+        indptr, indices = self._csr()
+        par = [-1] * self.vertices
+        for v in sorted(range(self.vertices), key=lambda x: indptr[x + 1] - indptr[x]):
+            if par[v] == -1:
+                for w in indices[indptr[v]:indptr[v + 1]]:
+                    if par[w] == -1 and w != v:
+                        par[v], par[w] = w, v
+                        break
+        return par
+
+    def _hopcroft_karp(self, lado):
+        """Hopcroft-Karp: fases de BFS por camadas seguidas de caminhos aumentantes disjuntos, O(E√V)."""
+        indptr, indices = self._csr()
+        par = self._emparelhamento_guloso()
+        esquerda = [v for v in range(self.vertices) if lado[v] == 0]
+        infinito = self.vertices + 1
+        while True:
+            # BFS a partir dos vértices livres da esquerda
+            dist = [infinito] * self.vertices
+            fila = [u for u in esquerda if par[u] == -1]
+            for u in fila:
+                dist[u] = 0
+            encontrou = False
+            for u in fila:
+                for w in indices[indptr[u]:indptr[u + 1]]:
+                    m = par[w]
+                    if m == -1:
+                        encontrou = True
+                    elif dist[m] == infinito:
+                        dist[m] = dist[u] + 1
+                        fila.append(m)
+            if not encontrou:
+                return par
+
+            # DFS iterativa pelas camadas; proximo[u] é a próxima posição do CSR a tentar
+            proximo = array('l', indptr)
+            for raiz in esquerda:
+                if par[raiz] != -1:
+                    continue
+                pilha = [raiz]
+                while pilha:
+                    u = pilha[-1]
+                    if proximo[u] < indptr[u + 1]:
+                        w = indices[proximo[u]]
+                        proximo[u] += 1
+                        m = par[w]
+                        if m == -1:
+                            # Inverte o caminho: cada u da pilha fica com o w pelo qual desceu
+                            for x in pilha:
+                                y = indices[proximo[x] - 1]
+                                par[x], par[y] = y, x
+                            break
+                        if dist[m] == dist[u] + 1:
+                            pilha.append(m)
+                    else:
+                        dist[u] = infinito  # beco sem saída nesta fase
+                        pilha.pop()
+
+    def _edmonds(self):
+        """Algoritmo das flores (blossom) de Edmonds para grafos gerais, O(V³)."""
+        n = self.vertices
+        indptr, indices = self._csr()
+        par = self._emparelhamento_guloso()
+
+        def buscar_caminho(raiz):
+            usado = [False] * n
+            pai = [-1] * n
+            base = list(range(n))
+
+            def ancestral_comum(a, b):
+                visto = [False] * n
+                while True:
+                    a = base[a]
+                    visto[a] = True
+                    if par[a] == -1:
+                        break
+                    a = pai[par[a]]
+                while True:
+                    b = base[b]
+                    if visto[b]:
+                        return b
+                    b = pai[par[b]]
+
+            def marcar_caminho(v, b, filho, na_flor):
+                while base[v] != b:
+                    na_flor[base[v]] = na_flor[base[par[v]]] = True
+                    pai[v] = filho
+                    filho = par[v]
+                    v = pai[par[v]]
+
+            usado[raiz] = True
+            fila = [raiz]
+            for v in fila:
+                for w in indices[indptr[v]:indptr[v + 1]]:
+                    if base[v] == base[w] or par[v] == w:
+                        continue
+                    if w == raiz or (par[w] != -1 and pai[par[w]] != -1):
+                        # Ciclo ímpar: contrai a flor na sua base
+                        b = ancestral_comum(v, w)
+                        na_flor = [False] * n
+                        marcar_caminho(v, b, w, na_flor)
+                        marcar_caminho(w, b, v, na_flor)
+                        for x in range(n):
+                            if na_flor[base[x]]:
+                                base[x] = b
+                                if not usado[x]:
+                                    usado[x] = True
+                                    fila.append(x)
+                    elif pai[w] == -1:
+                        pai[w] = v
+                        if par[w] == -1:
+                            return w, pai
+                        usado[par[w]] = True
+                        fila.append(par[w])
+            return -1, pai
+
+        for raiz in range(n):
+            if par[raiz] != -1:
+                continue
+            fim, pai = buscar_caminho(raiz)
+            while fim != -1:
+                anterior = par[pai[fim]]
+                par[fim], par[pai[fim]] = pai[fim], fim
+                fim = anterior
+        return par
+
+    def _pares_emparelhamento(self):
+        def calcular():
+            lado = self.particao_bipartida()
+            return self._hopcroft_karp(lado) if lado is not None else self._edmonds()
+        return self._em_cache('emparelhamento', calcular)
+
+    def emparelhamento_maximo(self):
+        """
+        Emparelhamento de cardinalidade máxima: Hopcroft-Karp se o grafo for bipartido,
+        Edmonds (flores) caso contrário. Retorna a lista de arestas escolhidas.
+        """
+        par = self._pares_emparelhamento()
+        return [(u, v) for u, v in self.arestas if u != v and par[u] == v]
+
+    def cobertura_vertices_minima(self):
+        """
+        Cobertura mínima de vértices de um grafo bipartido pelo teorema de Kőnig: a partir dos
+        vértices livres da esquerda, segue caminhos alternantes; a cobertura é a esquerda não
+        alcançada mais a direita alcançada, e tem o tamanho do emparelhamento máximo.
+        """
+        lado = self.particao_bipartida()
+        if lado is None:
+            raise ValueError("A cobertura mínima de vértices só é calculada para grafos bipartidos")
+        par = self._pares_emparelhamento()
+        indptr, indices = self._csr()
+        alcancado = [False] * self.vertices
+        fila = [u for u in range(self.vertices) if lado[u] == 0 and par[u] == -1]
+        for u in fila:
+            alcancado[u] = True
+        for u in fila:
+            # Da esquerda pelas arestas fora do emparelhamento; da direita, pela aresta emparelhada
+            for w in indices[indptr[u]:indptr[u + 1]]:
+                if not alcancado[w] and par[u] != w:
+                    alcancado[w] = True
+                    if par[w] != -1 and not alcancado[par[w]]:
+                        alcancado[par[w]] = True
+                        fila.append(par[w])
+        return [v for v in range(self.vertices) if alcancado[v] != (lado[v] == 0)]
+
+    # ------------------------------------------------------ busca de subgrafos
+
+    def _vizinhancas(self):
+        """(conjunto de vizinhos de cada vértice, sem laços; indicador de laço em cada vértice)."""
+        def calcular():
+            vizinhos = [set() for _ in range(self.vertices)]
+            laco = [False] * self.vertices
+            for u, v in self.arestas:
+                if u == v:
+                    laco[u] = True
+                else:
+                    vizinhos[u].add(v)
+                    vizinhos[v].add(u)
+            return vizinhos, laco
+        return self._em_cache('vizinhancas', calcular)
+
+    def _ordem_vf2(self, vizinhos, raridade=None):
+        """
+        Ordem de associação dos vértices do padrão (VF2++): por componente, começa no vértice mais
+        raro (menos candidatos, se 'raridade' for dada) e de maior grau e segue em camadas de BFS,
+        escolhendo primeiro quem tem mais vizinhos já ordenados.
+        """
+        ordenado = [False] * self.vertices
+        ordem = []
+        conexoes = [0] * self.vertices
+        chave = (lambda v: (raridade[v], -len(vizinhos[v]))) if raridade else (lambda v: -len(vizinhos[v]))
+        for inicio in sorted(range(self.vertices), key=chave):
+            if ordenado[inicio]:
+                continue
+            camada = [inicio]
+            ordenado[inicio] = True
+            while camada:
+                proxima = []
+                pendentes = set(camada)
+                while pendentes:
+                    v = max(pendentes, key=lambda x: (conexoes[x], len(vizinhos[x])))
+                    pendentes.discard(v)
+                    ordem.append(v)
+                    for w in vizinhos[v]:
+                        conexoes[w] += 1
+                        if not ordenado[w]:
+                            ordenado[w] = True
+                            proxima.append(w)
+                camada = proxima
+        return ordem
+
+    def buscar_subgrafo(self, padrao, induzido=False):
+        """
+        Gerador das ocorrências do grafo 'padrao' dentro deste grafo (busca no estilo VF2++).
+        Cada ocorrência é uma tupla em que a posição i traz o vértice deste grafo associado ao
+        vértice i do padrão. Com induzido=True, os vértices escolhidos não podem ter arestas além
+        das do padrão. Ocorrências que diferem por uma simetria do padrão aparecem separadas.
+        """
+        return self._buscar_subgrafo(padrao, induzido)
+
+    def _buscar_subgrafo(self, padrao, induzido, cores_h=None, cores_p=None):
+        # cores_h/cores_p: rótulos que precisam coincidir entre vértices associados (opcional)
+        n = padrao.vertices
+        if n > self.vertices or len(padrao.arestas) > len(self.arestas):
+            return
+        if n == 0:
+            yield ()
+            return
+        vizinhos_h, laco_h = self._vizinhancas()
+        vizinhos_p, laco_p = padrao._vizinhancas()
+        grau_h = [len(viz) for viz in vizinhos_h]
+        grau_p = [len(viz) for viz in vizinhos_p]
+        raridade = None
+        if cores_h is not None:
+            frequencia = {}
+            for c in cores_h:
+                frequencia[c] = frequencia.get(c, 0) + 1
+            raridade = [frequencia.get(c, 0) for c in cores_p]
+        ordem = padrao._ordem_vf2(vizinhos_p, raridade)
+        posicao = [0] * n
+        for i, u in enumerate(ordem):
+            posicao[u] = i
+        # Para cada profundidade: vizinhos do padrão já associados e quantos ainda faltam associar
+        ja_associados = [[q for q in vizinhos_p[u] if posicao[q] < i] for i, u in enumerate(ordem)]
+        faltantes = [grau_p[u] - len(ja_associados[i]) for i, u in enumerate(ordem)]
+
+        mapa = [-1] * n
+        usado = [False] * self.vertices
+        associados_vizinhos = [0] * self.vertices  # vizinhos já usados de cada vértice deste grafo
+
+        def abrir(profundidade):
+            # Candidatos da profundidade: vizinhos do associado de menor grau, ou todos os vértices
+            anteriores[profundidade] = [mapa[q] for q in ja_associados[profundidade]]
+            if anteriores[profundidade]:
+                return iter(min((vizinhos_h[x] for x in anteriores[profundidade]), key=len))
+            return iter(range(self.vertices))
+
+        # Busca em profundidade com pilha explícita (o padrão pode ter milhares de vértices)
+        anteriores = [None] * n
+        candidatos = [None] * n
+        candidatos[0] = abrir(0)
+        profundidade = 0
+        while profundidade >= 0:
+            u = ordem[profundidade]
+            c = mapa[u]
+            if c != -1:
+                # Desfaz a associação anterior nesta profundidade antes de tentar o próximo candidato
+                for w in vizinhos_h[c]:
+                    associados_vizinhos[w] -= 1
+                usado[c] = False
+                mapa[u] = -1
+            anteriores_u, faltando, grau_u, laco_u = anteriores[profundidade], faltantes[profundidade], grau_p[u], laco_p[u]
+            for c in candidatos[profundidade]:
+                if usado[c] or grau_h[c] < grau_u:
+                    continue
+                if cores_h is not None and cores_h[c] != cores_p[u]:
+                    continue
+                if laco_u and not laco_h[c]:
+                    continue
+                if induzido and (laco_h[c] != laco_u or associados_vizinhos[c] != len(anteriores_u)):
+                    continue
+                # Vizinhos ainda livres de c precisam acomodar os vizinhos ainda livres de u
+                if grau_h[c] - associados_vizinhos[c] < faltando:
+                    continue
+                vizinhos_c = vizinhos_h[c]
+                if all(x in vizinhos_c for x in anteriores_u):
+                    break
+            else:
+                profundidade -= 1
+                continue
+            mapa[u] = c
+            usado[c] = True
+            for w in vizinhos_h[c]:
+                associados_vizinhos[w] += 1
+            if profundidade == n - 1:
+                yield tuple(mapa)
+            else:
+                profundidade += 1
+                candidatos[profundidade] = abrir(profundidade)
+
+    def contem_subgrafo(self, padrao, induzido=False):
+        return next(self.buscar_subgrafo(padrao, induzido), None) is not None
+
+    def contar_subgrafos(self, padrao, induzido=False):
+        """Número de ocorrências de 'padrao' (cada simetria do padrão conta separadamente)."""
+        return sum(1 for _ in self.buscar_subgrafo(padrao, induzido))
+
+    # ------------------------------------------------------ árvores geradoras
+
+    def _blocos_biconexos(self):
+        """Blocos (componentes biconexas) como listas de índices de arestas, sem laços (Tarjan iterativo)."""
+        return self._em_cache('blocos_biconexos', self._calcular_blocos_biconexos)
+
+    def _calcular_blocos_biconexos(self):
+        indptr, vizinhos, ids_arestas = self._csr_incidencia()
+        ordem = [-1] * self.vertices
+        low = [0] * self.vertices
+        pilha_arestas = []
+        blocos = []
+        contador = 0
+        for raiz in range(self.vertices):
+            if ordem[raiz] != -1:
+                continue
+            ordem[raiz] = low[raiz] = contador
+            contador += 1
+            pilha = [(raiz, -1, indptr[raiz])]
+            while pilha:
+                v, aresta_pai, i = pilha[-1]
+                if i < indptr[v + 1]:
+                    pilha[-1] = (v, aresta_pai, i + 1)
+                    w, e = vizinhos[i], ids_arestas[i]
+                    if e == aresta_pai or w == v:
+                        continue
+                    if ordem[w] == -1:
+                        pilha_arestas.append(e)
+                        ordem[w] = low[w] = contador
+                        contador += 1
+                        pilha.append((w, e, indptr[w]))
+                    elif ordem[w] < ordem[v]:
+                        pilha_arestas.append(e)  # aresta de retorno
+                        low[v] = min(low[v], ordem[w])
+                else:
+                    pilha.pop()
+                    if pilha:
+                        p = pilha[-1][0]
+                        low[p] = min(low[p], low[v])
+                        if low[v] >= ordem[p]:
+                            # p separa o bloco que contém a aresta (p, v)
+                            bloco = []
+                            while True:
+                                e = pilha_arestas.pop()
+                                bloco.append(e)
+                                if e == aresta_pai:
+                                    break
+                            blocos.append(bloco)
+        return blocos
+
+    def contar_arvores_abrangencia(self, limite_trabalho=LIMITE_TRABALHO_ARVORES_ABRANGENCIA):
+        """
+        Número de árvores geradoras pelo teorema de Kirchhoff: o determinante do Laplaciano sem uma
+        linha e uma coluna. O número é o produto dos valores de cada bloco biconexo, e cada
+        determinante é calculado exatamente, em inteiros, por eliminação esparsa na ordem de grau mínimo.
+        Grafos desconexos têm 0 árvores geradoras.
+
+        O resultado tem milhares de dígitos já em grades de 50 x 50, e o custo cresce com as
+        atualizações da eliminação vezes esse tamanho. Uma eliminação simbólica (barata) estima esse
+        trabalho antes; se passar de limite_trabalho, levanta ValueError em vez de rodar por minutos.
+        limite_trabalho=None desliga a verificação.
+        """
+        def calcular():
+            if self.vertices == 0 or not self.is_conexo():
+                return 0
+            blocos = [[self.arestas[e] for e in bloco] for bloco in self._blocos_biconexos() if len(bloco) > 1]
+            ordens = [Grafo._ordem_eliminacao(arestas) for arestas in blocos]  # pontes contribuem com fator 1
+            trabalho = sum(atualizacoes * bits for _, _, atualizacoes, bits in ordens)
+            if limite_trabalho is not None and trabalho > limite_trabalho:
+                raise ValueError(f"Contagem de árvores geradoras grande demais para calcular exatamente "
+                                 f"(trabalho estimado {trabalho:.2g}, limite {limite_trabalho:.2g})")
+            total = 1
+            for arestas, (removido, ordem, _, _) in zip(blocos, ordens):
+                total *= Grafo._determinante_laplaciano_reduzido(arestas, removido, ordem)
+            return total
+        return self._em_cache('arvores_abrangencia', calcular)
+
+    @staticmethod
+    def _ordem_eliminacao(arestas):
+        """
+        Eliminação simbólica do Laplaciano na ordem de grau mínimo (sempre o vértice com menos
+        vizinhos no grafo já preenchido). Retorna (vértice retirado, ordem de eliminação, número de
+        atualizações do complemento de Schur, bits do limite de Hadamard para o determinante).
+        """
+        # Dicionários (e não conjuntos) para manter a ordem de inserção: ela desempata os graus
+        fora = {}
+        for u, v in arestas:
+            if u != v:
+                fora.setdefault(u, {})[v] = None
+                fora.setdefault(v, {})[u] = None
+        # Retirar o vértice de maior grau é o que menos contribui para o preenchimento
+        removido = max(fora, key=lambda v: len(fora[v]))
+        # Matriz positiva definida: o determinante é no máximo o produto da diagonal (os graus)
+        bits = sum(math.log2(len(vizinhos)) for v, vizinhos in fora.items() if v != removido)
+        for u in fora.pop(removido):
+            del fora[u][removido]
+
+        ordem = []
+        atualizacoes = 0
+        heap = [(len(vizinhos), v) for v, vizinhos in fora.items()]
+        heapq.heapify(heap)
+        while heap:
+            grau, k = heapq.heappop(heap)
+            if k not in fora or grau != len(fora[k]):
+                continue  # já eliminado ou grau desatualizado
+            ordem.append(k)
+            vizinhos = list(fora.pop(k))
+            atualizacoes += len(vizinhos) * (len(vizinhos) + 1) // 2
+            for u in vizinhos:
+                del fora[u][k]
+            # Os vizinhos de k passam a formar uma clique
+            for i, u in enumerate(vizinhos):
+                vizinhos_u = fora[u]
+                for w in vizinhos[i + 1:]:
+                    vizinhos_u[w] = fora[w][u] = None
+                heapq.heappush(heap, (len(vizinhos_u), u))
+        return removido, ordem, atualizacoes, bits
+
+    @staticmethod
+    def _determinante_laplaciano_reduzido(arestas, removido, ordem):
+        """
+        Determinante exato do Laplaciano sem o vértice removido, por eliminação de Bareiss esparsa na
+        ordem dada (de _ordem_eliminacao): depois de eliminar um conjunto S, cada entrada restante é
+        um menor inteiro dividido por det(S), denominador comum a todas. Cada entrada guarda o
+        numerador e o momento em que foi escrita; entradas não tocadas são reescaladas só quando
+        lidas (divisão exata), o que mantém a eliminação esparsa.
+        """
+        # Laplaciano: diagonal e fora da diagonal (dicionários de dicionários) com pares (numerador, momento)
+        diagonal, fora = {}, {}
+        for u, v in arestas:
+            for a, b in ((u, v), (v, u)):
+                diagonal[a] = (diagonal.get(a, (0, 0))[0] + 1, 0)
+                fora.setdefault(a, {})[b] = (-1, 0)
+        for u in fora.pop(removido):
+            del fora[u][removido]
+        del diagonal[removido]
+
+        denominadores = [1]  # det(S) depois de cada eliminação
+
+        def atual(entrada):
+            numerador, momento = entrada
+            if momento == len(denominadores) - 1:
+                return numerador
+            return numerador * denominadores[-1] // denominadores[momento]
+
+        for k in ordem:
+            pivo = atual(diagonal.pop(k))
+            anterior = denominadores[-1]
+            linha = [(u, atual(entrada)) for u, entrada in fora.pop(k).items()]
+            for u, _ in linha:
+                del fora[u][k]
+            momento = len(denominadores)
+            # Complemento de Schur: os vizinhos de k passam a formar uma clique
+            for i, (u, a_uk) in enumerate(linha):
+                diagonal[u] = ((atual(diagonal[u]) * pivo - a_uk * a_uk) // anterior, momento)
+                linha_u = fora[u]
+                for w, a_wk in linha[i + 1:]:
+                    a_uw = atual(linha_u[w]) if w in linha_u else 0
+                    linha_u[w] = fora[w][u] = ((a_uw * pivo - a_uk * a_wk) // anterior, momento)
+            # As entradas acima foram calculadas com o denominador antigo; o novo é o pivô
+            denominadores.append(pivo)
+        return denominadores[-1]
+
+    # ----------------------------------------------------------- confiabilidade
+
+    def arvore_geradora_aleatoria(self, semente=None):
+        """
+        Árvore geradora sorteada com distribuição uniforme pelo algoritmo de Wilson (passeios
+        aleatórios com apagamento de laços). Em grafo desconexo, retorna uma floresta geradora.
+        """
+        sorteio = random.Random(semente).random
+        indptr, indices = self._csr()
+        na_arvore = [False] * self.vertices
+        proximo = [-1] * self.vertices
+        raizes = set()
+        for v, c in enumerate(self._rotulos_componentes()):
+            if c == len(raizes):
+                raizes.add(c)
+                na_arvore[v] = True  # primeiro vértice de cada componente é a raiz
+        arestas = []
+        for inicio in range(self.vertices):
+            # Passeio até a árvore; sobrescrever proximo[u] apaga os laços do passeio
+            u = inicio
+            while not na_arvore[u]:
+                grau = indptr[u + 1] - indptr[u]
+                w = u
+                while w == u:  # ignora laços
+                    w = indices[indptr[u] + int(sorteio() * grau)]
+                proximo[u] = w
+                u = w
+            u = inicio
+            while not na_arvore[u]:
+                na_arvore[u] = True
+                arestas.append((u, proximo[u]))
+                u = proximo[u]
+        return arestas
+
+    def confiabilidade(self, probabilidade_falha, amostras=100000, confianca=0.95, semente=None, processos=None):
+        """
+        Confiabilidade de todos os terminais por Monte Carlo: probabilidade de o grafo continuar
+        conexo quando cada aresta falha de forma independente. probabilidade_falha é um número
+        ou uma lista com a probabilidade de cada aresta. Os cenários são simulados em lotes
+        bit a bit e podem ser divididos entre processos.
+        Retorna (estimativa, (inferior, superior)), com o intervalo de Wilson na confiança dada.
+        """
+        if isinstance(probabilidade_falha, (int, float)):
+            probabilidade_falha = [probabilidade_falha] * len(self.arestas)
+        if len(probabilidade_falha) != len(self.arestas):
+            raise ValueError("É preciso uma probabilidade de falha por aresta")
+        if self.vertices <= 1:
+            return 1.0, (1.0, 1.0)
+        if not self.is_conexo():
+            return 0.0, (0.0, 0.0)
+
+        indptr, vizinhos, ids_arestas = self._csr_incidencia()
+        sobrevivencia = [1 - p for p in probabilidade_falha]
+        lotes = max(1, math.ceil(amostras / LARGURA_LOTE_CONFIABILIDADE))
+        sementes = random.Random(semente)
+        if processos and processos > 1 and lotes > 1:
+            divisao = [lotes // processos + (i < lotes % processos) for i in range(processos)]
+            from concurrent.futures import ProcessPoolExecutor  # o multiprocessing só é carregado se usado
+            with ProcessPoolExecutor(max_workers=processos) as pool:
+                futuros = [pool.submit(_simular_confiabilidade, indptr, vizinhos, ids_arestas, sobrevivencia,
+                                       parte, sementes.getrandbits(64)) for parte in divisao if parte]
+                conexos = sum(f.result() for f in futuros)
+        else:
+            conexos = _simular_confiabilidade(indptr, vizinhos, ids_arestas, sobrevivencia, lotes,
+                                              sementes.getrandbits(64))
+
+        total = lotes * LARGURA_LOTE_CONFIABILIDADE
+        estimativa = conexos / total
+        # Intervalo de Wilson: não degenera quando a estimativa é 0 ou 1
+        z = statistics.NormalDist().inv_cdf((1 + confianca) / 2)
+        centro = (estimativa + z * z / (2 * total)) / (1 + z * z / total)
+        margem = z / (1 + z * z / total) * math.sqrt(estimativa * (1 - estimativa) / total + z * z / (4 * total * total))
+        return estimativa, (max(0.0, centro - margem), min(1.0, centro + margem))
+
+    # ------------------------------------------------------------- comunidades
+
+    def _nivel_modularidade(self):
+        """
+        Grafo no formato usado pela otimização de modularidade: CSR sem laços com pesos,
+        peso dos laços e força (grau ponderado, com laço contando duas vezes) de cada vértice.
+        """
+        def calcular():
+            indptr, vizinhos, ids_arestas = self._csr_incidencia()
+            pesos = self.pesos
+            novo_indptr = [0] * (self.vertices + 1)
+            novos_vizinhos, novos_pesos = [], []
+            laco = [0.0] * self.vertices
+            for v in range(self.vertices):
+                for i in range(indptr[v], indptr[v + 1]):
+                    w = vizinhos[i]
+                    p = pesos[ids_arestas[i]] if pesos is not None else 1
+                    if w == v:
+                        laco[v] += p
+                    else:
+                        novos_vizinhos.append(w)
+                        novos_pesos.append(p)
+                novo_indptr[v + 1] = len(novos_vizinhos)
+            forca = [sum(novos_pesos[novo_indptr[v]:novo_indptr[v + 1]]) + 2 * laco[v] for v in range(self.vertices)]
+            return novo_indptr, novos_vizinhos, novos_pesos, laco, forca
+        return self._em_cache('nivel_modularidade', calcular)
+
+    @staticmethod
+    def _rotulos_por_tamanho(rotulos):
+        # Renumera as comunidades de 0 em diante, da maior para a menor
+        tamanhos = {}
+        for r in rotulos:
+            tamanhos[r] = tamanhos.get(r, 0) + 1
+        nova = {r: i for i, r in enumerate(sorted(tamanhos, key=lambda r: (-tamanhos[r], r)))}
+        return [nova[r] for r in rotulos]
+
+    def modularidade(self, comunidades, resolucao=1.0):
+        """
+        Modularidade de uma partição dos vértices, dada como comunidade de cada vértice
+        ou como lista de grupos de vértices (mesma definição do networkx, com pesos se houver).
+        """
+        if comunidades and not isinstance(comunidades[0], int):
+            rotulo = [-1] * self.vertices
+            for c, grupo in enumerate(comunidades):
+                for v in grupo:
+                    rotulo[v] = c
+            comunidades = rotulo
+        indptr, vizinhos, pesos, laco, forca = self._nivel_modularidade()
+        return Grafo._modularidade_nivel(indptr, vizinhos, pesos, laco, forca, comunidades, resolucao)
+
+    @staticmethod
+    def _modularidade_nivel(indptr, vizinhos, pesos, laco, forca, comunidade, resolucao):
+        m2 = sum(forca)
+        if m2 == 0:
+            return 0.0
+        interno, total = {}, {}
+        for v, c in enumerate(comunidade):
+            total[c] = total.get(c, 0) + forca[v]
+            soma = 2 * laco[v]
+            for i in range(indptr[v], indptr[v + 1]):
+                if comunidade[vizinhos[i]] == c:
+                    soma += pesos[i]
+            interno[c] = interno.get(c, 0) + soma  # cada aresta interna entra duas vezes
+        return sum(interno[c] / m2 - resolucao * (total[c] / m2) ** 2 for c in total)
+
+    def comunidades_propagacao_rotulos(self, semente=None, max_iteracoes=100):
+        """
+        Propagação de rótulos assíncrona: cada vértice, em ordem aleatória, adota o rótulo de maior
+        peso entre os vizinhos (mantém o atual em caso de empate) até nenhum rótulo mudar.
+        """
+        indptr, vizinhos, pesos, _, _ = self._nivel_modularidade()
+        sorteio = random.Random(semente)
+        rotulo = list(range(self.vertices))
+        ordem = list(range(self.vertices))
+        for _ in range(max_iteracoes):
+            sorteio.shuffle(ordem)
+            mudou = False
+            for v in ordem:
+                if indptr[v] == indptr[v + 1]:
+                    continue
+                contagem = {}
+                for i in range(indptr[v], indptr[v + 1]):
+                    r = rotulo[vizinhos[i]]
+                    contagem[r] = contagem.get(r, 0) + pesos[i]
+                maior = max(contagem.values())
+                if contagem.get(rotulo[v]) == maior:
+                    continue
+                rotulo[v] = sorteio.choice([r for r, c in contagem.items() if c == maior])
+                mudou = True
+            if not mudou:
+                break
+        return Grafo._rotulos_por_tamanho(rotulo)
+
+    def comunidades_louvain(self, resolucao=1.0, semente=None):
+        """Comunidades pelo método de Louvain (movimentos locais + agregação, em níveis)."""
+        return self._otimizar_modularidade(False, resolucao, semente)
+
+    def comunidades_leiden(self, resolucao=1.0, semente=None):
+        """
+        Comunidades pelo método de Leiden: como Louvain, mas cada comunidade é refinada antes da
+        agregação, o que garante comunidades conexas.
+        """
+        return self._otimizar_modularidade(True, resolucao, semente)
+
+    def _otimizar_modularidade(self, refinar, resolucao, semente):
+        sorteio = random.Random(semente)
+        indptr, vizinhos, pesos, laco, forca = self._nivel_modularidade()
+        membro = list(range(self.vertices))  # nó do nível atual de cada vértice original
+        particao = list(range(self.vertices))
+        while True:
+            particao = Grafo._mover_localmente(indptr, vizinhos, pesos, forca, particao, resolucao, sorteio)
+            if refinar:
+                agregacao = Grafo._refinar_particao(indptr, vizinhos, pesos, forca, particao, resolucao, sorteio)
+            else:
+                agregacao = particao
+            # Nós do próximo nível: grupos de 'agregacao'; a partição inicial vem de 'particao'
+            numeracao = {}
+            agregacao = [numeracao.setdefault(a, len(numeracao)) for a in agregacao]
+            if len(numeracao) == len(forca):
+                break  # nenhum nó foi unido: convergiu
+            proxima = [0] * len(numeracao)
+            for v, a in enumerate(agregacao):
+                proxima[a] = particao[v]
+            membro = [agregacao[x] for x in membro]
+            indptr, vizinhos, pesos, laco, forca = Grafo._agregar(indptr, vizinhos, pesos, laco, forca, agregacao, len(numeracao))
+            particao = proxima
+        return Grafo._rotulos_por_tamanho([particao[x] for x in membro])
+
+    @staticmethod
+    def _mover_localmente(indptr, vizinhos, pesos, forca, particao, resolucao, sorteio):
+        """
+        Fase de movimentos locais: leva cada nó para a comunidade vizinha de maior ganho de
+        modularidade. Usa uma fila (só revisita vizinhos de nós que mudaram), como no Leiden.
+        """
+        n = len(forca)
+        m2 = sum(forca)
+        if m2 == 0:
+            return list(particao)
+        numeracao = {}
+        comunidade = [numeracao.setdefault(c, len(numeracao)) for c in particao]
+        total = [0] * n
+        for v, c in enumerate(comunidade):
+            total[c] += forca[v]
+        fila = list(range(n))
+        sorteio.shuffle(fila)
+        fila = deque(fila)
+        na_fila = [True] * n
+        fator = resolucao / m2
+        while fila:
+            v = fila.popleft()
+            na_fila[v] = False
+            atual = comunidade[v]
+            inicio, fim = indptr[v], indptr[v + 1]
+            ligacao = {}
+            for w, p in zip(vizinhos[inicio:fim], pesos[inicio:fim]):
+                c = comunidade[w]
+                ligacao[c] = ligacao.get(c, 0) + p
+            forca_v = forca[v]
+            total[atual] -= forca_v
+            melhor = atual
+            melhor_ganho = ligacao.get(atual, 0) - fator * total[atual] * forca_v
+            for c, peso_c in ligacao.items():
+                ganho = peso_c - fator * total[c] * forca_v
+                if ganho > melhor_ganho:
+                    melhor, melhor_ganho = c, ganho
+            total[melhor] += forca_v
+            if melhor != atual:
+                comunidade[v] = melhor
+                for w in vizinhos[inicio:fim]:
+                    if not na_fila[w] and comunidade[w] != melhor:
+                        na_fila[w] = True
+                        fila.append(w)
+        return comunidade
+
+    @staticmethod
+    def _refinar_particao(indptr, vizinhos, pesos, forca, particao, resolucao, sorteio):
+        """
+        Refinamento do Leiden: dentro de cada comunidade, parte de nós isolados e une cada nó
+        ainda isolado ao subgrupo bem conectado de maior ganho (versão gulosa, θ → 0).
+        """
+        n = len(forca)
+        m2 = sum(forca)
+        refinada = list(range(n))
+        if m2 == 0:
+            return refinada
+        fator = resolucao / m2
+        total_comunidade = {}
+        for v, c in enumerate(particao):
+            total_comunidade[c] = total_comunidade.get(c, 0) + forca[v]
+        # Peso das ligações de cada nó com o restante da sua comunidade
+        externo = [0] * n
+        for v in range(n):
+            c = particao[v]
+            inicio, fim = indptr[v], indptr[v + 1]
+            externo[v] = sum(p for w, p in zip(vizinhos[inicio:fim], pesos[inicio:fim]) if particao[w] == c)
+        total_sub = list(forca)
+        externo_sub = list(externo)  # ligação de cada subgrupo com o resto da comunidade
+        sozinho = [True] * n
+        ordem = list(range(n))
+        sorteio.shuffle(ordem)
+        for v in ordem:
+            if not sozinho[v]:
+                continue
+            c = particao[v]
+            K = total_comunidade[c]
+            if externo[v] < fator * forca[v] * (K - forca[v]):
+                continue  # nó mal conectado à comunidade fica sozinho
+            ligacao = {}
+            inicio, fim = indptr[v], indptr[v + 1]
+            for w, p in zip(vizinhos[inicio:fim], pesos[inicio:fim]):
+                if particao[w] == c:
+                    s = refinada[w]
+                    ligacao[s] = ligacao.get(s, 0) + p
+            melhor, melhor_ganho = refinada[v], 0.0
+            for s, peso_s in ligacao.items():
+                if s == refinada[v] or externo_sub[s] < fator * total_sub[s] * (K - total_sub[s]):
+                    continue
+                ganho = peso_s - fator * total_sub[s] * forca[v]
+                if ganho > melhor_ganho:
+                    melhor, melhor_ganho = s, ganho
+            if melhor != refinada[v]:
+                antigo = refinada[v]
+                refinada[v] = melhor
+                sozinho[v] = False
+                sozinho[melhor] = False
+                total_sub[melhor] += forca[v]
+                # Ligações de v com o subgrupo deixam de ser externas a ele
+                externo_sub[melhor] += externo[v] - 2 * ligacao[melhor]
+                total_sub[antigo] = 0
+        return refinada
+
+    @staticmethod
+    def _agregar(indptr, vizinhos, pesos, laco, forca, grupo, quantidade):
+        """Grafo em que cada grupo vira um nó; arestas internas viram laço."""
+        novo_laco = [0.0] * quantidade
+        nova_forca = [0.0] * quantidade
+        ligacoes = [dict() for _ in range(quantidade)]
+        for v in range(len(forca)):
+            g = grupo[v]
+            novo_laco[g] += laco[v]
+            nova_forca[g] += forca[v]
+            ligacao_g = ligacoes[g]
+            inicio, fim = indptr[v], indptr[v + 1]
+            for w, p in zip(vizinhos[inicio:fim], pesos[inicio:fim]):
+                h = grupo[w]
+                if h == g:
+                    novo_laco[g] += p / 2  # cada aresta interna aparece nos dois sentidos
+                else:
+                    ligacao_g[h] = ligacao_g.get(h, 0) + p
+        novo_indptr = [0] * (quantidade + 1)
+        novos_vizinhos, novos_pesos = [], []
+        for g, ligacao_g in enumerate(ligacoes):
+            novos_vizinhos.extend(ligacao_g.keys())
+            novos_pesos.extend(ligacao_g.values())
+            novo_indptr[g + 1] = len(novos_vizinhos)
+        return novo_indptr, novos_vizinhos, novos_pesos, novo_laco, nova_forca
+
+    # ----------------------------------------------------------------- versões
+
+    def _arestas_por_nome(self):
+        """Peso de cada aresta, com a aresta como par ordenado de nomes (chave comum entre versões)."""
+        def calcular():
+            nomes = self.rotulos()
+            pesos = self.pesos
+            arestas = {}
+            for i, (u, v) in enumerate(self.arestas):
+                a, b = nomes[u], nomes[v]
+                arestas[(a, b) if a <= b else (b, a)] = pesos[i] if pesos is not None else 1
+            return arestas
+        return self._em_cache('arestas_por_nome', calcular)
+
+    def _pontes_por_nome(self):
+        def calcular():
+            nomes = self.rotulos()
+            pontes = set()
+            for u, v in self.encontrar_pontes():
+                a, b = nomes[u], nomes[v]
+                pontes.add((a, b) if a <= b else (b, a))
+            return pontes
+        return self._em_cache('pontes_por_nome', calcular)
+
+    def _diametro_em_cache(self):
+        # Desconexo: -1 direto, sem rodar o cálculo de distâncias
+        return self._em_cache('diametro', lambda: self._calcular_diametro() if len(self.componentes_conexas()) == 1 else -1)
+
+    def diferenca(self, anterior):
+        """
+        Diferença de 'anterior' para este grafo, com os vértices alinhados pelo nome: vértices e
+        arestas adicionados e removidos e arestas com peso alterado (O(V + E), por conjuntos de chaves).
+        As arestas são pares (nome, nome) em ordem; sem pesos, cada aresta vale 1.
+        """
+        nomes, nomes_anteriores = set(self.rotulos()), set(anterior.rotulos())
+        arestas, arestas_anteriores = self._arestas_por_nome(), anterior._arestas_por_nome()
+        return {
+            'vertices_adicionados': sorted(nomes - nomes_anteriores),
+            'vertices_removidos': sorted(nomes_anteriores - nomes),
+            'arestas_adicionadas': sorted(arestas.keys() - arestas_anteriores.keys()),
+            'arestas_removidas': sorted(arestas_anteriores.keys() - arestas.keys()),
+            'pesos_alterados': sorted((chave, arestas_anteriores[chave], peso) for chave, peso in arestas.items()
+                                      if chave in arestas_anteriores and arestas_anteriores[chave] != peso),
+        }
+
+    def comparar_metricas(self, anterior, diferenca=None):
+        """
+        Componentes, pontes e diâmetro antes e depois da mudança. Cada métrica só é recalculada
+        quando a diferença pode alterá-la; nos outros casos o valor vem do cache do grafo anterior
+        ou é deduzido da própria diferença. Retorna {métrica: {'antes', 'depois', 'recalculada'}};
+        as pontes trazem também as 'adicionadas' e 'removidas'.
+        """
+        if diferenca is None:
+            diferenca = self.diferenca(anterior)
+        mudou_vertices = bool(diferenca['vertices_adicionados'] or diferenca['vertices_removidos'])
+        adicionadas, removidas = diferenca['arestas_adicionadas'], diferenca['arestas_removidas']
+        mudou_topologia = mudou_vertices or bool(adicionadas or removidas)
+        metricas = {}
+
+        # Componentes. Só com arestas novas, basta unir as componentes antigas ao longo delas;
+        # se nenhuma fecha ciclo (todas unem componentes distintas), as pontes antigas continuam
+        # pontes e as arestas novas também são pontes.
+        componentes_antes = len(anterior.componentes_conexas())
+        arestas_em_floresta = False
+        if not mudou_topologia:
+            componentes_depois, recalculada = componentes_antes, False
+        elif not mudou_vertices and not removidas:
+            rotulos = anterior._rotulos_componentes()
+            ids = {nome: rotulos[v] for v, nome in enumerate(anterior.rotulos())}
+            uniao = UniaoBusca(anterior.vertices)
+            unioes = sum(uniao.unir(ids[a], ids[b]) for a, b in adicionadas)
+            componentes_depois, recalculada = componentes_antes - unioes, False
+            arestas_em_floresta = unioes == len(adicionadas)
+        else:
+            componentes_depois, recalculada = len(self.componentes_conexas()), True
+        metricas['componentes'] = {'antes': componentes_antes, 'depois': componentes_depois, 'recalculada': recalculada}
+
+        # Pontes. Remover só pontes não cria pontes novas: as restantes continuam sendo pontes.
+        pontes_antes = anterior._pontes_por_nome()
+        if not mudou_topologia:
+            pontes_depois, recalculada = pontes_antes, False
+        elif arestas_em_floresta:
+            pontes_depois, recalculada = pontes_antes | set(adicionadas), False
+        elif not mudou_vertices and not adicionadas and pontes_antes.issuperset(removidas):
+            pontes_depois, recalculada = pontes_antes - set(removidas), False
+        else:
+            pontes_depois, recalculada = self._pontes_por_nome(), True
+        metricas['pontes'] = {
+            'antes': len(pontes_antes), 'depois': len(pontes_depois), 'recalculada': recalculada,
+            'adicionadas': sorted(pontes_depois - pontes_antes), 'removidas': sorted(pontes_antes - pontes_depois),
+        }
+
+        # Diâmetro (o mais caro): igual se nada mudou, -1 se o grafo novo é desconexo
+        diametro_antes = anterior._diametro_em_cache()
+        if not mudou_topologia and not diferenca['pesos_alterados']:
+            diametro_depois, recalculada = diametro_antes, False
+        elif componentes_depois != 1:
+            diametro_depois, recalculada = -1, False
+        else:
+            diametro_depois, recalculada = self._diametro_em_cache(), True
+        metricas['diametro'] = {'antes': diametro_antes, 'depois': diametro_depois, 'recalculada': recalculada}
+        return metricas
+
+    def uniao_por_nome(self, outro):
+        """
+        Grafo com os vértices e as arestas dos dois grafos, alinhados pelo nome (para visualizar
+        uma diferença). Os pesos deste grafo têm precedência.
+        """
+        nomes = sorted(set(self.rotulos()) | set(outro.rotulos()))
+        uniao = Grafo(len(nomes))
+        uniao.tabela_nomes = TabelaNomes(nomes)
+        ponderado = self.is_ponderado() or outro.is_ponderado()
+        for origem in (self, outro):
+            for (a, b), peso in origem._arestas_por_nome().items():
+                uniao.adicionar_aresta(uniao.tabela_nomes.id(a), uniao.tabela_nomes.id(b), peso if ponderado else None)
+        return uniao
+
+
+class NomesVista:
+    """Tabela de nomes de uma VistaSubgrafo: consulta a TabelaNomes do grafo original, sem copiá-la."""
+    def __init__(self, vista, tabela):
+        self._vista = vista
+        self._tabela = tabela
+
+    def __len__(self):
+        return self._vista.vertices
+
+    def __iter__(self):
+        return iter(self.nomes())
+
+    def __contains__(self, nome):
+        return nome in self._tabela and self._vista.local(self._tabela.id(nome)) != -1
+
+    def nome(self, id_vertice):
+        return self._tabela.nome(self._vista.original(id_vertice))
+
+    def id(self, nome):
+        id_vertice = self._vista.local(self._tabela.id(nome))
+        if id_vertice == -1:
+            raise KeyError(nome)
+        return id_vertice
+
+    def nomes(self, ids=None):
+        vista = self._vista
+        if ids is None:
+            ids = range(vista.vertices)
+        return self._tabela.nomes(vista.original(v) for v in ids)
+
+    def ids(self, nomes):
+        return [self.id(nome) for nome in nomes]
+
+
+class VistaSubgrafo(Grafo):
+    """
+    Subgrafo que não copia o grafo original: guarda só os ids dos vértices escolhidos (ou
+    nenhum, se são todos) e os índices das arestas filtradas. A lista de arestas da vista, com
+    os vértices renumerados, e seus pesos são montados na primeira vez que um algoritmo os usa,
+    com custo proporcional ao tamanho da vista; vértices e arestas fora dela nunca são tocados.
+    Nomes e pesos continuam sendo os do original.
+
+    Por ser um Grafo, a vista aceita todos os algoritmos. Ela é somente leitura e acompanha o
+    original: se ele ganhar arestas, o cache da vista é descartado e a vista é remontada. Use
+    materializar() para obter um Grafo independente.
+    """
+    def __init__(self, pai, vertices=None, arestas=None, excluir=False):
+        self.pai = pai
+        self._cache = {}
+        self._originais = None
+        self._locais = None
+        if vertices is not None:
+            originais = array('l', sorted(set(vertices)))
+            if originais and not (0 <= originais[0] and originais[-1] < pai.vertices):
+                raise ValueError("Vértice inválido")
+            self._originais = originais
+            # Vista pequena: dict; grande: array com -1 para os vértices de fora
+            if len(originais) * 16 < pai.vertices:
+                self._locais = {v: i for i, v in enumerate(originais)}
+            else:
+                self._locais = array('l', [-1]) * pai.vertices
+                for i, v in enumerate(originais):
+                    self._locais[v] = i
+        self._filtro_arestas = None if arestas is None else array('l', sorted(set(arestas)))
+        self._excluir = excluir
+
+    @property
+    def vertices(self):
+        return self.pai.vertices if self._originais is None else len(self._originais)
+
+    @property
+    def arestas(self):
+        return self._em_cache('arestas_vista', self._montar_arestas)
+
+    @property
+    def pesos(self):
+        return self._em_cache('pesos_vista', self._montar_pesos)
+
+    @property
+    def tabela_nomes(self):
+        if self.pai.tabela_nomes is None:
+            return None
+        return self._em_cache('nomes_vista', lambda: NomesVista(self, self.pai.tabela_nomes))
+
+    def _assinatura(self):
+        # A vista muda quando o original muda
+        return self.pai._assinatura()
+
+    def local(self, original):
+        """Id na vista do vértice original (-1 se ele está fora da vista)."""
+        if self._originais is None:
+            return original if 0 <= original < self.pai.vertices else -1
+        if isinstance(self._locais, dict):
+            return self._locais.get(original, -1)
+        return self._locais[original] if 0 <= original < len(self._locais) else -1
+
+    def original(self, vertice):
+        """Id no grafo original de um vértice da vista."""
+        return vertice if self._originais is None else self._originais[vertice]
+
+    def indices_arestas_originais(self):
+        """Índice no grafo original de cada aresta da vista (None se são todas, na mesma ordem)."""
+        return self._em_cache('ids_arestas_vista', self._montar_ids_arestas)
+
+    def _montar_ids_arestas(self):
+        pai = self.pai
+        if self._originais is None:
+            ids = None
+        elif isinstance(self._locais, dict):
+            # Poucos vértices: só as arestas incidentes a eles, pelo CSR de incidência do original
+            indptr, vizinhos, ids_arestas = pai._csr_incidencia()
+            locais = self._locais
+            ids = []
+            for i, v in enumerate(self._originais):
+                for k in range(indptr[v], indptr[v + 1]):
+                    if locais.get(vizinhos[k], -1) >= i:
+                        ids.append(ids_arestas[k])
+            ids = array('l', sorted(ids))
+        else:
+            locais = self._locais
+            ids = array('l', (i for i, (u, v) in enumerate(pai.arestas) if locais[u] != -1 and locais[v] != -1))
+        filtro = self._filtro_arestas
+        if filtro is None:
+            return ids
+        if ids is None:
+            ids = range(len(pai.arestas))
+        filtro = set(filtro)
+        if self._excluir:
+            return array('l', (i for i in ids if i not in filtro))
+        return array('l', (i for i in ids if i in filtro))
+
+    def _montar_arestas(self):
+        arestas = self.pai.arestas
+        ids = self.indices_arestas_originais()
+        if ids is None:
+            return arestas
+        if self._originais is None:
+            # Mesmos ids de vértices: a vista reaproveita as próprias tuplas do original
+            return [arestas[i] for i in ids]
+        local = self.local
+        return [(local(u), local(v)) for u, v in (arestas[i] for i in ids)]
+
+    def _montar_pesos(self):
+        pesos = self.pai.pesos
+        ids = self.indices_arestas_originais()
+        if pesos is None or ids is None:
+            return pesos
+        return [pesos[i] for i in ids]
+
+    def _csr(self):
+        # Sem filtro nenhum a vista é o próprio original: usa os mesmos arrays
+        if self._originais is None and self.indices_arestas_originais() is None:
+            return self.pai._csr()
+        return super()._csr()
+
+    def _csr_incidencia(self):
+        if self._originais is None and self.indices_arestas_originais() is None:
+            return self.pai._csr_incidencia()
+        return super()._csr_incidencia()
+
+    def adicionar_aresta(self, u, v, peso=None):
+        raise TypeError("Vistas de subgrafo são somente leitura; use materializar()")
+
+    def fundir_vertices(self, v1, v2):
+        raise TypeError("Vistas de subgrafo são somente leitura; use materializar()")
+
+    def para_bytes(self):
+        return self.materializar().para_bytes()
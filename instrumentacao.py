@@ -0,0 +1,203 @@
+# instrumentacao.py
+"""
+Métricas e perfilamento da aplicação: histogramas de latência por rota e por algoritmo,
+contadores de tamanho do grafo e captura opcional de perfil (cProfile ou amostragem)
+pedida pelo cabeçalho X-Profile.
+"""
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from flask import g, jsonify, request, abort
+
+logger = logging.getLogger(__name__)
+
+# Limites superiores dos baldes dos histogramas, em milissegundos
+BALDES_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float('inf'))
+ENDERECOS_LOCAIS = ('127.0.0.1', '::1')
+
+
+def configurar_logging():
+    """Nível definido pela variável LOG_LEVEL (padrão WARNING, ou seja, logs de debug desligados)."""
+    nivel = os.environ.get('LOG_LEVEL', 'WARNING').upper()
+    logging.basicConfig(level=nivel, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+
+class Histograma:
+    def __init__(self):
+        self.contagens = [0] * len(BALDES_MS)
+        self.total = 0
+        self.soma_ms = 0.0
+        self.maximo_ms = 0.0
+
+    def registrar(self, ms):
+        for i, limite in enumerate(BALDES_MS):
+            if ms <= limite:
+                self.contagens[i] += 1
+                break
+        self.total += 1
+        self.soma_ms += ms
+        self.maximo_ms = max(self.maximo_ms, ms)
+
+    def como_dict(self):
+        return {
+            'total': self.total,
+            'media_ms': round(self.soma_ms / self.total, 3) if self.total else 0.0,
+            'maximo_ms': round(self.maximo_ms, 3),
+            # Lista (e não dict) para manter a ordem dos baldes no JSON
+            'baldes': [{'ate_ms': '+inf' if limite == float('inf') else limite, 'contagem': c}
+                       for limite, c in zip(BALDES_MS, self.contagens)],
+        }
+
+
+class Metricas:
+    """Registro em memória, por processo, protegido por lock (gunicorn pode usar threads)."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histogramas = {}
+        self.contadores = Counter()
+        self.medidores = {}
+
+    def observar(self, nome, ms):
+        with self._lock:
+            if nome not in self.histogramas:
+                self.histogramas[nome] = Histograma()
+            self.histogramas[nome].registrar(ms)
+
+    def incrementar(self, nome, valor=1):
+        with self._lock:
+            self.contadores[nome] += valor
+
+    def definir(self, nome, valor):
+        with self._lock:
+            self.medidores[nome] = valor
+
+    def como_dict(self):
+        with self._lock:
+            return {
+                'histogramas': {nome: h.como_dict() for nome, h in sorted(self.histogramas.items())},
+                'contadores': dict(self.contadores),
+                'medidores': dict(self.medidores),
+            }
+
+
+metricas = Metricas()
+
+
+@contextmanager
+def medir(nome_algoritmo):
+    """Cronometra um trecho e registra no histograma 'algoritmo:<nome>'."""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        ms = (time.perf_counter() - inicio) * 1000
+        metricas.observar(f"algoritmo:{nome_algoritmo}", ms)
+        logger.debug("%s levou %.2f ms", nome_algoritmo, ms)
+
+
+def registrar_grafo(grafo):
+    """Atualiza os medidores de tamanho do grafo carregado."""
+    if grafo is None:
+        metricas.definir('grafo_vertices', 0)
+        metricas.definir('grafo_arestas', 0)
+        return
+    metricas.definir('grafo_vertices', grafo.vertices)
+    metricas.definir('grafo_arestas', len(grafo.arestas))
+    metricas.incrementar('grafos_carregados')
+
+
+class AmostradorPerfil:
+    """
+    Perfilador por amostragem: uma thread lê a pilha da thread da requisição a cada
+    'intervalo' segundos. O resultado sai no formato de pilhas colapsadas (flamegraph.pl).
+    """
+    def __init__(self, thread_id, intervalo=0.005):
+        self.thread_id = thread_id
+        self.intervalo = intervalo
+        self.pilhas = Counter()
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._executar, daemon=True)
+
+    def iniciar(self):
+        self._thread.start()
+
+    def _executar(self):
+        while not self._parar.wait(self.intervalo):
+            frame = sys._current_frames().get(self.thread_id)
+            pilha = []
+            while frame is not None:
+                codigo = frame.f_code
+                pilha.append(f"{os.path.basename(codigo.co_filename)}:{codigo.co_name}")
+                frame = frame.f_back
+            if pilha:
+                self.pilhas[';'.join(reversed(pilha))] += 1
+
+    def parar(self):
+        self._parar.set()
+        self._thread.join()
+        return '\n'.join(f"{pilha} {n}" for pilha, n in self.pilhas.most_common())
+
+
+def _perfil_permitido():
+    return os.environ.get('PERFIL_HABILITADO') == '1' or request.remote_addr in ENDERECOS_LOCAIS
+
+
+def instrumentar_app(app, diretorio_perfis):
+    """
+    Registra os ganchos de tempo por rota e o endpoint /metricas.
+    'X-Profile: cprofile' ou 'X-Profile: amostragem' salva o perfil da requisição em diretorio_perfis.
+    """
+    os.makedirs(diretorio_perfis, exist_ok=True)
+
+    @app.before_request
+    def _iniciar_medicao():
+        g.inicio_requisicao = time.perf_counter()
+        modo = request.headers.get('X-Profile', '').lower()
+        if modo and _perfil_permitido():
+            if modo == 'amostragem':
+                g.perfilador = AmostradorPerfil(threading.get_ident())
+                g.perfilador.iniciar()
+            else:
+                g.perfilador = cProfile.Profile()
+                g.perfilador.enable()
+
+    @app.after_request
+    def _finalizar_medicao(resposta):
+        inicio = g.pop('inicio_requisicao', None)
+        if inicio is not None:
+            ms = (time.perf_counter() - inicio) * 1000
+            metricas.observar(f"rota:{request.endpoint}", ms)
+            metricas.incrementar(f"status:{resposta.status_code}")
+
+        perfilador = g.pop('perfilador', None)
+        if perfilador is not None:
+            nome = f"perfil_{request.endpoint}_{int(time.time() * 1000)}"
+            if isinstance(perfilador, AmostradorPerfil):
+                caminho = os.path.join(diretorio_perfis, nome + '.txt')
+                with open(caminho, 'w', encoding='utf-8') as f:
+                    f.write(perfilador.parar())
+            else:
+                perfilador.disable()
+                caminho = os.path.join(diretorio_perfis, nome + '.prof')
+                perfilador.dump_stats(caminho)
+                if logger.isEnabledFor(logging.DEBUG):
+                    texto = io.StringIO()
+                    pstats.Stats(perfilador, stream=texto).sort_stats('cumulative').print_stats(15)
+                    logger.debug("Perfil de %s:\n%s", request.endpoint, texto.getvalue())
+            resposta.headers['X-Profile-File'] = os.path.basename(caminho)
+        return resposta
+
+    @app.route("/metricas")
+    def exibir_metricas():
+        # Exposto apenas para acesso local
+        if request.remote_addr not in ENDERECOS_LOCAIS:
+            abort(404)
+        return jsonify(metricas.como_dict())
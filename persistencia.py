@@ -0,0 +1,179 @@
+# persistencia.py
+"""
+Catálogo local de grafos em SQLite. Cada upload vira uma versão de um grafo (identificado pelo
+nome do arquivo) com o snapshot binário de Grafo.para_bytes e as métricas já calculadas, de
+modo que o grafo volta por id sem reprocessar o texto. Quando o total de snapshots passa da
+cota, as versões usadas há mais tempo são removidas (a mais recente de cada grafo fica por último).
+
+Cada operação abre sua própria conexão: o catálogo pode ser criado antes do fork dos workers
+do gunicorn (--preload) e usado por vários processos ao mesmo tempo.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+from grafo import Grafo
+
+logger = logging.getLogger(__name__)
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS grafos (
+    id INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL UNIQUE,
+    criado_em REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS versoes (
+    id INTEGER PRIMARY KEY,
+    grafo_id INTEGER NOT NULL REFERENCES grafos(id),
+    numero INTEGER NOT NULL,
+    criado_em REAL NOT NULL,
+    ultimo_acesso REAL NOT NULL,
+    vertices INTEGER NOT NULL,
+    arestas INTEGER NOT NULL,
+    tamanho INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    metricas TEXT NOT NULL DEFAULT '{}',
+    dados BLOB NOT NULL,
+    UNIQUE (grafo_id, numero)
+);
+CREATE INDEX IF NOT EXISTS versoes_acesso ON versoes (ultimo_acesso);
+"""
+
+
+class CatalogoGrafos:
+    def __init__(self, diretorio, cota_bytes=200 * 1024 * 1024):
+        os.makedirs(diretorio, exist_ok=True)
+        self.caminho = os.path.join(diretorio, 'catalogo.sqlite')
+        self.cota_bytes = cota_bytes
+        with closing(self._conectar()) as conexao:
+            # auto_vacuum só vale se definido antes de criar as tabelas
+            conexao.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conexao.executescript(ESQUEMA)
+
+    def _conectar(self):
+        conexao = sqlite3.connect(self.caminho, timeout=30)
+        conexao.row_factory = sqlite3.Row
+        return conexao
+
+    def salvar(self, nome, grafo):
+        """
+        Salva o grafo como nova versão de 'nome'. Se for igual à última versão, nada é gravado.
+        Retorna (id do grafo, número da versão).
+        """
+        dados = grafo.para_bytes()
+        resumo = hashlib.sha256(dados).hexdigest()
+        metricas = json.dumps(grafo.metricas_em_cache())
+        agora = time.time()
+        with closing(self._conectar()) as conexao, conexao:
+            conexao.execute("INSERT OR IGNORE INTO grafos (nome, criado_em) VALUES (?, ?)", (nome, agora))
+            grafo_id = conexao.execute("SELECT id FROM grafos WHERE nome = ?", (nome,)).fetchone()['id']
+            ultima = conexao.execute(
+                "SELECT id, numero, hash FROM versoes WHERE grafo_id = ? ORDER BY numero DESC LIMIT 1", (grafo_id,)
+            ).fetchone()
+            if ultima is not None and ultima['hash'] == resumo:
+                conexao.execute("UPDATE versoes SET ultimo_acesso = ? WHERE id = ?", (agora, ultima['id']))
+                return grafo_id, ultima['numero']
+            numero = ultima['numero'] + 1 if ultima is not None else 1
+            cursor = conexao.execute(
+                "INSERT INTO versoes (grafo_id, numero, criado_em, ultimo_acesso, vertices, arestas, tamanho, hash, metricas, dados) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (grafo_id, numero, agora, agora, grafo.vertices, len(grafo.arestas), len(dados), resumo, metricas, dados))
+            self._aplicar_cota(conexao, preservar=cursor.lastrowid)
+        logger.info("Grafo %r salvo como versão %d (%d bytes)", nome, numero, len(dados))
+        return grafo_id, numero
+
+    def carregar(self, grafo_id, numero=None):
+        """Grafo de uma versão (a última, se numero for None), com as métricas salvas no cache."""
+        with closing(self._conectar()) as conexao, conexao:
+            if numero is None:
+                linha = conexao.execute(
+                    "SELECT id, dados, metricas FROM versoes WHERE grafo_id = ? ORDER BY numero DESC LIMIT 1", (grafo_id,)
+                ).fetchone()
+            else:
+                linha = conexao.execute(
+                    "SELECT id, dados, metricas FROM versoes WHERE grafo_id = ? AND numero = ?", (grafo_id, numero)
+                ).fetchone()
+            if linha is None:
+                raise KeyError(f"Versão não encontrada: grafo {grafo_id}, versão {numero}")
+            conexao.execute("UPDATE versoes SET ultimo_acesso = ? WHERE id = ?", (time.time(), linha['id']))
+        grafo = Grafo.de_bytes(linha['dados'])
+        grafo.restaurar_metricas(json.loads(linha['metricas']))
+        return grafo
+
+    def atualizar_metricas(self, grafo_id, numero, grafo):
+        """Grava as métricas que o grafo calculou depois de salvo (só as novas chaves mudam algo)."""
+        metricas = grafo.metricas_em_cache()
+        if not metricas:
+            return
+        with closing(self._conectar()) as conexao, conexao:
+            linha = conexao.execute(
+                "SELECT id, metricas FROM versoes WHERE grafo_id = ? AND numero = ?", (grafo_id, numero)
+            ).fetchone()
+            if linha is None:
+                return
+            salvas = json.loads(linha['metricas'])
+            if metricas.keys() <= salvas.keys():
+                return
+            salvas.update(metricas)
+            conexao.execute("UPDATE versoes SET metricas = ? WHERE id = ?", (json.dumps(salvas), linha['id']))
+
+    def listar(self, limite=50):
+        """Grafos salvos, do usado mais recentemente ao mais antigo, cada um com suas versões."""
+        with closing(self._conectar()) as conexao:
+            linhas = conexao.execute(
+                "SELECT g.id, g.nome, v.numero, v.criado_em, v.vertices, v.arestas, v.tamanho, v.ultimo_acesso "
+                "FROM grafos g JOIN versoes v ON v.grafo_id = g.id ORDER BY g.id, v.numero DESC"
+            ).fetchall()
+        grafos = {}
+        for linha in linhas:
+            grafo = grafos.setdefault(linha['id'], {'id': linha['id'], 'nome': linha['nome'], 'versoes': [], 'ultimo_acesso': 0})
+            grafo['versoes'].append({chave: linha[chave] for chave in ('numero', 'criado_em', 'vertices', 'arestas', 'tamanho')})
+            grafo['ultimo_acesso'] = max(grafo['ultimo_acesso'], linha['ultimo_acesso'])
+        return sorted(grafos.values(), key=lambda g: -g['ultimo_acesso'])[:limite]
+
+    def remover(self, grafo_id, numero=None):
+        """Remove uma versão (ou todas, se numero for None)."""
+        with closing(self._conectar()) as conexao, conexao:
+            if numero is None:
+                conexao.execute("DELETE FROM versoes WHERE grafo_id = ?", (grafo_id,))
+            else:
+                conexao.execute("DELETE FROM versoes WHERE grafo_id = ? AND numero = ?", (grafo_id, numero))
+            self._remover_grafos_vazios(conexao)
+        self._compactar()
+
+    def tamanho_total(self):
+        with closing(self._conectar()) as conexao:
+            return conexao.execute("SELECT COALESCE(SUM(tamanho), 0) FROM versoes").fetchone()[0]
+
+    def _aplicar_cota(self, conexao, preservar):
+        """Remove versões até caber na cota: primeiro as que não são a última do seu grafo, por uso (LRU)."""
+        total = conexao.execute("SELECT COALESCE(SUM(tamanho), 0) FROM versoes").fetchone()[0]
+        if total <= self.cota_bytes:
+            return
+        candidatas = conexao.execute(
+            "SELECT v.id, v.tamanho, v.numero = (SELECT MAX(numero) FROM versoes WHERE grafo_id = v.grafo_id) AS ultima "
+            "FROM versoes v WHERE v.id != ? ORDER BY ultima, v.ultimo_acesso", (preservar,)
+        ).fetchall()
+        removidas = []
+        for candidata in candidatas:
+            if total <= self.cota_bytes:
+                break
+            removidas.append((candidata['id'],))
+            total -= candidata['tamanho']
+        conexao.executemany("DELETE FROM versoes WHERE id = ?", removidas)
+        self._remover_grafos_vazios(conexao)
+        logger.info("Cota do catálogo: %d versão(ões) removida(s)", len(removidas))
+        if removidas:
+            conexao.execute("PRAGMA incremental_vacuum")
+
+    @staticmethod
+    def _remover_grafos_vazios(conexao):
+        conexao.execute("DELETE FROM grafos WHERE id NOT IN (SELECT DISTINCT grafo_id FROM versoes)")
+
+    def _compactar(self):
+        with closing(self._conectar()) as conexao:
+            conexao.execute("PRAGMA incremental_vacuum")
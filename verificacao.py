@@ -0,0 +1,702 @@
+# verificacao.py
+"""
+Testes diferenciais dos algoritmos do Grafo: gera grafos pequenos aleatórios e compara cada
+algoritmo rápido com uma referência independente (a versão exaustiva mantida no Grafo, o
+networkx ou uma busca por força bruta/programação dinâmica sobre subconjuntos). Quando uma
+propriedade falha, o grafo é reduzido (remove arestas, vértices e pesos enquanto a falha
+continua) e o relatório mostra o menor contraexemplo encontrado.
+
+Exemplos:
+    python verificacao.py --casos 5000
+    python verificacao.py --propriedades isomorfismo diametro --casos 2000 --processos 4
+    python verificacao.py --semente 7 --caso 1234          # reproduz um caso do relatório
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+
+import networkx as nx
+
+import exportacao
+from grafo import Grafo
+
+# Tamanho máximo dos grafos gerados: as referências por força bruta são exponenciais
+MAX_VERTICES = 9
+# Fração dos casos com pesos nas arestas
+PROBABILIDADE_PONDERADO = 0.3
+# A referência exaustiva de cortes só roda quando há até tantas combinações a testar
+LIMITE_COMBINACOES_CORTE = 3000
+# sao_isomorfos_exaustivo percorre as n! permutações: só é comparado até este número de vértices
+MAX_VERTICES_PERMUTACOES = 7
+# Tempo dado às buscas com tempo_limite; nos tamanhos gerados elas terminam muito antes
+TEMPO_LIMITE = 5.0
+# Casos por tarefa enviada aos processos
+CASOS_POR_LOTE = 50
+
+
+def gerar_caso(sorteio, max_vertices=MAX_VERTICES):
+    """Grafo aleatório como (vértices, arestas, pesos): denso, esparso ou árvore com algumas arestas a mais."""
+    n = sorteio.randint(1, max_vertices)
+    pares = [(u, v) for u in range(n) for v in range(u + 1, n)]
+    if sorteio.random() < 0.6:
+        p = sorteio.choice((0.15, 0.3, 0.5, 0.7, 0.9))
+        arestas = [par for par in pares if sorteio.random() < p]
+    else:
+        arestas = {(sorteio.randrange(v), v) for v in range(1, n)}
+        arestas |= set(sorteio.sample(pares, min(len(pares), sorteio.randint(0, 3))))
+        arestas = sorted(arestas)
+    sorteio.shuffle(arestas)
+    arestas = [(u, v) if sorteio.random() < 0.5 else (v, u) for u, v in arestas]
+    pesos = [sorteio.randint(1, 9) for _ in arestas] if sorteio.random() < PROBABILIDADE_PONDERADO else None
+    return n, arestas, pesos
+
+
+def montar(caso):
+    vertices, arestas, pesos = caso
+    grafo = Grafo(vertices)
+    for i, (u, v) in enumerate(arestas):
+        grafo.adicionar_aresta(u, v, None if pesos is None else pesos[i])
+    return grafo
+
+
+def _nx(grafo, ponderado=True):
+    g = nx.Graph()
+    g.add_nodes_from(range(grafo.vertices))
+    for i, (u, v) in enumerate(grafo.arestas):
+        g.add_edge(u, v, weight=grafo.peso(i) if ponderado else 1)
+    return g
+
+
+def _chave(u, v):
+    return (u, v) if u <= v else (v, u)
+
+
+def _adjacencia_bits(grafo):
+    bits = [0] * grafo.vertices
+    for u, v in grafo.arestas:
+        if u != v:
+            bits[u] |= 1 << v
+            bits[v] |= 1 << u
+    return bits
+
+
+def _tamanhos_ciclos(grafo):
+    """
+    Tamanhos de todos os ciclos simples (>= 3 vértices), por programação dinâmica sobre subconjuntos:
+    caminhos que saem do menor vértice do conjunto e só passam por vértices maiores.
+    """
+    n = grafo.vertices
+    vizinhos = _adjacencia_bits(grafo)
+    tamanhos = set()
+    for s in range(n):
+        # alcance[conjunto]: vértices onde pode terminar um caminho que sai de s e cobre o conjunto
+        alcance = {1 << s: 1 << s}
+        for mascara in range(1 << s, 1 << n, 2 << s):
+            pontas = alcance.get(mascara)
+            if not pontas:
+                continue
+            tamanho = bin(mascara).count('1')
+            if tamanho >= 3 and pontas & vizinhos[s]:
+                tamanhos.add(tamanho)
+            for v in range(s, n):
+                if pontas >> v & 1:
+                    livres = vizinhos[v] & ~mascara & ~((1 << (s + 1)) - 1)
+                    while livres:
+                        bit = livres & -livres
+                        livres ^= bit
+                        alcance[mascara | bit] = alcance.get(mascara | bit, 0) | bit
+    return tamanhos
+
+
+def _numero_cromatico(grafo):
+    vizinhos = _adjacencia_bits(grafo)
+    n = grafo.vertices
+    for k in range(1, n + 1):
+        cores = [-1] * n
+
+        def colorir(v):
+            if v == n:
+                return True
+            usadas = {cores[w] for w in range(v) if vizinhos[v] >> w & 1}
+            for c in range(k):
+                if c not in usadas:
+                    cores[v] = c
+                    if colorir(v + 1):
+                        return True
+            cores[v] = -1
+            return False
+        if colorir(0):
+            return k
+    return 0
+
+
+def _caixeiro_referencia(distancias):
+    """Custo da rota ótima (programação dinâmica sobre subconjuntos, escrita à parte do módulo caixeiro)."""
+    n = len(distancias)
+    if n == 1:
+        return 0
+    custo = {(1, 0): 0}
+    for mascara in range(1, 1 << n, 2):
+        for j in range(n):
+            atual = custo.get((mascara, j))
+            if atual is None:
+                continue
+            for k in range(1, n):
+                if not mascara >> k & 1:
+                    chave = (mascara | 1 << k, k)
+                    if atual + distancias[j][k] < custo.get(chave, math.inf):
+                        custo[chave] = atual + distancias[j][k]
+    completo = (1 << n) - 1
+    return min(custo[(completo, j)] + distancias[j][0] for j in range(1, n))
+
+
+def _corte_valido(grafo, corte, tamanho=None):
+    """None se 'corte' tem arestas distintas do grafo (e o tamanho pedido) e desconecta o grafo."""
+    chaves = [_chave(u, v) for u, v in corte]
+    if len(set(chaves)) != len(chaves) or not set(chaves) <= grafo._chaves_arestas():
+        return f"corte com arestas repetidas ou inexistentes: {corte}"
+    if tamanho is not None and len(corte) != tamanho:
+        return f"corte com {len(corte)} arestas, pedido {tamanho}"
+    restante = _nx(grafo)
+    restante.remove_edges_from(corte)
+    if nx.is_connected(restante):
+        return f"corte {corte} não desconecta o grafo"
+    return None
+
+
+def _ciclo_valido(grafo, ciclo, tamanho):
+    if len(ciclo) != tamanho or len(set(ciclo)) != tamanho:
+        return f"ciclo {ciclo} não tem {tamanho} vértices distintos"
+    chaves = grafo._chaves_arestas()
+    if not all(_chave(a, b) in chaves for a, b in zip(ciclo, ciclo[1:] + ciclo[:1])):
+        return f"ciclo {ciclo} usa arestas inexistentes"
+    return None
+
+
+# ---------------------------------------------------------------- propriedades
+# Cada propriedade recebe (grafo, sorteio) e retorna None ou a descrição da divergência.
+
+def _isomorfismo(grafo, sorteio):
+    permutacao = list(range(grafo.vertices))
+    sorteio.shuffle(permutacao)
+    copia = montar((grafo.vertices, [(permutacao[u], permutacao[v]) for u, v in grafo.arestas], None))
+    if not grafo.sao_isomorfos(copia):
+        return f"cópia com os vértices permutados por {permutacao} não foi reconhecida como isomorfa"
+    # Move uma aresta: às vezes continua isomorfo, às vezes não
+    ausentes = [(u, v) for u in range(grafo.vertices) for v in range(u + 1, grafo.vertices)
+                if _chave(u, v) not in grafo._chaves_arestas()]
+    if not grafo.arestas or not ausentes:
+        return None
+    arestas = list(grafo.arestas)
+    arestas[sorteio.randrange(len(arestas))] = sorteio.choice(ausentes)
+    outro = montar((grafo.vertices, arestas, None))
+    obtido, esperado = grafo.sao_isomorfos(outro), nx.is_isomorphic(_nx(grafo), _nx(outro))
+    if obtido != esperado:
+        return f"sao_isomorfos={obtido}, networkx={esperado} com {sorted(outro.arestas)}"
+    return None
+
+
+def _isomorfismo_exaustivo(grafo, sorteio):
+    if grafo.vertices > MAX_VERTICES_PERMUTACOES:
+        return None
+    permutacao = list(range(grafo.vertices))
+    sorteio.shuffle(permutacao)
+    arestas = [(permutacao[u], permutacao[v]) for u, v in grafo.arestas]
+    # Metade das vezes troca uma aresta por um par ausente, o que costuma quebrar o isomorfismo
+    ausentes = [(u, v) for u in range(grafo.vertices) for v in range(u + 1, grafo.vertices)
+                if _chave(u, v) not in {_chave(a, b) for a, b in arestas}]
+    if arestas and ausentes and sorteio.random() < 0.5:
+        arestas[sorteio.randrange(len(arestas))] = sorteio.choice(ausentes)
+    outro = montar((grafo.vertices, arestas, None))
+    rapido, exaustivo = grafo.sao_isomorfos(outro), grafo.sao_isomorfos_exaustivo(outro)
+    if rapido != exaustivo:
+        return f"sao_isomorfos={rapido}, sao_isomorfos_exaustivo={exaustivo} com {sorted(outro.arestas)}"
+    return None
+
+
+def _menor_corte(grafo, sorteio):
+    # As convenções para grafos desconexos ou com um vértice diferem entre as versões; só o caso conexo é comparado
+    if grafo.vertices < 2 or not grafo.is_conexo():
+        return None
+    esperado = nx.edge_connectivity(_nx(grafo))
+    corte = grafo.encontrar_menor_corte()
+    if len(corte) != esperado:
+        return f"encontrar_menor_corte tem {len(corte)} arestas, networkx λ={esperado}"
+    erro = _corte_valido(grafo, corte)
+    if erro:
+        return f"encontrar_menor_corte: {erro}"
+    if math.comb(len(grafo.arestas), esperado) <= LIMITE_COMBINACOES_CORTE:
+        exaustivo = grafo.encontrar_menor_corte_exaustivo()
+        if exaustivo is None or len(exaustivo) != esperado:
+            return f"encontrar_menor_corte_exaustivo={exaustivo}, networkx λ={esperado}"
+    return None
+
+
+def _corte_de_tamanho(grafo, sorteio):
+    if grafo.vertices < 2 or not grafo.arestas:
+        return None
+    tamanho = sorteio.randint(1, len(grafo.arestas))
+    lam = nx.edge_connectivity(_nx(grafo))
+    corte = grafo.encontrar_corte_de_tamanho(tamanho)
+    if (corte is not None) != (lam <= tamanho):
+        return f"encontrar_corte_de_tamanho({tamanho})={corte}, networkx λ={lam}"
+    if corte is not None:
+        erro = _corte_valido(grafo, corte, tamanho)
+        if erro:
+            return f"encontrar_corte_de_tamanho({tamanho}): {erro}"
+    if math.comb(len(grafo.arestas), tamanho) <= LIMITE_COMBINACOES_CORTE:
+        exaustivo = grafo.encontrar_corte_de_tamanho_exaustivo(tamanho)
+        if (exaustivo is not None) != (corte is not None):
+            return f"encontrar_corte_de_tamanho({tamanho})={corte}, versão exaustiva={exaustivo}"
+    return None
+
+
+def _ciclos(grafo, sorteio):
+    tamanhos = _tamanhos_ciclos(grafo)
+    for tamanho in range(3, grafo.vertices + 1):
+        ciclo = grafo.encontrar_ciclo(tamanho)
+        if (ciclo is not None) != (tamanho in tamanhos):
+            return f"encontrar_ciclo({tamanho})={ciclo}, referência: ciclos de tamanhos {sorted(tamanhos)}"
+        if ciclo is not None:
+            erro = _ciclo_valido(grafo, ciclo, tamanho)
+            if erro:
+                return f"encontrar_ciclo({tamanho}): {erro}"
+    menor = grafo.encontrar_menor_ciclo()
+    cintura = nx.girth(_nx(grafo))
+    if (menor[0] if menor else math.inf) != cintura:
+        return f"encontrar_menor_ciclo={menor}, networkx girth={cintura}"
+    if menor:
+        erro = _ciclo_valido(grafo, list(menor[1]), menor[0])
+        if erro:
+            return f"encontrar_menor_ciclo: {erro}"
+    return None
+
+
+def _ciclos_exaustivo(grafo, sorteio):
+    for tamanho in range(3, grafo.vertices + 1):
+        rapido, exaustivo = grafo.encontrar_ciclo(tamanho), grafo._encontrar_ciclo_exaustivo(tamanho)
+        if (rapido is None) != (exaustivo is None):
+            return f"encontrar_ciclo({tamanho})={rapido}, _encontrar_ciclo_exaustivo={exaustivo}"
+    return None
+
+
+def _hamiltoniano(grafo, sorteio):
+    esperado = grafo.vertices >= 3 and grafo.vertices in _tamanhos_ciclos(grafo)
+    ciclo, motivo = grafo.ciclo_hamiltoniano(TEMPO_LIMITE)
+    if (ciclo is not None) != esperado:
+        return f"ciclo_hamiltoniano={ciclo} ({motivo}), referência: {'hamiltoniano' if esperado else 'não hamiltoniano'}"
+    if ciclo is not None:
+        erro = _ciclo_valido(grafo, list(ciclo), grafo.vertices)
+        if erro:
+            return f"ciclo_hamiltoniano: {erro}"
+    if grafo.is_hamiltoniano(TEMPO_LIMITE)[0] != esperado:
+        return "is_hamiltoniano diverge de ciclo_hamiltoniano"
+    return None
+
+
+def _diametro(grafo, sorteio):
+    g = _nx(grafo)
+    esperado = nx.diameter(g, weight='weight' if grafo.is_ponderado() else None) if nx.is_connected(g) else -1
+    obtido = grafo.calcular_diametro()
+    if obtido != esperado:
+        return f"calcular_diametro={obtido}, networkx={esperado}"
+    return None
+
+
+def _diametro_exaustivo(grafo, sorteio):
+    rapido, exaustivo = grafo.calcular_diametro(), grafo._diametro_exaustivo()
+    if rapido != exaustivo:
+        return f"calcular_diametro={rapido}, _diametro_exaustivo={exaustivo}"
+    return None
+
+
+def _menor_caminho(grafo, sorteio):
+    origem, destino = sorteio.randrange(grafo.vertices), sorteio.randrange(grafo.vertices)
+    distancia, caminho = grafo.menor_caminho(origem, destino)
+    g = _nx(grafo)
+    if not nx.has_path(g, origem, destino):
+        return None if caminho is None else f"menor_caminho({origem}, {destino})={caminho}, networkx: sem caminho"
+    esperado = nx.shortest_path_length(g, origem, destino, weight='weight')
+    if caminho is None or distancia != esperado:
+        return f"menor_caminho({origem}, {destino}) distância {distancia}, networkx {esperado}"
+    if caminho[0] != origem or caminho[-1] != destino or sum(g[a][b]['weight'] for a, b in zip(caminho, caminho[1:])) != esperado:
+        return f"menor_caminho({origem}, {destino}) devolveu o caminho inválido {caminho}"
+    caminho.append(-1)
+    if grafo.menor_caminho(origem, destino)[1] != caminho[:-1] or grafo.menor_caminho(destino, origem)[1] != caminho[-2::-1]:
+        return f"alterar o caminho devolvido por menor_caminho({origem}, {destino}) alterou o cache"
+    return None
+
+
+def _blocos(grafo, sorteio):
+    g = _nx(grafo)
+    if sorted(grafo.pontos_articulacao()) != sorted(nx.articulation_points(g)):
+        return f"pontos_articulacao={sorted(grafo.pontos_articulacao())}, networkx={sorted(nx.articulation_points(g))}"
+    pontes = sorted(_chave(u, v) for u, v in grafo.encontrar_pontes())
+    if pontes != sorted(_chave(u, v) for u, v in nx.bridges(g)):
+        return f"encontrar_pontes={pontes}, networkx={sorted(_chave(u, v) for u, v in nx.bridges(g))}"
+    blocos = sorted(sorted(b) for b in grafo.componentes_biconexas())
+    esperados = sorted(sorted(b) for b in nx.biconnected_components(g))
+    if blocos != esperados:
+        return f"componentes_biconexas={blocos}, networkx={esperados}"
+    return None
+
+
+def _cliques(grafo, sorteio):
+    g = _nx(grafo)
+    maximais = sorted(sorted(c) for c in grafo.cliques_maximais())
+    if maximais != sorted(sorted(c) for c in nx.find_cliques(g)):
+        return f"cliques_maximais={maximais}, networkx={sorted(sorted(c) for c in nx.find_cliques(g))}"
+    clique, _ = grafo.clique_maxima(TEMPO_LIMITE)
+    esperado = max(map(len, nx.find_cliques(g)))
+    if len(clique) != esperado or any(not g.has_edge(u, v) for u, v in itertools.combinations(clique, 2)):
+        return f"clique_maxima={clique}, networkx: tamanho {esperado}"
+    conjunto, _ = grafo.conjunto_independente_maximo(TEMPO_LIMITE)
+    esperado = max(map(len, nx.find_cliques(nx.complement(g))))
+    if len(conjunto) != esperado or any(g.has_edge(u, v) for u, v in itertools.combinations(conjunto, 2)):
+        return f"conjunto_independente_maximo={conjunto}, networkx: tamanho {esperado}"
+    return None
+
+
+def _coloracao(grafo, sorteio):
+    cores, limite = grafo.colorir_exato(TEMPO_LIMITE)
+    if len(cores) != grafo.vertices or any(cores[u] == cores[v] for u, v in grafo.arestas if u != v):
+        return f"colorir_exato devolveu uma coloração inválida: {cores}"
+    esperado = _numero_cromatico(grafo)
+    usadas = max(cores) + 1 if cores else 0
+    if usadas != esperado or limite > esperado:
+        return f"colorir_exato usou {usadas} cores (limite inferior {limite}), número cromático {esperado}"
+    return None
+
+
+def _arvore_geradora(grafo, sorteio):
+    g = _nx(grafo)
+    esperado = sum(d['weight'] for _, _, d in nx.minimum_spanning_edges(g, data=True))
+    componentes = nx.number_connected_components(g)
+    for metodo in ('kruskal', 'prim'):
+        arestas, peso = grafo.arvore_geradora_minima(metodo)
+        floresta = nx.Graph(arestas)
+        floresta.add_nodes_from(range(grafo.vertices))
+        if (peso != esperado or len(arestas) != grafo.vertices - componentes or not nx.is_forest(floresta)
+                or nx.number_connected_components(floresta) != componentes):
+            return f"arvore_geradora_minima('{metodo}') peso {peso} com {arestas}, networkx peso {esperado}"
+    return None
+
+
+def _arvores_abrangencia(grafo, sorteio):
+    # Referência: Kirchhoff com eliminação de Gauss densa em frações
+    n = grafo.vertices
+    laplaciano = [[Fraction(0)] * n for _ in range(n)]
+    for u, v in grafo.arestas:
+        if u != v:
+            laplaciano[u][u] += 1
+            laplaciano[v][v] += 1
+            laplaciano[u][v] -= 1
+            laplaciano[v][u] -= 1
+    matriz = [linha[1:] for linha in laplaciano[1:]]
+    esperado = Fraction(1) if n > 0 else Fraction(0)
+    for k in range(n - 1):
+        pivo = next((i for i in range(k, n - 1) if matriz[i][k] != 0), None)
+        if pivo is None:
+            esperado = Fraction(0)
+            break
+        matriz[k], matriz[pivo] = matriz[pivo], matriz[k]
+        esperado *= matriz[k][k] if pivo == k else -matriz[k][k]
+        for i in range(k + 1, n - 1):
+            fator = matriz[i][k] / matriz[k][k]
+            if fator:
+                for j in range(k, n - 1):
+                    matriz[i][j] -= fator * matriz[k][j]
+    obtido = grafo.contar_arvores_abrangencia()
+    if obtido != esperado:
+        return f"contar_arvores_abrangencia={obtido}, Kirchhoff denso={esperado}"
+    return None
+
+
+def _emparelhamento(grafo, sorteio):
+    emparelhamento = grafo.emparelhamento_maximo()
+    esperado = len(nx.max_weight_matching(_nx(grafo, ponderado=False), maxcardinality=True))
+    extremos = [v for aresta in emparelhamento for v in aresta]
+    if (len(emparelhamento) != esperado or len(set(extremos)) != len(extremos)
+            or not {_chave(u, v) for u, v in emparelhamento} <= grafo._chaves_arestas()):
+        return f"emparelhamento_maximo={emparelhamento}, networkx: {esperado} arestas"
+    return None
+
+
+def _euleriano(grafo, sorteio):
+    obtido, esperado = grafo.is_euleriano()[0], nx.is_eulerian(_nx(grafo))
+    if obtido != esperado:
+        return f"is_euleriano={obtido}, networkx={esperado}"
+    return None
+
+
+def _centralidade(grafo, sorteio):
+    g = _nx(grafo)
+    peso = 'weight' if grafo.is_ponderado() else None
+    for nome, obtido, esperado in (
+            ('centralidade_intermediacao', grafo.centralidade_intermediacao(), nx.betweenness_centrality(g, weight=peso)),
+            ('centralidade_proximidade', grafo.centralidade_proximidade(), nx.closeness_centrality(g, distance=peso))):
+        for v in range(grafo.vertices):
+            if not math.isclose(obtido[v], esperado[v], rel_tol=1e-9, abs_tol=1e-9):
+                return f"{nome}[{v}]={obtido[v]}, networkx={esperado[v]}"
+    return None
+
+
+def _rota_visita(grafo, sorteio):
+    if not grafo.is_conexo():
+        return None
+    ordem, custo, passeio, exata = grafo.rota_visita(tempo_limite=TEMPO_LIMITE, semente=0)
+    distancias = dict(nx.all_pairs_dijkstra_path_length(_nx(grafo)))
+    esperado = _caixeiro_referencia([[distancias[a][b] for b in range(grafo.vertices)] for a in range(grafo.vertices)])
+    if sorted(ordem) != list(range(grafo.vertices)) or (exata and custo != esperado) or custo < esperado:
+        return f"rota_visita={ordem} custo {custo} (exata={exata}), ótimo {esperado}"
+    g = _nx(grafo)
+    if (passeio[0] != ordem[0] or passeio[-1] != ordem[0] or not set(ordem) <= set(passeio)
+            or any(not g.has_edge(a, b) for a, b in zip(passeio, passeio[1:]))
+            or sum(g[a][b]['weight'] for a, b in zip(passeio, passeio[1:])) != custo):
+        return f"rota_visita devolveu um passeio inválido: {passeio}"
+    return None
+
+
+def _vistas(grafo, sorteio):
+    escolhidos = sorted(sorteio.sample(range(grafo.vertices), sorteio.randint(1, grafo.vertices)))
+    vista = grafo.subgrafo_induzido(escolhidos)
+    esperado = nx.convert_node_labels_to_integers(_nx(grafo).subgraph(escolhidos), ordering='sorted')
+    if sorted(_chave(u, v) for u, v in vista.arestas) != sorted(_chave(u, v) for u, v in esperado.edges):
+        return f"subgrafo_induzido({escolhidos}) tem as arestas {vista.arestas}"
+    copia = vista.materializar()
+    for nome in ('calcular_diametro', 'componentes_conexas', 'pontos_articulacao', 'encontrar_menor_ciclo'):
+        if getattr(vista, nome)() != getattr(copia, nome)():
+            return f"{nome} da vista de {escolhidos} difere da cópia materializada"
+    removido = sorteio.randrange(grafo.vertices)
+    sem_vertice = grafo.remover_vertice(removido)
+    esperado = nx.convert_node_labels_to_integers(nx.restricted_view(_nx(grafo), [removido], []), ordering='sorted')
+    if sem_vertice.vertices != grafo.vertices - 1 or \
+            sorted(_chave(u, v) for u, v in sem_vertice.arestas) != sorted(_chave(u, v) for u, v in esperado.edges):
+        return f"remover_vertice({removido}) devolveu {sem_vertice.vertices} vértices e {sem_vertice.arestas}"
+    if grafo.arestas:
+        u, v = sorteio.choice(grafo.arestas)
+        sem_aresta = grafo.remover_aresta((v, u), copia=True)
+        esperado = _nx(grafo)
+        esperado.remove_edge(u, v)
+        if type(sem_aresta) is not Grafo or \
+                sorted(_chave(a, b) for a, b in sem_aresta.arestas) != sorted(_chave(a, b) for a, b in esperado.edges):
+            return f"remover_aresta(({v}, {u}), copia=True) devolveu {type(sem_aresta).__name__} com {sem_aresta.arestas}"
+    return None
+
+
+def _snapshot(grafo, sorteio):
+    copia = Grafo.de_bytes(grafo.para_bytes())
+    if (copia.vertices, copia.arestas, copia.pesos) != (grafo.vertices, grafo.arestas, grafo.pesos):
+        return "de_bytes(para_bytes()) não reconstrói o grafo"
+    return None
+
+
+def _exportacao(grafo, sorteio):
+    esperado = {_chave(u, v): grafo.peso(i) for i, (u, v) in enumerate(grafo.arestas)}
+    lidos = {
+        'graphml': nx.parse_graphml(''.join(exportacao.graphml(grafo)), node_type=lambda n: int(n[1:])),
+        'json': nx.relabel_nodes(nx.node_link_graph(json.loads(''.join(exportacao.json_grafo(grafo)))), int),
+    }
+    for formato, lido in lidos.items():
+        chave_peso = 'peso' if formato == 'graphml' else 'weight'
+        obtido = {_chave(u, v): dados.get(chave_peso, 1) for u, v, dados in lido.edges(data=True)}
+        if lido.number_of_nodes() != grafo.vertices or obtido != esperado:
+            return f"exportação {formato} lida de volta com {lido.number_of_nodes()} vértices e arestas {obtido}"
+    return None
+
+
+def _fundir_vertices(grafo, sorteio):
+    v1, v2 = sorteio.randrange(grafo.vertices), sorteio.randrange(grafo.vertices)
+    esperado = {}
+    for i, (u, v) in enumerate(grafo.arestas):
+        u, v = (v1 if u == v2 else u), (v1 if v == v2 else v)
+        if u != v:
+            esperado[_chave(u, v)] = min(esperado.get(_chave(u, v), math.inf), grafo.peso(i))
+    fundido = Grafo.de_bytes(grafo.para_bytes())
+    a, b = sorteio.randrange(grafo.vertices), sorteio.randrange(grafo.vertices)
+    # Preenche o cache antes da fusão: ela precisa invalidá-lo
+    fundido.calcular_diametro(), fundido.menor_caminho(a, b)
+    fundido.fundir_vertices(v1, v2)
+    if fundido.pesos is not None and len(fundido.pesos) != len(fundido.arestas):
+        return f"fundir_vertices({v1}, {v2}) deixou {len(fundido.pesos)} pesos para {len(fundido.arestas)} arestas"
+    obtido = {_chave(u, v): fundido.peso(i) for i, (u, v) in enumerate(fundido.arestas)}
+    if obtido != esperado:
+        return f"fundir_vertices({v1}, {v2}) devolveu {obtido}, esperado {esperado}"
+    g = _nx(fundido)
+    distancia = nx.shortest_path_length(g, a, b, weight='weight') if nx.has_path(g, a, b) else math.inf
+    if fundido.menor_caminho(a, b)[0] != distancia:
+        return f"menor_caminho({a}, {b}) após fundir_vertices({v1}, {v2}) = {fundido.menor_caminho(a, b)[0]}, networkx={distancia}"
+    diametro = nx.diameter(g, weight='weight' if fundido.is_ponderado() else None) if nx.is_connected(g) else -1
+    if fundido.calcular_diametro() != diametro:
+        return f"calcular_diametro após fundir_vertices({v1}, {v2}) = {fundido.calcular_diametro()}, networkx={diametro}"
+    return None
+
+
+PROPRIEDADES = {
+    'isomorfismo': _isomorfismo,
+    'isomorfismo_exaustivo': _isomorfismo_exaustivo,
+    'menor_corte': _menor_corte,
+    'corte_de_tamanho': _corte_de_tamanho,
+    'ciclos': _ciclos,
+    'ciclos_exaustivo': _ciclos_exaustivo,
+    'hamiltoniano': _hamiltoniano,
+    'diametro': _diametro,
+    'diametro_exaustivo': _diametro_exaustivo,
+    'menor_caminho': _menor_caminho,
+    'blocos': _blocos,
+    'cliques': _cliques,
+    'coloracao': _coloracao,
+    'arvore_geradora': _arvore_geradora,
+    'arvores_abrangencia': _arvores_abrangencia,
+    'emparelhamento': _emparelhamento,
+    'euleriano': _euleriano,
+    'centralidade': _centralidade,
+    'rota_visita': _rota_visita,
+    'vistas': _vistas,
+    'snapshot': _snapshot,
+    'exportacao': _exportacao,
+    'fundir_vertices': _fundir_vertices,
+}
+
+
+# ---------------------------------------------------------------- execução
+
+def _sorteio(semente, caso, propriedade=''):
+    # Sementes em texto são estáveis entre processos e execuções (não dependem de PYTHONHASHSEED)
+    return random.Random(f"{semente}-{caso}-{propriedade}")
+
+
+def verificar(caso, propriedade, semente, indice):
+    """Roda uma propriedade em um caso; exceções também contam como falha."""
+    try:
+        return PROPRIEDADES[propriedade](montar(caso), _sorteio(semente, indice, propriedade))
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+
+
+def _verificar_lote(argumentos):
+    semente, indices, propriedades, max_vertices = argumentos
+    falhas = []
+    for indice in indices:
+        caso = gerar_caso(_sorteio(semente, indice), max_vertices)
+        for propriedade in propriedades:
+            mensagem = verificar(caso, propriedade, semente, indice)
+            if mensagem is not None:
+                falhas.append({'propriedade': propriedade, 'caso': indice, 'grafo': caso, 'mensagem': mensagem})
+    return len(indices), falhas
+
+
+def _menores(caso):
+    """Casos um passo menores: sem uma aresta, sem um vértice (renumerando os seguintes) ou sem pesos."""
+    vertices, arestas, pesos = caso
+    for i in range(len(arestas)):
+        yield vertices, arestas[:i] + arestas[i + 1:], None if pesos is None else pesos[:i] + pesos[i + 1:]
+    for x in range(vertices - 1, -1, -1):
+        manter = [i for i, (u, v) in enumerate(arestas) if x not in (u, v)]
+        yield (vertices - 1, [tuple(w - (w > x) for w in arestas[i]) for i in manter],
+               None if pesos is None else [pesos[i] for i in manter])
+    if pesos is not None:
+        yield vertices, arestas, None
+        if any(p != 1 for p in pesos):
+            yield vertices, arestas, [1] * len(pesos)
+
+
+def reduzir(caso, propriedade, semente, indice):
+    """Reduz o caso enquanto a propriedade continuar falhando; retorna (menor caso, mensagem)."""
+    mensagem = verificar(caso, propriedade, semente, indice)
+    reduziu = True
+    while reduziu:
+        reduziu = False
+        for menor in _menores(caso):
+            if menor[0] < 1:
+                continue
+            nova = verificar(menor, propriedade, semente, indice)
+            if nova is not None:
+                caso, mensagem, reduziu = menor, nova, True
+                break
+    return caso, mensagem
+
+
+def executar_verificacao(casos, propriedades, semente=0, processos=None, max_vertices=MAX_VERTICES,
+                         inicio=0, saida_log=sys.stdout):
+    """
+    Verifica os casos inicio..inicio+casos-1 em paralelo. Retorna, para cada propriedade que falhou,
+    o número de falhas e o primeiro caso que falhou reduzido ao menor contraexemplo.
+    """
+    lotes = [(semente, range(i, min(i + CASOS_POR_LOTE, inicio + casos)), propriedades, max_vertices)
+             for i in range(inicio, inicio + casos, CASOS_POR_LOTE)]
+    processos = processos or os.cpu_count() or 1
+    falhas = []
+    feitos = 0
+    comeco = time.perf_counter()
+    if processos == 1:
+        resultados = map(_verificar_lote, lotes)
+    else:
+        executor = ProcessPoolExecutor(max_workers=processos)
+        resultados = executor.map(_verificar_lote, lotes)
+    try:
+        for quantidade, falhas_lote in resultados:
+            feitos += quantidade
+            falhas.extend(falhas_lote)
+            if saida_log:
+                print(f"\r{feitos}/{casos} casos, {len(falhas)} falha(s), {time.perf_counter() - comeco:.1f} s",
+                      end='', file=saida_log, flush=True)
+    finally:
+        if processos != 1:
+            executor.shutdown(cancel_futures=True)
+    if saida_log:
+        print(file=saida_log)
+
+    relatorio = {}
+    for falha in sorted(falhas, key=lambda f: f['caso']):
+        registro = relatorio.setdefault(falha['propriedade'], {'falhas': 0})
+        registro['falhas'] += 1
+        if 'caso' not in registro:
+            menor, mensagem = reduzir(falha['grafo'], falha['propriedade'], semente, falha['caso'])
+            vertices, arestas, pesos = menor
+            registro.update({'caso': falha['caso'], 'mensagem_original': falha['mensagem'], 'mensagem': mensagem,
+                             'vertices': vertices, 'arestas': arestas, 'pesos': pesos})
+    return relatorio
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Testes diferenciais dos algoritmos da classe Grafo")
+    parser.add_argument('--propriedades', nargs='+', choices=sorted(PROPRIEDADES), default=list(PROPRIEDADES))
+    parser.add_argument('--casos', type=int, default=1000)
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--caso', type=int, help="verifica só este caso (número mostrado no relatório)")
+    parser.add_argument('--processos', type=int, help="padrão: um por CPU")
+    parser.add_argument('--max-vertices', type=int, default=MAX_VERTICES)
+    parser.add_argument('--saida', help="arquivo JSON onde salvar as falhas")
+    args = parser.parse_args(argv)
+
+    inicio, casos = (args.caso, 1) if args.caso is not None else (0, args.casos)
+    comeco = time.perf_counter()
+    relatorio = executar_verificacao(casos, args.propriedades, args.semente, args.processos, args.max_vertices, inicio)
+    print(f"{casos} caso(s) x {len(args.propriedades)} propriedade(s) em {time.perf_counter() - comeco:.1f} s")
+
+    for propriedade, registro in relatorio.items():
+        print(f"\nFALHA {propriedade}: {registro['falhas']} caso(s); primeiro: --semente {args.semente} --caso {registro['caso']}")
+        print(f"  {registro['mensagem_original']}")
+        print(f"  menor contraexemplo: {registro['vertices']} vértice(s), arestas {registro['arestas']}"
+              + (f", pesos {registro['pesos']}" if registro['pesos'] is not None else ""))
+        print(f"  {registro['mensagem']}")
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, indent=2, ensure_ascii=False)
+        print(f"Falhas salvas em {args.saida}")
+    if relatorio:
+        return 1
+    print("Nenhuma divergência encontrada")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
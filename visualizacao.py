@@ -0,0 +1,153 @@
+# visualizacao.py
+"""
+Visualizações do grafo como um único JSON compacto, desenhado pela página estática
+static/visualizacao.html (vis.js). Em vez de um nó/aresta por vez, a rota descreve a
+visualização por tabelas de estilos e conjuntos de destaque, e tudo é serializado de uma vez:
+
+    vis = Visualizacao(grafo)
+    vis.destacar_arestas(vis.arestas_por_pares(corte), "#FF0000", largura=3)
+    dados = vis.serializar(comprimir=True)
+
+Formato (chaves opcionais só aparecem quando usadas):
+    rotulos          nome de cada vértice
+    arestas          [u0, v0, u1, v1, ...]; o rótulo da aresta i é i + 1
+    pesos            peso de cada aresta (grafos ponderados)
+    estilos_nos      tabela de estilos vis.js dos nós; estilos_arestas idem
+    estilo_nos       índice do estilo de cada nó (sem a chave: todos usam o estilo 0)
+    titulos_nos      texto ao passar o mouse (sem a chave: o próprio nome)
+    tamanhos_nos     tamanho de cada nó
+    destaques_nos    [[estilo, [vértices]], ...], aplicados em ordem sobre o estilo base
+    destaques_arestas [[estilo, [índices de arestas]], ...]
+    opcoes           opções do vis.Network
+"""
+import gzip
+import itertools
+import json
+
+COR_NO = "#79C2EC"
+COR_ARESTA = "#323232"
+
+# Opções do vis.js usadas pelas rotas de análise
+OPCOES_PADRAO = {
+    "nodes": {"font": {"size": 12}},
+    "edges": {"font": {"size": 12}},
+    "physics": {"enabled": True, "stabilization": True},
+}
+# Visualização inicial, logo após o upload: física forceAtlas2 para espalhar melhor os nós
+OPCOES_CARGA = {
+    "nodes": {"font": {"size": 12, "color": "rgba(0,0,0,1)"}, "size": 20},
+    "edges": {"font": {"size": 10}, "width": 1, "smooth": {"type": "continuous", "forceDirection": "none"}},
+    "physics": {
+        "forceAtlas2Based": {"gravitationalConstant": -50, "centralGravity": 0.01, "springLength": 200, "springConstant": 0.08},
+        "maxVelocity": 50,
+        "solver": "forceAtlas2Based",
+        "timestep": 0.35,
+        "stabilization": {"enabled": True, "iterations": 1000},
+    },
+}
+# Árvore geradora e grafo euleriano: arestas mais grossas
+OPCOES_DESTAQUE = {
+    "nodes": {"font": {"size": 12, "color": "rgba(0,0,0,1)"}},
+    "edges": {"font": {"size": 12}, "width": 2},
+}
+
+# Payloads menores que isto não compensam a compressão
+LIMITE_GZIP_BYTES = 1024
+
+
+def _estilo(cor, largura=None, tamanho=None, tracejada=False):
+    estilo = {} if cor is None else {"color": cor}
+    if largura is not None:
+        estilo["width"] = largura
+    if tamanho is not None:
+        estilo["size"] = tamanho
+    if tracejada:
+        estilo["dashes"] = True
+    return estilo
+
+
+class Visualizacao:
+    def __init__(self, grafo, opcoes=None, cor_nos=COR_NO, cor_arestas=COR_ARESTA, largura_arestas=None):
+        self.grafo = grafo
+        self.opcoes = OPCOES_PADRAO if opcoes is None else opcoes
+        self._estilos_nos = [_estilo(cor_nos)]
+        self._estilos_arestas = [_estilo(cor_arestas, largura=largura_arestas)]
+        self._estilo_nos = None
+        self._titulos_nos = None
+        self._tamanhos_nos = None
+        self._destaques_nos = []
+        self._destaques_arestas = []
+
+    @staticmethod
+    def _indice_estilo(tabela, estilo):
+        try:
+            return tabela.index(estilo)
+        except ValueError:
+            tabela.append(estilo)
+            return len(tabela) - 1
+
+    def arestas_por_pares(self, pares):
+        """Índices das arestas do grafo dadas como pares (u, v), em qualquer orientação."""
+        return self.grafo.indices_arestas(pares)
+
+    def destacar_nos(self, vertices, cor, tamanho=None):
+        vertices = sorted(vertices)
+        if not vertices:
+            return self
+        estilo = self._indice_estilo(self._estilos_nos, _estilo(cor, tamanho=tamanho))
+        self._destaques_nos.append([estilo, vertices])
+        return self
+
+    def destacar_arestas(self, indices, cor, largura=None, tracejada=False):
+        indices = sorted(indices)
+        if not indices:
+            return self
+        estilo = self._indice_estilo(self._estilos_arestas, _estilo(cor, largura=largura, tracejada=tracejada))
+        self._destaques_arestas.append([estilo, indices])
+        return self
+
+    def colorir_nos(self, cores, titulos=None, tamanhos=None):
+        """Uma cor por vértice (ex.: coloração, comunidades); as cores repetidas viram uma tabela."""
+        indices = {}
+        self._estilo_nos = []
+        for cor in cores:
+            if cor not in indices:
+                indices[cor] = self._indice_estilo(self._estilos_nos, _estilo(cor))
+            self._estilo_nos.append(indices[cor])
+        if titulos is not None:
+            self.titulos_nos(titulos)
+        if tamanhos is not None:
+            self._tamanhos_nos = [round(t, 1) for t in tamanhos]
+        return self
+
+    def titulos_nos(self, titulos):
+        self._titulos_nos = list(titulos)
+        return self
+
+    def dados(self):
+        grafo = self.grafo
+        dados = {
+            "rotulos": grafo.rotulos(),
+            "arestas": list(itertools.chain.from_iterable(grafo.arestas)),
+            "estilos_nos": self._estilos_nos,
+            "estilos_arestas": self._estilos_arestas,
+            "opcoes": self.opcoes,
+        }
+        if grafo.is_ponderado():
+            dados["pesos"] = grafo.pesos
+        opcionais = {
+            "estilo_nos": self._estilo_nos,
+            "titulos_nos": self._titulos_nos,
+            "tamanhos_nos": self._tamanhos_nos,
+            "destaques_nos": self._destaques_nos,
+            "destaques_arestas": self._destaques_arestas,
+        }
+        dados.update((chave, valor) for chave, valor in opcionais.items() if valor)
+        return dados
+
+    def serializar(self, comprimir=False):
+        """JSON sem espaços, em bytes; com comprimir=True usa gzip quando o payload compensa."""
+        corpo = json.dumps(self.dados(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        if comprimir and len(corpo) >= LIMITE_GZIP_BYTES:
+            return gzip.compress(corpo, compresslevel=6), True
+        return corpo, False